@@ -0,0 +1,110 @@
+"""
+Benchmark the cellular automaton engines.
+
+Usage:
+    python benchmark.py [size] [num_gens]
+    python benchmark.py [size] [num_gens] --scaling
+
+Example:
+    python benchmark.py 1024 20
+    python benchmark.py 4096 20 --scaling
+
+Runs Game of Life rules (rules/goLRules.txt, Moore) on a random
+size x size board with the compiled-table engine and the sparse engine.
+The string-based functions.play_automaton is timed on a small board for
+reference, and every engine is checked against it there.
+
+With --scaling it instead times the multi-process engine on a random
+size x size board (4096 x 4096 by default) for 1, 2, ..., cpu_count()
+worker processes, next to the single-process table engine, and checks that
+every run ends on the same board (see parallel.py for recorded output).
+"""
+
+import sys
+import time
+import random
+import multiprocessing
+import numpy as np
+from datatypes import GameBoard
+from custom_io import read_rules_from_file
+from functions import play_automaton
+from vectorized import iterate_automaton, play_automaton_vectorized
+from sparse import iterate_automaton_sparse, play_automaton_sparse
+from parallel import iterate_automaton_parallel, play_automaton_parallel
+
+
+def main() -> None:
+    scaling = "--scaling" in sys.argv
+    args = [a for a in sys.argv[1:] if a != "--scaling"]
+    size = int(args[0]) if len(args) > 0 else (4096 if scaling else 1024)
+    num_gens = int(args[1]) if len(args) > 1 else 20
+
+    rules = read_rules_from_file("rules/goLRules.txt")
+    if scaling:
+        scaling_curve(size, num_gens, rules)
+        return
+
+    small = random_board(40, 40, seed=0)
+    start = time.perf_counter()
+    expected = play_automaton(small, 5, "Moore", rules)
+    reference_time = time.perf_counter() - start
+    print(f"string engine: 40x40, 5 gens in {reference_time:.3f} s")
+
+    if play_automaton_vectorized(small, 5, "Moore", rules) != expected:
+        raise RuntimeError("table engine disagrees with update_board")
+    if play_automaton_sparse(small, 5, "Moore", rules) != expected:
+        raise RuntimeError("sparse engine disagrees with update_board")
+    if play_automaton_parallel(small, 5, "Moore", rules, 2) != expected:
+        raise RuntimeError("parallel engine disagrees with update_board")
+
+    board = random_board(size, size, seed=1)
+    print(f"--- {size}x{size}, {num_gens} generations ---")
+    run("table", iterate_automaton(board, num_gens, "Moore", rules, every=num_gens))
+    run("sparse", iterate_automaton_sparse(board, num_gens, "Moore", rules, every=num_gens))
+
+
+def scaling_curve(size: int, num_gens: int, rules: dict[str, int]) -> None:
+    """
+    Times num_gens generations of the multi-process engine for 1, 2, ...,
+    cpu_count() worker processes and prints the speedup over one process,
+    with the single-process table engine for reference.
+    """
+    board = random_board(size, size, seed=1)
+    print(f"--- {size}x{size}, {num_gens} generations, {multiprocessing.cpu_count()} CPUs ---")
+    _, reference = run("table", iterate_automaton(board, num_gens, "Moore", rules, every=num_gens))
+
+    baseline = None
+    for num_procs in range(1, multiprocessing.cpu_count() + 1):
+        frames = iterate_automaton_parallel(board, num_gens, "Moore", rules, num_procs, every=num_gens)
+        elapsed, last = run(f"{num_procs} procs", frames)
+        baseline = baseline or elapsed
+        print(
+            f"{'':>10}  speedup {baseline / elapsed:5.2f}x  "
+            f"identical to table engine: {np.array_equal(last, reference)}"
+        )
+
+
+def run(label: str, frames) -> tuple[float, np.ndarray]:
+    """
+    Time a frame iterator after its first (initial) frame, and print it.
+    Returns the elapsed time and the last frame.
+    """
+    last = next(frames)
+    start = time.perf_counter()
+    for last in frames:
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"{label:>10}: {elapsed:8.3f} s")
+    return elapsed, last
+
+
+def random_board(num_rows: int, num_cols: int, seed: int | None = None) -> GameBoard:
+    """
+    Build a 0/1 board where each cell is 1 with probability 1/3.
+    """
+    rng = random.Random(seed)
+    return [[int(rng.random() < 1 / 3) for _ in range(num_cols)] for _ in range(num_rows)]
+
+
+if __name__ == "__main__":
+    main()
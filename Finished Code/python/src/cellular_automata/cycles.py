@@ -0,0 +1,200 @@
+"""
+Cycle and still-life detection for cellular automaton runs.
+
+Many runs settle into a fixed point or a short oscillation long before
+num_gens. Every generation is hashed with a Zobrist hash: each (cell, state)
+pair has a random 64-bit key (state 0 has key 0), and a board's hash is the
+XOR of the keys of its cells. The hash is rolled forward each step by XOR-ing in only the keys of
+cells that changed. When a hash repeats (and the boards really are equal),
+the run is periodic from then on, so stepping stops and the remaining
+generations are filled in with references to the boards of the cycle.
+
+iterate_automaton_cycles does the same lazily, for streaming the boards into
+a video without building the list of GameBoards.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Iterator
+import numpy as np
+from datatypes import GameBoard
+from vectorized import AutomatonEngine, RuleTable, array_to_board, board_to_array, compile_rules
+
+
+@dataclass
+class CycleInfo:
+    """
+    A detected cycle: generation first_seen + period is equal to
+    generation first_seen, and so on for every later generation.
+
+    Attributes:
+        first_seen: First generation of the repeating sequence.
+        period: Length of the cycle; 1 means a still life.
+    """
+    first_seen: int
+    period: int
+
+
+class CycleDetector:
+    """
+    Rolling Zobrist hash of a sequence of boards, remembering the first
+    generation at which each hash was seen.
+    """
+
+    def __init__(self, cells: np.ndarray, num_states: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self._keys = rng.integers(
+            0, np.iinfo(np.uint64).max, size=cells.shape + (num_states,), dtype=np.uint64, endpoint=True
+        )
+        self._keys[..., 0] = 0
+
+        self._previous = self._clip(cells)
+        self.hash = self._hash_of(np.ones(cells.shape, dtype=bool), self._previous)
+        self.generation = 0
+        self._seen = {self.hash: 0}
+
+    def observe(self, cells: np.ndarray) -> int | None:
+        """
+        Record the next generation.
+        Args:
+            cells (np.ndarray): The board one generation after the last one observed.
+        Returns:
+            int | None: The earlier generation with the same hash, if any. The
+                caller should confirm the boards are equal before trusting it.
+        """
+        current = self._clip(cells)
+        changed = current != self._previous
+        self.hash ^= self._hash_of(changed, self._previous) ^ self._hash_of(changed, current)
+        self._previous = current
+        self.generation += 1
+
+        earlier = self._seen.get(self.hash)
+        if earlier is None:
+            self._seen[self.hash] = self.generation
+        return earlier
+
+    def _clip(self, cells: np.ndarray) -> np.ndarray:
+        """
+        States as key indices. States the keys do not cover share the last
+        key; that only risks a false hash match, which callers rule out by
+        comparing the boards.
+        """
+        return np.clip(cells, 0, self._keys.shape[-1] - 1)
+
+    def _hash_of(self, mask: np.ndarray, states: np.ndarray) -> int:
+        """
+        XOR of the keys of the masked cells in the given states.
+        """
+        rows, cols = np.nonzero(mask)
+        keys = self._keys[rows, cols, states[rows, cols]]
+        return int(np.bitwise_xor.reduce(keys, initial=np.uint64(0)))
+
+
+def play_automaton_cycles(
+    initial_board: GameBoard,
+    num_gens: int,
+    neighborhood_type: str,
+    rules: dict[str, int]
+) -> tuple[list[GameBoard], CycleInfo | None]:
+    """
+    Simulate a cellular automaton, stopping early once the boards start repeating.
+
+    Args:
+        initial_board: Starting GameBoard (2D list of ints).
+        num_gens: Number of generations to simulate (>= 0).
+        neighborhood_type: "Moore" or "vonNeumann".
+        rules: Mapping from neighborhood-string -> next-state integer.
+
+    Returns:
+        Boards from initial through num_gens generations, and the cycle if one
+        was found. Boards after the cycle is found are the same list objects
+        as the boards one period earlier.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    rule_table = compile_rules(rules, neighborhood_type)
+    engine = AutomatonEngine(board_to_array(initial_board), rule_table)
+    detector = CycleDetector(engine.cells, rule_table.num_states)
+    boards = [initial_board]
+
+    for i in range(1, num_gens + 1):
+        engine.step()
+        earlier = detector.observe(engine.cells)
+        if earlier is not None and np.array_equal(engine.cells, boards[earlier]):
+            cycle = CycleInfo(first_seen=earlier, period=i - earlier)
+            for j in range(i, num_gens + 1):
+                boards.append(boards[j - cycle.period])
+            return boards, cycle
+        boards.append(array_to_board(engine.cells))
+
+    return boards, None
+
+
+def iterate_automaton_cycles(
+    initial_board: GameBoard,
+    num_gens: int,
+    neighborhood_type: str,
+    rules: dict[str, int],
+    on_cycle: Callable[[CycleInfo], None] | None = None
+) -> Iterator[np.ndarray]:
+    """
+    Lazily simulate a cellular automaton, stopping the engine once the boards
+    start repeating and replaying the cycle for the remaining generations.
+
+    Only the hashes of earlier generations are kept. When a hash repeats, the
+    boards of the cycle are recovered by simulating again from initial_board,
+    so memory stays at one cycle of boards however large num_gens is. They are
+    stored one byte per cell when every state fits.
+
+    Args:
+        initial_board: Starting GameBoard (2D list of ints).
+        num_gens: Number of generations to simulate (>= 0).
+        neighborhood_type: "Moore" or "vonNeumann".
+        rules: Mapping from neighborhood-string -> next-state integer.
+        on_cycle: Called with the cycle as soon as one is found.
+
+    Yields:
+        np.ndarray: A copy of each generation 0 through num_gens.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    rule_table = compile_rules(rules, neighborhood_type)
+    engine = AutomatonEngine(board_to_array(initial_board), rule_table)
+    detector = CycleDetector(engine.cells, rule_table.num_states)
+    yield engine.cells.copy()
+
+    for i in range(1, num_gens + 1):
+        engine.step()
+        earlier = detector.observe(engine.cells)
+        if earlier is not None:
+            boards = _cycle_boards(initial_board, rule_table, earlier, i - earlier)
+            if np.array_equal(engine.cells, boards[0]):
+                cycle = CycleInfo(first_seen=earlier, period=i - earlier)
+                if on_cycle is not None:
+                    on_cycle(cycle)
+                for j in range(i, num_gens + 1):
+                    yield boards[(j - earlier) % cycle.period].astype(engine.cells.dtype)
+                return
+        yield engine.cells.copy()
+
+
+def _cycle_boards(initial_board: GameBoard, rule_table: RuleTable, first_seen: int, period: int) -> list[np.ndarray]:
+    """
+    Simulate again from initial_board and return generations first_seen
+    through first_seen + period - 1, as uint8 arrays if every state fits.
+    """
+    engine = AutomatonEngine(board_to_array(initial_board), rule_table)
+    for _ in range(first_seen):
+        engine.step()
+
+    dtype = np.uint8 if rule_table.num_states <= 256 else engine.cells.dtype
+    boards = []
+    for _ in range(period):
+        boards.append(engine.cells.astype(dtype))
+        engine.step()
+    return boards
@@ -1,7 +1,25 @@
+from functools import partial
+from typing import Iterable, Iterator
 from datatypes import GameBoard
 from functions import assert_rectangular, count_rows, count_columns
+from frame_pool import render_frames, stream_frames
+from raster import make_palette, rasterize
+import numpy as np
 import pygame
 
+# colors used by draw_game_board, as a lookup table indexed by cell state
+PALETTE = make_palette({
+    0: (60, 60, 60),
+    1: (255, 255, 255),
+    2: (239, 71, 111),
+    3: (6, 214, 160),
+    4: (255, 255, 0),
+    5: (255, 165, 0),
+    6: (160, 32, 240),
+    7: (17, 138, 178),
+    8: (0, 0, 0),
+})
+
 
 def draw_game_board(current_board: GameBoard, cell_width: int) -> pygame.Surface:
     """
@@ -87,4 +105,60 @@ def draw_game_boards(boards: list[GameBoard], cell_width: int) -> list[pygame.Su
     for board in boards: 
         surfaces.append(draw_game_board(board, cell_width))
 
-    return surfaces
\ No newline at end of file
+    return surfaces
+
+
+def draw_game_board_frame(current_board: GameBoard, cell_width: int) -> np.ndarray:
+    """
+    Draw a single GameBoard as a (height, width, 3) uint8 RGB frame, without
+    pygame. The pixels are the same as those of draw_game_board (see raster.py).
+    """
+    if not isinstance(current_board, list) or len(current_board) == 0:
+        raise ValueError("board must be a non-empty 2D list.")
+    assert_rectangular(current_board)
+    if not isinstance(cell_width, int) or cell_width <= 0:
+        raise ValueError("cell_width must be a positive integer.")
+
+    return draw_cells_frame(np.array(current_board, dtype=np.int64), cell_width)
+
+
+def draw_cells_frame(cells: np.ndarray, cell_width: int) -> np.ndarray:
+    """
+    Draw a 2D array of cell states, e.g. from vectorized.iterate_automaton,
+    as a (height, width, 3) uint8 RGB frame.
+    """
+    if cells.size and (cells.min() < 0 or cells.max() >= len(PALETTE)):
+        raise ValueError(f"cell states must be between 0 and {len(PALETTE) - 1}.")
+    radius = int(0.8 * cell_width / 2)
+    return rasterize(cells, cell_width, radius, PALETTE)
+
+
+def stream_game_boards_parallel(
+    boards: Iterable[GameBoard],
+    cell_width: int,
+    num_procs: int | None = None
+) -> Iterator[np.ndarray]:
+    """
+    Draw GameBoards across worker processes (see frame_pool.py), yielding
+    frames in order; each is only valid until the next is requested.
+    """
+    if not isinstance(cell_width, int) or cell_width <= 0:
+        raise ValueError("cell_width must be a positive integer.")
+
+    yield from stream_frames(boards, partial(draw_game_board_frame, cell_width=cell_width), num_procs)
+
+
+def draw_game_boards_parallel(
+    boards: list[GameBoard],
+    cell_width: int,
+    num_procs: int | None = None
+) -> list[np.ndarray]:
+    """
+    Draw multiple GameBoards across worker processes and return the frames in order.
+    """
+    if not isinstance(boards, list) or len(boards) == 0:
+        raise ValueError("boards must be a non-empty list of GameBoard objects.")
+    if not isinstance(cell_width, int) or cell_width <= 0:
+        raise ValueError("cell_width must be a positive integer.")
+
+    return render_frames(boards, partial(draw_game_board_frame, cell_width=cell_width), num_procs)
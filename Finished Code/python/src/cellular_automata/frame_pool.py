@@ -0,0 +1,149 @@
+"""
+Multi-process frame rendering through shared memory.
+
+Rendering boards to RGB frames is independent per frame, so it spreads
+well over processes, but sending each (H, W, 3) uint8 frame back through a
+multiprocessing.Queue pickles and copies it, and the parent has to collect
+every frame before it can do anything else.
+
+stream_frames instead preallocates a ring of `window` frame slots in one
+multiprocessing.shared_memory block. Each worker renders its frame straight
+into a slot, and the parent yields the frames back in order as soon as each
+is ready, so an encoder can consume them while later frames are still being
+rendered. A slot is reused only after the caller has moved past the frame
+in it, so at most `window` frames are in flight and memory stays bounded
+however many frames there are.
+
+render_frames is the same pipeline collected into a list.
+
+The render function must be a module-level function (so it can be sent to
+the workers) that maps one item to an (H, W, 3) uint8 array; every frame
+must have the same shape.
+This file is kept identical in every project that uses it.
+"""
+
+from collections import deque
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Iterable, Iterator
+import numpy as np
+
+# set in each worker by _init_worker
+_shm: shared_memory.SharedMemory | None = None
+_slots: np.ndarray | None = None
+_render: Callable[[Any], np.ndarray] | None = None
+
+# marks the end of the items
+_DONE = object()
+
+
+def stream_frames(
+    items: Iterable[Any],
+    render: Callable[[Any], np.ndarray],
+    num_procs: int | None = None,
+    window: int | None = None
+) -> Iterator[np.ndarray]:
+    """
+    Render items across worker processes, yielding the frames in order.
+    Args:
+        items: The boards (or anything else render accepts) to draw. May be
+            a generator; it is consumed only window items ahead of the caller.
+        render: Module-level function mapping one item to an (H, W, 3) uint8 frame.
+        num_procs: Number of worker processes (default: one per CPU).
+        window: Number of frames in flight at once (default: 2 * num_procs).
+    Yields:
+        np.ndarray: Each frame, as a view into shared memory that is only
+            valid until the next frame is requested; copy it to keep it.
+    """
+    if num_procs is None:
+        num_procs = multiprocessing.cpu_count()
+    if not isinstance(num_procs, int) or num_procs <= 0:
+        raise ValueError("num_procs must be a positive integer.")
+    if window is None:
+        window = 2 * num_procs
+    if not isinstance(window, int) or window <= 0:
+        raise ValueError("window must be a positive integer.")
+
+    items = iter(items)
+    first_item = next(items, _DONE)
+    if first_item is _DONE:
+        return
+
+    # the first frame is rendered here to learn the frame shape
+    first = np.ascontiguousarray(render(first_item), dtype=np.uint8)
+    if first.ndim != 3 or first.shape[2] != 3:
+        raise ValueError("render must return an (H, W, 3) frame.")
+    shape = (window,) + first.shape
+
+    # Start the shared-memory tracker before forking so workers share it;
+    # otherwise each worker's own tracker unlinks the block when it exits.
+    resource_tracker.ensure_running()
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+    slots = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    pool = multiprocessing.Pool(num_procs, _init_worker, (shm.name, shape, render))
+    try:
+        slots[0] = first
+        del first
+        pending = deque()
+
+        def submit(i: int) -> bool:
+            item = next(items, _DONE)
+            if item is _DONE:
+                return False
+            pending.append(pool.apply_async(_render_into_slot, (item, i % window)))
+            return True
+
+        # frame 0 is already in slot 0; fill the other slots
+        next_index = 1
+        while next_index < window and submit(next_index):
+            next_index += 1
+
+        yield slots[0]
+        i = 1
+        while True:
+            # the slot of frame i - 1 is free again once the caller asks for frame i
+            if next_index == i - 1 + window and submit(next_index):
+                next_index += 1
+            if not pending:
+                break
+            pending.popleft().get()
+            yield slots[i % window]
+            i += 1
+
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
+        del slots
+        shm.close()
+        shm.unlink()
+
+
+def render_frames(
+    items: Iterable[Any],
+    render: Callable[[Any], np.ndarray],
+    num_procs: int | None = None
+) -> list[np.ndarray]:
+    """
+    Render items across worker processes.
+    Returns:
+        list[np.ndarray]: The frames, in order.
+    """
+    return [frame.copy() for frame in stream_frames(items, render, num_procs)]
+
+
+def _init_worker(shm_name: str, shape: tuple[int, ...], render: Callable[[Any], np.ndarray]) -> None:
+    global _shm, _slots, _render
+    _shm = shared_memory.SharedMemory(name=shm_name)
+    _slots = np.ndarray(shape, dtype=np.uint8, buffer=_shm.buf)
+    _render = render
+
+
+def _render_into_slot(item: Any, slot: int) -> None:
+    """
+    Worker: render one item into a frame slot.
+    """
+    frame = _render(item)
+    if frame.shape != _slots.shape[1:]:
+        raise ValueError(f"frame shape {frame.shape} differs from the first frame's {_slots.shape[1:]}.")
+    _slots[slot] = frame
@@ -4,7 +4,8 @@ from datatypes import GameBoard
 
 def play_automaton(initial_board: GameBoard, num_gens: int,
                    neighborhood_type: str,
-                   rules: dict[str, int]) -> list[GameBoard]:
+                   rules: dict[str, int],
+                   num_procs: int = 1) -> list[GameBoard]:
     """
     Simulate an arbitrary cellular automaton for a given number of generations.
 
@@ -13,6 +14,8 @@ def play_automaton(initial_board: GameBoard, num_gens: int,
         num_gens: Number of generations to simulate (>= 0).
         neighborhood_type: "Moore" or "vonNeumann".
         rules: Mapping from neighborhood-string -> next-state integer.
+        num_procs: Number of worker processes. With more than one, the board
+            is split into row strips stepped in parallel (see parallel.py).
 
     Returns:
         A list of GameBoards of length num_gens + 1.
@@ -26,6 +29,13 @@ def play_automaton(initial_board: GameBoard, num_gens: int,
         raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
     if not isinstance(rules, dict):
         raise ValueError("rules must be a dict[str, int].")
+    if not isinstance(num_procs, int) or num_procs <= 0:
+        raise ValueError("num_procs must be a positive integer.")
+
+    if num_procs > 1:
+        # imported here because parallel.py itself builds on this module
+        from parallel import play_automaton_parallel
+        return play_automaton_parallel(initial_board, num_gens, neighborhood_type, rules, num_procs)
 
     boards = []
     boards.append(initial_board)
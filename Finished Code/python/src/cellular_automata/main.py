@@ -1,12 +1,14 @@
 import sys
+from functools import partial
 import pygame # for drawing to a virtual canvas
 import numpy # for converting drawings to arrays that can be rendered as frames of videos
-import imageio # for rendering videos
 
 # specific functions that we will need from elsewhere in the folder
 from custom_io import read_board_from_file, read_rules_from_file
-from functions import play_automaton 
-from drawing import draw_game_boards
+from cycles import iterate_automaton_cycles
+from parallel import iterate_automaton_parallel
+from drawing import draw_cells_frame
+from pipeline import encode_video
 
 def main():
     print("Cellular automata!")
@@ -21,6 +23,7 @@ def main():
 
     cell_width = int(sys.argv[5])
     num_gens = int(sys.argv[6])
+    num_procs = int(sys.argv[7]) if len(sys.argv) > 7 else 1 # worker processes for the simulation
 
     print("Parameters read! Reading in board and rule set.")
 
@@ -31,33 +34,33 @@ def main():
 
     print("Board and rules read from file.")
 
-    # then, we want to run the simulation
+    # then, we want to run the simulation, drawing and encoding each generation as soon as it is produced
 
-    print("Running simulation.")
-    boards = play_automaton(initial_board, num_gens, neighborhood_type, rules)
+    print("Running simulation, drawing and animating.")
 
-    print("Simulation is complete!")
-
-    print("Drawing to canvases.")
-
-    surfaces = draw_game_boards(boards, cell_width)
+    def report_cycle(cycle) -> None:
+        print("Board repeats with period", cycle.period, "from generation", cycle.first_seen)
 
-    print("Drawing done! Now, animating.")
-
-    # we need a little bit more code to visualize the canvases that we have as an animation
+    if num_procs > 1:
+        generations = iterate_automaton_parallel(initial_board, num_gens, neighborhood_type, rules, num_procs)
+    else:
+        generations = iterate_automaton_cycles(initial_board, num_gens, neighborhood_type, rules, on_cycle=report_cycle)
 
     video_path = output_file + ".mp4" # gives it the appropriate file extension 
 
-    # create a writer object to write to file 
-    writer = imageio.get_writer(video_path, fps=10, codec="libx264", quality = 8)
-
-    # range over surface objects and draw each one 
-    for surface in surfaces:
-        # writer needs to convert the surface to a numpy array
-        frame = pygame_surface_to_numpy(surface)
-        writer.append_data(frame)
+    # simulation, rasterizing and encoding run as concurrent stages (see pipeline.py),
+    # so only a few boards and frames are in memory at once
+    timings = encode_video(
+        generations,
+        partial(draw_cells_frame, cell_width=cell_width),
+        video_path,
+        fps=10,
+        codec="libx264",
+        quality=8,
+    )
 
-    writer.close()
+    print("Simulation is complete!")
+    print(timings.report())
 
     print("Success! MP4 video produced.")
 
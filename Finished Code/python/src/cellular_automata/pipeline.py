@@ -0,0 +1,254 @@
+"""
+Pipelined simulate -> render -> encode stages for the simulation mains.
+
+A main that simulates every generation into a list, draws every board into
+a list of frames and only then appends the frames to a video writer holds
+every board and every frame at once, and leaves the encoder idle until the
+last frame is drawn.
+
+run_pipeline instead connects three stages with bounded queues:
+
+  simulate  pulls snapshots from a (lazy) iterable, on the calling thread,
+  render    turns each snapshot into an (H, W, 3) uint8 frame, in a thread,
+  encode    hands each frame to the writer, in another thread.
+
+A stage blocks once the queue after it is full, so at most queue_size
+snapshots and queue_size frames (plus the one in each stage) are alive at
+any time, however many generations are run. The stages overlap even though
+they are threads, because much of the work happens outside the GIL: the
+video is compressed by the ffmpeg subprocess that imageio pipes frames to,
+and NumPy releases the GIL in its array loops. Pure-Python simulation and
+pygame drawing still take turns with each other.
+
+Each stage records the time spent on its own work and the time spent
+blocked on its neighbours; PipelineTimings.report() formats the breakdown.
+The stage that hardly waits is the bottleneck.
+
+encode_video is run_pipeline with an imageio writer that it opens and closes.
+This file is kept identical in every project that uses it.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable
+import numpy as np
+import imageio.v2 as imageio
+
+STAGES = ("simulate", "render", "encode")
+DEFAULT_QUEUE_SIZE = 4
+
+# marks the end of the snapshots or frames
+_DONE = object()
+
+# how often (in seconds) a blocked stage checks whether another stage failed
+_POLL_INTERVAL = 0.1
+
+
+class StageTiming:
+    """
+    Time spent by one stage of the pipeline.
+
+    Attributes:
+        name: One of STAGES.
+        items: Number of snapshots or frames the stage handled.
+        busy: Seconds spent on the stage's own work.
+        waiting: Seconds spent blocked on an empty input or a full output queue.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.waiting = 0.0
+
+
+class PipelineTimings:
+    """
+    Timings of a whole pipeline run.
+
+    Attributes:
+        stages: StageTiming per stage name, in pipeline order.
+        wall: Seconds from the start of the run to the last frame written.
+    """
+
+    def __init__(self):
+        self.stages = {name: StageTiming(name) for name in STAGES}
+        self.wall = 0.0
+
+    def report(self) -> str:
+        """
+        Format the per-stage breakdown as a small table.
+        """
+        lines = [f"{'stage':<10}{'items':>8}{'busy (s)':>12}{'waiting (s)':>14}"]
+        for t in self.stages.values():
+            lines.append(f"{t.name:<10}{t.items:>8}{t.busy:>12.2f}{t.waiting:>14.2f}")
+        lines.append(f"{'wall':<10}{'':>8}{self.wall:>12.2f}")
+        return "\n".join(lines)
+
+
+def run_pipeline(
+    items: Iterable[Any],
+    render: Callable[[Any], np.ndarray],
+    write: Callable[[np.ndarray], Any],
+    queue_size: int = DEFAULT_QUEUE_SIZE
+) -> PipelineTimings:
+    """
+    Simulate, render and encode concurrently.
+    Args:
+        items: The snapshots to draw, e.g. a lazy iterate_* generator. Each
+            snapshot must not change after it is yielded, since it is drawn
+            on another thread while the next ones are produced.
+        render: Maps one snapshot to an (H, W, 3) uint8 frame.
+        write: Called with each frame in order, e.g. writer.append_data.
+        queue_size: Maximum number of snapshots, and of frames, waiting
+            between two stages.
+    Returns:
+        PipelineTimings: The per-stage timings.
+    Raises:
+        The first exception raised by any stage, after all stages have stopped.
+    """
+    if not isinstance(queue_size, int) or queue_size <= 0:
+        raise ValueError("queue_size must be a positive integer.")
+
+    timings = PipelineTimings()
+    snapshots = queue.Queue(maxsize=queue_size)
+    frames = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    threads = [
+        threading.Thread(
+            target=_run_stage,
+            args=(snapshots, frames, render, timings.stages["render"], stop, errors),
+            daemon=True,
+        ),
+        threading.Thread(
+            target=_run_stage,
+            args=(frames, None, write, timings.stages["encode"], stop, errors),
+            daemon=True,
+        ),
+    ]
+
+    start = time.perf_counter()
+    items = iter(items)
+    simulate = timings.stages["simulate"]
+    for t in threads:
+        t.start()
+    try:
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            item = next(items, _DONE)
+            simulate.busy += time.perf_counter() - t0
+            if item is _DONE:
+                break
+            simulate.items += 1
+            if not _put(snapshots, item, stop, simulate):
+                break
+        _put(snapshots, _DONE, stop, simulate)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        for t in threads:
+            t.join()
+        # let a generator source release its workers and buffers now
+        if hasattr(items, "close"):
+            items.close()
+
+    if errors:
+        raise errors[0]
+    timings.wall = time.perf_counter() - start
+    return timings
+
+
+def encode_video(
+    items: Iterable[Any],
+    render: Callable[[Any], np.ndarray],
+    video_path: str,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    **writer_kwargs
+) -> PipelineTimings:
+    """
+    run_pipeline into an imageio writer for video_path.
+    Args:
+        writer_kwargs: Passed to imageio.get_writer, e.g. fps, codec and quality.
+    Returns:
+        PipelineTimings: The per-stage timings; closing the writer (flushing
+            the encoder) counts as encoding.
+    """
+    writer = imageio.get_writer(video_path, **writer_kwargs)
+    try:
+        timings = run_pipeline(items, render, writer.append_data, queue_size)
+    finally:
+        t0 = time.perf_counter()
+        writer.close()
+    closing = time.perf_counter() - t0
+    timings.stages["encode"].busy += closing
+    timings.wall += closing
+    return timings
+
+
+def _run_stage(
+    inbox: queue.Queue,
+    outbox: queue.Queue | None,
+    work: Callable[[Any], Any],
+    timing: StageTiming,
+    stop: threading.Event,
+    errors: list[BaseException]
+) -> None:
+    """
+    Thread: apply work to every item of inbox, passing the results on to
+    outbox (if any), until the end marker or until another stage fails.
+    """
+    try:
+        while True:
+            item = _get(inbox, stop, timing)
+            if item is _DONE:
+                break
+            t0 = time.perf_counter()
+            result = work(item)
+            timing.busy += time.perf_counter() - t0
+            timing.items += 1
+            if outbox is not None and not _put(outbox, result, stop, timing):
+                return
+        if outbox is not None:
+            _put(outbox, _DONE, stop, timing)
+    except BaseException as e:
+        errors.append(e)
+        stop.set()
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event, timing: StageTiming) -> bool:
+    """
+    Put item on q, waiting while it is full. Returns False if the pipeline
+    stopped first.
+    """
+    t0 = time.perf_counter()
+    try:
+        while True:
+            try:
+                q.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                if stop.is_set():
+                    return False
+    finally:
+        timing.waiting += time.perf_counter() - t0
+
+
+def _get(q: queue.Queue, stop: threading.Event, timing: StageTiming) -> Any:
+    """
+    Take the next item from q, waiting while it is empty. Returns the end
+    marker if the pipeline stopped first.
+    """
+    t0 = time.perf_counter()
+    try:
+        while True:
+            try:
+                return q.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if stop.is_set():
+                    return _DONE
+    finally:
+        timing.waiting += time.perf_counter() - t0
@@ -0,0 +1,213 @@
+"""
+Sparse, activity-driven cellular automaton engine.
+
+For any rule set, a cell's next state depends only on its neighbourhood, so
+a cell can only change in generation t + 1 if it or one of its neighbours
+changed in generation t. The board is split into tile_size x tile_size
+tiles with a dirty-tile bitmap; each generation only the dirty tiles are
+recomputed, and the next bitmap marks the tiles that changed plus whichever
+neighbouring tiles touch a changed edge or corner cell. Per-generation cost
+is therefore proportional to the amount of activity, not the board's area.
+
+Dirty tiles are updated with the compiled rule table from vectorized.py,
+so the boards produced are identical to functions.update_board.
+"""
+
+from typing import Iterator
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+from datatypes import GameBoard
+from vectorized import array_to_board, board_to_array, compile_rules
+
+DEFAULT_TILE_SIZE = 32
+
+
+# ------------------------- Engine -------------------------
+
+class SparseAutomaton:
+    """
+    Cellular automaton board that only recomputes tiles near recent changes.
+
+    Attributes:
+        rule_table: The compiled rules.
+        tile_size: Width of the square tiles, in cells.
+        dirty: (tile_rows, tile_cols) bool bitmap of tiles to recompute
+            in the next step.
+        generation: Number of steps taken so far.
+        cells_updated: Total number of cells recomputed over all steps.
+    """
+
+    def __init__(
+        self,
+        cells: np.ndarray,
+        neighborhood_type: str,
+        rules: dict[str, int],
+        tile_size: int = DEFAULT_TILE_SIZE
+    ):
+        if cells.ndim != 2 or cells.shape[0] == 0 or cells.shape[1] == 0:
+            raise ValueError("cells must be a non-empty 2D array.")
+        if not isinstance(tile_size, int) or tile_size <= 0:
+            raise ValueError("tile_size must be a positive integer.")
+
+        num_rows, num_cols = cells.shape
+        t = tile_size
+        tile_rows = -(-num_rows // t)
+        tile_cols = -(-num_cols // t)
+
+        self.rule_table = compile_rules(rules, neighborhood_type)
+        self.tile_size = t
+        self.generation = 0
+        self.cells_updated = 0
+        self._shape = (num_rows, num_cols)
+
+        # board rounded up to whole tiles, plus a one-cell halo of state 0
+        self._board = np.zeros((tile_rows * t + 2, tile_cols * t + 2), dtype=np.int64)
+        self._board[1:num_rows + 1, 1:num_cols + 1] = cells
+
+        # windows[i, j] is tile (i, j) with its halo; interior[i, j] is the tile itself
+        self._windows = _tile_view(self._board, tile_rows, tile_cols, t, t + 2)
+        self._interior = _tile_view(self._board[1:, 1:], tile_rows, tile_cols, t, t)
+
+        # cells of the last row/column of tiles that are past the board's edge
+        on_board = np.zeros(self._board.shape, dtype=bool)
+        on_board[1:num_rows + 1, 1:num_cols + 1] = True
+        self._on_board = _tile_view(on_board[1:, 1:], tile_rows, tile_cols, t, t).copy()
+
+        # nothing is known about generation -1, so the first step is a full one
+        self.dirty = np.ones((tile_rows, tile_cols), dtype=bool)
+
+    @property
+    def cells(self) -> np.ndarray:
+        """
+        View (not a copy) of the current generation.
+        """
+        num_rows, num_cols = self._shape
+        return self._board[1:num_rows + 1, 1:num_cols + 1]
+
+    @property
+    def num_dirty(self) -> int:
+        """
+        Number of tiles that the next step will recompute.
+        """
+        return int(np.count_nonzero(self.dirty))
+
+    def step(self) -> None:
+        """
+        Advance the board by one generation, recomputing only dirty tiles.
+        """
+        rows, cols = np.nonzero(self.dirty)
+        self.dirty[rows, cols] = False
+        self.generation += 1
+        if len(rows) == 0:
+            return
+
+        windows = self._windows[rows, cols]  # a copy, so writes below do not leak in
+        new = self.rule_table.apply(windows)
+        new[~self._on_board[rows, cols]] = 0
+        changed_cells = new != windows[:, 1:-1, 1:-1]
+
+        changed = changed_cells.any(axis=(1, 2))
+        self._interior[rows[changed], cols[changed]] = new[changed]
+        self.cells_updated += new.size
+
+        self._mark_dirty(rows[changed], cols[changed], changed_cells[changed])
+
+    def _mark_dirty(self, rows: np.ndarray, cols: np.ndarray, changed_cells: np.ndarray) -> None:
+        """
+        Mark the changed tiles and every neighbouring tile that borders one
+        of their changed cells.
+        """
+        tile_rows, tile_cols = self.dirty.shape
+        top = changed_cells[:, 0, :]
+        bottom = changed_cells[:, -1, :]
+        left = changed_cells[:, :, 0]
+        right = changed_cells[:, :, -1]
+
+        touches = {
+            (0, 0): np.ones(len(rows), dtype=bool),
+            (-1, 0): top.any(axis=1),
+            (1, 0): bottom.any(axis=1),
+            (0, -1): left.any(axis=1),
+            (0, 1): right.any(axis=1),
+            (-1, -1): top[:, 0],
+            (-1, 1): top[:, -1],
+            (1, -1): bottom[:, 0],
+            (1, 1): bottom[:, -1],
+        }
+        for (dr, dc), mask in touches.items():
+            r = rows[mask] + dr
+            c = cols[mask] + dc
+            inside = (r >= 0) & (r < tile_rows) & (c >= 0) & (c < tile_cols)
+            self.dirty[r[inside], c[inside]] = True
+
+
+def _tile_view(a: np.ndarray, tile_rows: int, tile_cols: int, tile_size: int, size: int) -> np.ndarray:
+    """
+    (tile_rows, tile_cols, size, size) view (not a copy) of a 2D array, with
+    tile (i, j) starting at a[i * tile_size, j * tile_size]. With
+    size = tile_size + 2, neighbouring windows overlap by their halos.
+    """
+    s0, s1 = a.strides
+    return as_strided(a, shape=(tile_rows, tile_cols, size, size), strides=(tile_size * s0, tile_size * s1, s0, s1))
+
+
+# ------------------------- Simulation -------------------------
+
+def iterate_automaton_sparse(
+    initial_board: GameBoard,
+    num_gens: int,
+    neighborhood_type: str,
+    rules: dict[str, int],
+    every: int = 1,
+    tile_size: int = DEFAULT_TILE_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Lazily simulate a cellular automaton, yielding generations 0, every, 2 * every, ...
+
+    Args:
+        initial_board: Starting GameBoard (2D list of ints).
+        num_gens: Number of generations to simulate (>= 0).
+        neighborhood_type: "Moore" or "vonNeumann".
+        rules: Mapping from neighborhood-string -> next-state integer.
+        every: Yield only every this many generations.
+        tile_size: Width of the square tiles, in cells.
+
+    Yields:
+        np.ndarray: A copy of each yielded generation.
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+    if not isinstance(every, int) or every <= 0:
+        raise ValueError("every must be a positive integer.")
+
+    automaton = SparseAutomaton(board_to_array(initial_board), neighborhood_type, rules, tile_size)
+    yield automaton.cells.copy()
+
+    for i in range(1, num_gens + 1):
+        automaton.step()
+        if i % every == 0:
+            yield automaton.cells.copy()
+
+
+def play_automaton_sparse(
+    initial_board: GameBoard,
+    num_gens: int,
+    neighborhood_type: str,
+    rules: dict[str, int],
+    tile_size: int = DEFAULT_TILE_SIZE
+) -> list[GameBoard]:
+    """
+    Drop-in replacement for functions.play_automaton.
+
+    Returns:
+        A list of GameBoards of length num_gens + 1.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+
+    boards = [initial_board]
+    frames = iterate_automaton_sparse(initial_board, num_gens, neighborhood_type, rules, tile_size=tile_size)
+    for i, cells in enumerate(frames):
+        if i > 0:
+            boards.append(array_to_board(cells))
+    return boards
@@ -0,0 +1,261 @@
+"""
+Compiled rule tables and a vectorized engine for cellular automata.
+
+functions.update_cell builds a neighbourhood string for every cell and looks
+it up in a dict[str, int]. Here the rules are compiled once into a dense
+integer lookup table: a neighbourhood "s0 s1 ... s(n-1)" (central cell
+first, then the neighbours in neighborhood_to_string order) over k states is
+encoded as the base-k number s0 * k^(n-1) + ... + s(n-1), and table[code] is
+its next state. A whole board is then updated with n - 1 multiply-adds of
+shifted arrays to build every cell's code, plus one gather.
+
+As in the string engine, cells off the board count as state 0 and
+neighbourhoods missing from the rules become 0, so the boards produced are
+identical to functions.update_board.
+"""
+
+from typing import Iterator
+import numpy as np
+from datatypes import GameBoard
+from functions import assert_rectangular
+from grid import Grid
+
+# Neighbour offsets in the order used by functions.neighborhood_to_string
+NEIGHBOR_OFFSETS = {
+    "Moore": [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)],
+    "vonNeumann": [(-1, 0), (0, 1), (1, 0), (0, -1)],
+}
+
+# Largest lookup table compile_rules will build (entries)
+MAX_TABLE_SIZE = 1 << 24
+
+
+# ------------------------- Conversion -------------------------
+
+def board_to_array(board: GameBoard) -> np.ndarray:
+    """
+    Convert a GameBoard into an int64 array.
+    Args:
+        board (GameBoard): A rectangular 2D list of ints.
+    Returns:
+        np.ndarray: (num_rows, num_cols) array of cell states.
+    """
+    if not isinstance(board, list) or len(board) == 0:
+        raise ValueError("board must be a non-empty GameBoard.")
+    assert_rectangular(board)
+    if len(board[0]) == 0:
+        raise ValueError("board should have at least one column.")
+
+    return np.array(board, dtype=np.int64)
+
+
+def array_to_board(cells: np.ndarray) -> GameBoard:
+    """
+    Convert a 2D array of cell states back into a GameBoard.
+    """
+    return cells.astype(int).tolist()
+
+
+# ------------------------- Rule Tables -------------------------
+
+class RuleTable:
+    """
+    A rule set compiled into a dense lookup table.
+
+    Attributes:
+        neighborhood_type: "Moore" or "vonNeumann".
+        num_states: k, the number of cell states (0 .. k - 1) the rules use.
+        table: (k^n,) array; table[code] is the next state of the
+            neighbourhood with base-k code `code`.
+    """
+
+    def __init__(self, neighborhood_type: str, num_states: int, table: np.ndarray):
+        self.neighborhood_type = neighborhood_type
+        self.num_states = num_states
+        self.table = table
+
+    @property
+    def offsets(self) -> list[tuple[int, int]]:
+        return NEIGHBOR_OFFSETS[self.neighborhood_type]
+
+    def apply(self, padded: np.ndarray) -> np.ndarray:
+        """
+        Next state of every interior cell of a padded array.
+        Args:
+            padded (np.ndarray): Cell states with a border of width one around
+                the cells to update (..., rows + 2, cols + 2). Any leading
+                axes, e.g. a stack of tiles, are carried through.
+        Returns:
+            np.ndarray: Next states, shape (..., rows, cols).
+        """
+        k = self.num_states
+        num_rows = padded.shape[-2] - 2
+        num_cols = padded.shape[-1] - 2
+
+        # codes fit in int32 because the table has at most MAX_TABLE_SIZE entries
+        codes = padded[..., 1:-1, 1:-1].astype(np.int32)
+        for dr, dc in self.offsets:
+            codes *= k
+            codes += padded[..., 1 + dr:1 + dr + num_rows, 1 + dc:1 + dc + num_cols]
+
+        out_of_range = (padded < 0) | (padded >= k)
+        if not out_of_range.any():
+            return self.table[codes]
+
+        # A state the rules never mention cannot match any rule, so every
+        # cell that sees one becomes 0, as in the string engine.
+        unknown = out_of_range[..., 1:-1, 1:-1].copy()
+        for dr, dc in self.offsets:
+            unknown |= out_of_range[..., 1 + dr:1 + dr + num_rows, 1 + dc:1 + dc + num_cols]
+        new = self.table[np.where(unknown, 0, codes)]
+        new[unknown] = 0
+        return new
+
+
+def compile_rules(rules: dict[str, int], neighborhood_type: str) -> RuleTable:
+    """
+    Compile string rules, as read by custom_io.read_rules_from_file, into a
+    dense lookup table.
+
+    Args:
+        rules: Mapping from neighborhood-string -> next-state integer.
+        neighborhood_type: "Moore" or "vonNeumann".
+
+    Returns:
+        RuleTable: The compiled rules.
+
+    Raises:
+        ValueError: If a key is not one digit per cell of the neighbourhood,
+            or if the table would exceed MAX_TABLE_SIZE entries.
+    """
+    if not isinstance(rules, dict):
+        raise ValueError("rules must be a dict[str, int].")
+    if neighborhood_type not in NEIGHBOR_OFFSETS:
+        raise ValueError('neighborhood_type must be "Moore" or "vonNeumann".')
+
+    n = len(NEIGHBOR_OFFSETS[neighborhood_type]) + 1
+    for neighborhood in rules:
+        if len(neighborhood) != n or not neighborhood.isdigit():
+            raise ValueError(f"rule {neighborhood!r} is not {n} single-digit states.")
+
+    digits = [int(ch) for neighborhood in rules for ch in neighborhood]
+    num_states = max(digits + [0]) + 1
+    if num_states ** n > MAX_TABLE_SIZE:
+        raise ValueError(f"a table for {num_states} states would have more than {MAX_TABLE_SIZE} entries.")
+
+    max_state = max(list(rules.values()) + [0])
+    dtype = np.uint8 if 0 <= min(list(rules.values()) + [0]) and max_state < 256 else np.int64
+    table = np.zeros(num_states ** n, dtype=dtype)
+    for neighborhood, new_state in rules.items():
+        code = 0
+        for ch in neighborhood:
+            code = code * num_states + int(ch)
+        table[code] = new_state
+
+    return RuleTable(neighborhood_type, num_states, table)
+
+
+# ------------------------- Engine -------------------------
+
+class AutomatonEngine:
+    """
+    Whole-board cellular automaton stepping with a compiled rule table.
+
+    The board is a Grid with a one-cell halo that stays 0. Each step reads
+    the front buffer and writes the next generation into the back one.
+
+    Attributes:
+        rule_table: The compiled rules.
+        generation: Number of steps taken so far.
+    """
+
+    def __init__(self, cells: np.ndarray, rule_table: RuleTable):
+        if cells.ndim != 2 or cells.shape[0] == 0 or cells.shape[1] == 0:
+            raise ValueError("cells must be a non-empty 2D array.")
+
+        self.rule_table = rule_table
+        self.generation = 0
+        self.grid = Grid.from_array(cells, np.int64, halo=1)
+
+    @property
+    def cells(self) -> np.ndarray:
+        """
+        View (not a copy) of the current generation.
+        """
+        return self.grid.data
+
+    def step(self) -> None:
+        """
+        Advance the board by one generation.
+        """
+        self.grid.back[...] = self.rule_table.apply(self.grid.padded)
+        self.grid.swap()
+        self.generation += 1
+
+
+def update_board_table(cells: np.ndarray, rule_table: RuleTable) -> np.ndarray:
+    """
+    Apply compiled rules to a board for one generation.
+    Args:
+        cells (np.ndarray): 2D array of cell states.
+        rule_table (RuleTable): The compiled rules.
+    Returns:
+        np.ndarray: A new array holding the next generation.
+    """
+    return rule_table.apply(np.pad(cells, 1))
+
+
+def iterate_automaton(
+    initial_board: GameBoard,
+    num_gens: int,
+    neighborhood_type: str,
+    rules: dict[str, int],
+    every: int = 1
+) -> Iterator[np.ndarray]:
+    """
+    Lazily simulate a cellular automaton, yielding generations 0, every, 2 * every, ...
+
+    Args:
+        initial_board: Starting GameBoard (2D list of ints).
+        num_gens: Number of generations to simulate (>= 0).
+        neighborhood_type: "Moore" or "vonNeumann".
+        rules: Mapping from neighborhood-string -> next-state integer.
+        every: Yield only every this many generations.
+
+    Yields:
+        np.ndarray: A copy of each yielded generation.
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+    if not isinstance(every, int) or every <= 0:
+        raise ValueError("every must be a positive integer.")
+
+    engine = AutomatonEngine(board_to_array(initial_board), compile_rules(rules, neighborhood_type))
+    yield engine.cells.copy()
+
+    for i in range(1, num_gens + 1):
+        engine.step()
+        if i % every == 0:
+            yield engine.cells.copy()
+
+
+def play_automaton_vectorized(
+    initial_board: GameBoard,
+    num_gens: int,
+    neighborhood_type: str,
+    rules: dict[str, int]
+) -> list[GameBoard]:
+    """
+    Drop-in replacement for functions.play_automaton.
+
+    Returns:
+        A list of GameBoards of length num_gens + 1.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+
+    boards = [initial_board]
+    for i, cells in enumerate(iterate_automaton(initial_board, num_gens, neighborhood_type, rules)):
+        if i > 0:
+            boards.append(array_to_board(cells))
+    return boards
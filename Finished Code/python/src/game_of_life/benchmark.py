@@ -0,0 +1,91 @@
+"""
+Benchmark the vectorized Game of Life engine against functions.update_board.
+
+Usage:
+    python benchmark.py [reference_size] [reference_gens] [size] [gens]
+
+Example:
+    python benchmark.py 100 5 2000 100
+
+The list-based reference is far too slow to run on large boards, so it is
+timed on a reference_size x reference_size board and its cost per cell per
+generation is used to estimate its time on the large board. Both engines are
+also checked to produce identical boards on the small board, and HashLife
+(hashlife.game_of_life_at) is checked on a few boards of 4x4 cells or fewer.
+"""
+
+import sys
+import time
+import random
+from datatypes import GameBoard
+from functions import play_game_of_life
+from hashlife import game_of_life_at
+from vectorized import LifeEngine, board_to_array, play_game_of_life_vectorized
+
+
+def main() -> None:
+    reference_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    reference_gens = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    gens = int(sys.argv[4]) if len(sys.argv) > 4 else 100
+
+    small = random_board(reference_size, reference_size, seed=0)
+
+    start = time.perf_counter()
+    expected = play_game_of_life(small, reference_gens)
+    reference_time = time.perf_counter() - start
+
+    if play_game_of_life_vectorized(small, reference_gens) != expected:
+        raise RuntimeError("vectorized engine disagrees with update_board")
+    check_tiny_boards()
+
+    per_cell = reference_time / (reference_size * reference_size * reference_gens)
+    print(f"reference: {reference_size}x{reference_size}, {reference_gens} gens in {reference_time:.3f} s "
+          f"({per_cell * 1e9:.1f} ns per cell per gen)")
+
+    large = board_to_array(random_board(size, size, seed=1))
+    for edges in ("bounded", "toroidal"):
+        engine = LifeEngine(large, edges)
+        start = time.perf_counter()
+        for _ in range(gens):
+            engine.step()
+        elapsed = time.perf_counter() - start
+
+        estimate = per_cell * size * size * gens
+        print(f"{edges:>9}: {size}x{size}, {gens} gens in {elapsed:.3f} s "
+              f"({elapsed / gens * 1e3:.2f} ms per gen, ~{estimate / elapsed:.0f}x vs reference)")
+
+
+def check_tiny_boards() -> None:
+    """
+    Check HashLife against update_board on boards of 4x4 cells or fewer,
+    which get the smallest quadtree roots. HashLife runs on an unbounded
+    plane, so update_board runs on the board inside a dead margin wide enough
+    that its edges cannot reach the original cells.
+    """
+    num_gens = 4
+    margin = 2 * num_gens
+    blinker = [[False, True, False], [False, True, False], [False, True, False]]
+    boards = [blinker, [[True]], [[False, False], [False, False]], random_board(4, 4, seed=2), random_board(2, 3, seed=3)]
+    for board in boards:
+        num_rows, num_cols = len(board), len(board[0])
+        padded = [[False] * (num_cols + 2 * margin) for _ in range(num_rows + 2 * margin)]
+        for r in range(num_rows):
+            padded[margin + r][margin:margin + num_cols] = board[r]
+        expected = play_game_of_life(padded, num_gens)
+        for gen in range(num_gens + 1):
+            window = [row[margin:margin + num_cols] for row in expected[gen][margin:margin + num_rows]]
+            if game_of_life_at(board, gen) != window:
+                raise RuntimeError(f"HashLife disagrees with update_board on {board} after {gen} gens")
+
+
+def random_board(num_rows: int, num_cols: int, seed: int | None = None) -> GameBoard:
+    """
+    Build a board where each cell is alive with probability 1/3.
+    """
+    rng = random.Random(seed)
+    return [[rng.random() < 1 / 3 for _ in range(num_cols)] for _ in range(num_rows)]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Cycle and still-life detection for Game of Life runs.
+
+Most runs settle into a still life or a short oscillation long before
+num_gens. Every generation is hashed with a Zobrist hash: each cell has a
+random 64-bit key, and a board's hash is the XOR of the keys of its live
+cells. The hash is rolled forward each step by XOR-ing in only the keys of
+cells that changed. When a hash repeats (and the boards really are equal),
+the run is periodic from then on, so stepping stops and the remaining
+generations are filled in with references to the boards of the cycle.
+
+iterate_game_of_life_cycles does the same lazily, for streaming the boards
+into a video without building the list of GameBoards.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Iterator
+import numpy as np
+from datatypes import GameBoard
+from vectorized import LifeEngine, array_to_board, board_to_array
+
+
+@dataclass
+class CycleInfo:
+    """
+    A detected cycle: generation first_seen + period is equal to
+    generation first_seen, and so on for every later generation.
+
+    Attributes:
+        first_seen: First generation of the repeating sequence.
+        period: Length of the cycle; 1 means a still life.
+    """
+    first_seen: int
+    period: int
+
+
+class CycleDetector:
+    """
+    Rolling Zobrist hash of a sequence of boards, remembering the first
+    generation at which each hash was seen.
+    """
+
+    def __init__(self, cells: np.ndarray, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self._keys = rng.integers(0, np.iinfo(np.uint64).max, size=cells.shape, dtype=np.uint64, endpoint=True)
+
+        self._previous = cells.astype(bool)
+        self.hash = int(np.bitwise_xor.reduce(self._keys[self._previous], initial=np.uint64(0)))
+        self.generation = 0
+        self._seen = {self.hash: 0}
+
+    def observe(self, cells: np.ndarray) -> int | None:
+        """
+        Record the next generation.
+        Args:
+            cells (np.ndarray): The board one generation after the last one observed.
+        Returns:
+            int | None: The earlier generation with the same hash, if any. The
+                caller should confirm the boards are equal before trusting it.
+        """
+        current = cells.astype(bool)
+        changed = current != self._previous
+        self.hash ^= int(np.bitwise_xor.reduce(self._keys[changed], initial=np.uint64(0)))
+        self._previous = current
+        self.generation += 1
+
+        earlier = self._seen.get(self.hash)
+        if earlier is None:
+            self._seen[self.hash] = self.generation
+        return earlier
+
+
+def play_game_of_life_cycles(
+    initial_board: GameBoard,
+    num_gens: int,
+    edges: str = "bounded"
+) -> tuple[list[GameBoard], CycleInfo | None]:
+    """
+    Simulate the Game of Life, stopping early once the boards start repeating.
+    Args:
+        initial_board (GameBoard): The starting game board.
+        num_gens (int): The number of generations to simulate.
+        edges (str): "bounded" or "toroidal" (see vectorized.EDGE_MODES).
+    Returns:
+        tuple[list[GameBoard], CycleInfo | None]: Boards from initial through
+            num_gens generations, and the cycle if one was found. Boards after
+            the cycle is found are the same list objects as the boards one
+            period earlier.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    engine = LifeEngine(board_to_array(initial_board), edges)
+    detector = CycleDetector(engine.cells)
+    boards = [initial_board]
+
+    for i in range(1, num_gens + 1):
+        engine.step()
+        earlier = detector.observe(engine.cells)
+        if earlier is not None and np.array_equal(engine.cells, boards[earlier]):
+            cycle = CycleInfo(first_seen=earlier, period=i - earlier)
+            for j in range(i, num_gens + 1):
+                boards.append(boards[j - cycle.period])
+            return boards, cycle
+        boards.append(array_to_board(engine.cells))
+
+    return boards, None
+
+
+def iterate_game_of_life_cycles(
+    initial_board: GameBoard,
+    num_gens: int,
+    edges: str = "bounded",
+    on_cycle: Callable[[CycleInfo], None] | None = None
+) -> Iterator[np.ndarray]:
+    """
+    Lazily simulate the Game of Life, stopping the engine once the boards start
+    repeating and replaying the cycle for the remaining generations.
+
+    Only the hashes of earlier generations are kept. When a hash repeats, the
+    boards of the cycle are recovered by simulating again from initial_board,
+    so memory stays at one cycle of boards however large num_gens is.
+    Args:
+        initial_board (GameBoard): The starting game board.
+        num_gens (int): The number of generations to simulate.
+        edges (str): "bounded" or "toroidal" (see vectorized.EDGE_MODES).
+        on_cycle (Callable[[CycleInfo], None] | None): Called with the cycle
+            as soon as one is found.
+    Yields:
+        np.ndarray: Generations 0 through num_gens as uint8 arrays. Arrays
+            after the cycle is found are the same objects as the arrays one
+            period earlier, so they must not be modified.
+    """
+    if not isinstance(initial_board, list) or len(initial_board) == 0:
+        raise ValueError("initial_board must be a non-empty GameBoard.")
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer.")
+
+    engine = LifeEngine(board_to_array(initial_board), edges)
+    detector = CycleDetector(engine.cells)
+    yield engine.cells.copy()
+
+    for i in range(1, num_gens + 1):
+        engine.step()
+        earlier = detector.observe(engine.cells)
+        if earlier is not None:
+            boards = _cycle_boards(initial_board, edges, earlier, i - earlier)
+            if np.array_equal(engine.cells, boards[0]):
+                cycle = CycleInfo(first_seen=earlier, period=i - earlier)
+                if on_cycle is not None:
+                    on_cycle(cycle)
+                for j in range(i, num_gens + 1):
+                    yield boards[(j - earlier) % cycle.period]
+                return
+        yield engine.cells.copy()
+
+
+def _cycle_boards(initial_board: GameBoard, edges: str, first_seen: int, period: int) -> list[np.ndarray]:
+    """
+    Simulate again from initial_board and return generations first_seen
+    through first_seen + period - 1.
+    """
+    engine = LifeEngine(board_to_array(initial_board), edges)
+    for _ in range(first_seen):
+        engine.step()
+
+    boards = []
+    for _ in range(period):
+        boards.append(engine.cells.copy())
+        engine.step()
+    return boards
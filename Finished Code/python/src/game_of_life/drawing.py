@@ -1,6 +1,14 @@
+from functools import partial
+from typing import Iterable, Iterator
+import numpy as np
 import pygame
 from datatypes import GameBoard
 from functions import count_rows, count_cols
+from frame_pool import render_frames, stream_frames
+from raster import make_palette, rasterize
+
+# colors used by draw_game_board, as a lookup table indexed by cell state
+PALETTE = make_palette({0: (60, 60, 60), 1: (255, 255, 255)})
 
 
 def draw_game_board(board: GameBoard, cell_width: int) -> pygame.Surface:
@@ -82,4 +90,71 @@ def draw_game_boards(boards: list[GameBoard], cell_width: int) -> list[pygame.Su
     for board in boards: 
         surfaces.append(draw_game_board(board, cell_width))
 
-    return surfaces
\ No newline at end of file
+    return surfaces
+
+
+def draw_game_board_frame(board: GameBoard, cell_width: int) -> np.ndarray:
+    """
+    Draw a single GameBoard as an RGB frame, without pygame.
+    The pixels are the same as those of draw_game_board (see raster.py).
+    Args:
+        board (GameBoard): A 2D list of booleans.
+        cell_width (int): Pixel width of each cell.
+    Returns:
+        np.ndarray: The frame as (height, width, 3) uint8 RGB.
+    """
+    if not isinstance(cell_width, int) or cell_width <= 0:
+        raise ValueError("cell_width must be a positive integer.")
+
+    if not isinstance(board, list) or len(board) == 0:
+        raise ValueError("board must be a non-empty 2D list.")
+
+    count_cols(board)  # checks the board is rectangular
+    return draw_cells_frame(np.array(board, dtype=bool), cell_width)
+
+
+def draw_cells_frame(cells: np.ndarray, cell_width: int) -> np.ndarray:
+    """
+    Draw a 2D cell array (nonzero = alive), e.g. from vectorized.iterate_game_of_life,
+    as a (height, width, 3) uint8 RGB frame.
+    """
+    radius = int(0.8 * (cell_width / 2))
+    return rasterize(cells != 0, cell_width, radius, PALETTE)
+
+
+def stream_game_boards_parallel(
+    boards: Iterable[GameBoard],
+    cell_width: int,
+    num_procs: int | None = None
+) -> Iterator[np.ndarray]:
+    """
+    Draw GameBoards across worker processes (see frame_pool.py).
+    Args:
+        boards (Iterable[GameBoard]): The boards to draw, e.g. a generator.
+        cell_width (int): Pixel width of each cell.
+        num_procs (int | None): Number of worker processes (default: one per CPU).
+    Yields:
+        np.ndarray: The frames in order, each only valid until the next is requested.
+    """
+    if not isinstance(cell_width, int) or cell_width <= 0:
+        raise ValueError("cell_width must be a positive integer.")
+
+    yield from stream_frames(boards, partial(draw_game_board_frame, cell_width=cell_width), num_procs)
+
+
+def draw_game_boards_parallel(
+    boards: list[GameBoard],
+    cell_width: int,
+    num_procs: int | None = None
+) -> list[np.ndarray]:
+    """
+    Draw multiple GameBoards across worker processes.
+    Returns:
+        list[np.ndarray]: (height, width, 3) uint8 RGB frames, in order.
+    """
+    if not isinstance(boards, list) or len(boards) == 0:
+        raise ValueError("boards must be a non-empty list.")
+    if not isinstance(cell_width, int) or cell_width <= 0:
+        raise ValueError("Issue with cell_width parameter.")
+
+    return render_frames(boards, partial(draw_game_board_frame, cell_width=cell_width), num_procs)
@@ -0,0 +1,387 @@
+"""
+HashLife engine for very long Game of Life runs.
+
+The board is stored as a quadtree in which identical squares are shared: a
+node of level k is a 2^k x 2^k square built from four level k-1 children, and
+every distinct square exists only once (hash-consing). For any node of level
+k >= 2, the centre 2^(k-1) x 2^(k-1) square after 2^j generations (j <= k-2) is
+fully determined by the node, so it is computed once, memoized, and reused
+everywhere that square appears. Periodic patterns such as the Gosper gun
+therefore reach millions of generations in a fraction of a second.
+
+Unlike functions.update_board, cells live on an unbounded plane: nothing
+dies at the edge of the original board. The two agree as long as the pattern
+stays clear of the board's edges.
+
+Memory is bounded by max_cache: the memo of computed results is an LRU
+cache, and nodes that are no longer reachable from the pattern or from a
+cached result are freed automatically.
+
+Example:
+    board = read_board_from_file("boards/gosperGun.csv")
+    life = HashLife.from_board(board)
+    life.advance(1_000_000)
+    print(life.population, life.stats)
+"""
+
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+from datatypes import GameBoard
+from vectorized import array_to_board, board_to_array
+
+# Default number of memoized (node, j) results kept in the LRU cache
+DEFAULT_MAX_CACHE = 1 << 20
+
+
+# ------------------------- Data Types -------------------------
+
+class Node:
+    """
+    A canonical 2^level x 2^level square of cells.
+
+    Level-0 nodes are single cells; higher levels have four children, each
+    half as wide. Nodes are only created through HashLife._join, so two
+    nodes with equal contents are the same object and compare by identity.
+    """
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population", "__weakref__")
+
+    def __init__(self, level: int, nw, ne, sw, se, population: int):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters for the HashLife result cache.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that had to be computed.
+        evictions: Results dropped to stay within max_cache.
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+# ------------------------- Engine -------------------------
+
+class HashLife:
+    """
+    A Game of Life pattern on an unbounded plane, advanced with HashLife.
+
+    Attributes:
+        root: Quadtree node holding every live cell.
+        top, left: Board coordinates of the root's top-left cell. Coordinates
+            are those of the original board, and may become negative.
+        generation: Number of generations advanced so far.
+        stats: Hit/miss/eviction counters of the result cache.
+    """
+
+    def __init__(self, max_cache: int = DEFAULT_MAX_CACHE):
+        if not isinstance(max_cache, int) or max_cache <= 0:
+            raise ValueError("max_cache must be a positive integer.")
+
+        self.max_cache = max_cache
+        self.stats = CacheStats()
+        self._nodes: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._results: OrderedDict = OrderedDict()
+        self._off = Node(0, None, None, None, None, 0)
+        self._on = Node(0, None, None, None, None, 1)
+        self._empty = [self._off]
+
+        # _is_padded looks three levels down, so roots start at level 3
+        self.root = self._empty_node(3)
+        self.top = 0
+        self.left = 0
+        self.generation = 0
+
+    @classmethod
+    def from_board(cls, board: GameBoard, max_cache: int = DEFAULT_MAX_CACHE) -> "HashLife":
+        """
+        Build a HashLife pattern from a GameBoard.
+        Args:
+            board (GameBoard): The starting game board; cell (r, c) keeps
+                coordinates (r, c).
+            max_cache (int): Maximum number of memoized results.
+        Returns:
+            HashLife: The pattern at generation 0.
+        """
+        life = cls(max_cache)
+        cells = board_to_array(board)
+        level = max(3, int(max(cells.shape) - 1).bit_length())
+        padded = np.zeros((1 << level, 1 << level), dtype=np.uint8)
+        padded[:cells.shape[0], :cells.shape[1]] = cells
+        life.root = life._from_array(padded, level)
+        return life
+
+    @property
+    def population(self) -> int:
+        """
+        Number of live cells.
+        """
+        return self.root.population
+
+    @property
+    def num_nodes(self) -> int:
+        """
+        Number of distinct quadtree nodes currently alive.
+        """
+        return len(self._nodes)
+
+    def advance(self, num_gens: int) -> None:
+        """
+        Advance the pattern by num_gens generations, one power of two at a time.
+        Args:
+            num_gens (int): Number of generations to advance.
+        """
+        if not isinstance(num_gens, int) or num_gens < 0:
+            raise ValueError("num_gens must be a non-negative integer.")
+
+        j = 0
+        while num_gens > 0:
+            if num_gens & 1:
+                self.advance_pow2(j)
+            num_gens >>= 1
+            j += 1
+
+    def advance_pow2(self, j: int) -> None:
+        """
+        Advance the pattern by 2^j generations in one HashLife step.
+        Args:
+            j (int): Log2 of the number of generations.
+        """
+        if not isinstance(j, int) or j < 0:
+            raise ValueError("j must be a non-negative integer.")
+
+        # Pad until the pattern sits in the central quarter and the root is
+        # large enough, then once more so that growth at the speed of light
+        # (one cell per generation) cannot leave the result square.
+        while self.root.level < j + 2 or not self._is_padded(self.root):
+            self._expand()
+        self._expand()
+
+        offset = 1 << (self.root.level - 2)
+        self.root = self._next(self.root, j)
+        self.top += offset
+        self.left += offset
+        self.generation += 1 << j
+
+    def to_board(self, top: int, left: int, num_rows: int, num_cols: int) -> GameBoard:
+        """
+        Read a rectangular window of the plane as a GameBoard.
+        Args:
+            top, left (int): Board coordinates of the window's top-left cell.
+            num_rows, num_cols (int): Size of the window.
+        Returns:
+            GameBoard: The cells inside the window.
+        """
+        if num_rows <= 0 or num_cols <= 0:
+            raise ValueError("num_rows and num_cols must be positive.")
+
+        cells = np.zeros((num_rows, num_cols), dtype=np.uint8)
+        self._paint(self.root, self.top - top, self.left - left, cells)
+        return array_to_board(cells)
+
+    # ----- Node construction -----
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """
+        The canonical node with the given four children.
+        """
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw.level + 1, nw, ne, sw, se, population)
+            self._nodes[key] = node
+        return node
+
+    def _empty_node(self, level: int) -> Node:
+        """
+        The canonical all-dead node of a level.
+        """
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self._join(e, e, e, e))
+        return self._empty[level]
+
+    def _from_array(self, cells: np.ndarray, level: int) -> Node:
+        """
+        Build the node for a 2^level x 2^level array of cells.
+        """
+        if level == 0:
+            return self._on if cells[0, 0] else self._off
+        if not cells.any():
+            return self._empty_node(level)
+
+        h = 1 << (level - 1)
+        return self._join(
+            self._from_array(cells[:h, :h], level - 1),
+            self._from_array(cells[:h, h:], level - 1),
+            self._from_array(cells[h:, :h], level - 1),
+            self._from_array(cells[h:, h:], level - 1),
+        )
+
+    def _centre(self, m: Node) -> Node:
+        """
+        The central square of m, one level down.
+        """
+        return self._join(m.nw.se, m.ne.sw, m.sw.ne, m.se.nw)
+
+    def _is_padded(self, m: Node) -> bool:
+        """
+        True if every live cell of m lies in its central quarter.
+        """
+        return m.population == (
+            m.nw.se.se.population + m.ne.sw.sw.population
+            + m.sw.ne.ne.population + m.se.nw.nw.population
+        )
+
+    def _expand(self) -> None:
+        """
+        Double the root's width, keeping its contents centred.
+        """
+        m = self.root
+        e = self._empty_node(m.level - 1)
+        self.root = self._join(
+            self._join(e, e, e, m.nw),
+            self._join(e, e, m.ne, e),
+            self._join(e, m.sw, e, e),
+            self._join(m.se, e, e, e),
+        )
+        shift = 1 << (m.level - 1)
+        self.top -= shift
+        self.left -= shift
+
+    # ----- Evolution -----
+
+    def _next(self, m: Node, j: int) -> Node:
+        """
+        The central 2^(k-1) square of a level-k node after 2^j generations,
+        for j <= k - 2. Results are memoized in the LRU cache.
+        """
+        if m.population == 0:
+            return m.nw
+
+        key = (m, j)
+        result = self._results.get(key)
+        if result is not None:
+            self.stats.hits += 1
+            self._results.move_to_end(key)
+            return result
+        self.stats.misses += 1
+
+        if m.level == 2:
+            result = self._base_case(m)
+        else:
+            result = self._next_recursive(m, j)
+
+        self._results[key] = result
+        if len(self._results) > self.max_cache:
+            self._results.popitem(last=False)
+            self.stats.evictions += 1
+        return result
+
+    def _next_recursive(self, m: Node, j: int) -> Node:
+        """
+        Combine nine overlapping sub-squares of m into the advanced centre.
+        """
+        join = self._join
+        nw, ne, sw, se = m.nw, m.ne, m.sw, m.se
+
+        # nine overlapping squares of level k-1, row by row
+        squares = [
+            nw, join(nw.ne, ne.nw, nw.se, ne.sw), ne,
+            join(nw.sw, nw.se, sw.nw, sw.ne), join(nw.se, ne.sw, sw.ne, se.nw), join(ne.sw, ne.se, se.nw, se.ne),
+            sw, join(sw.ne, se.nw, sw.se, se.sw), se,
+        ]
+
+        full_speed = j == m.level - 2
+        if full_speed:
+            # advance each by 2^(j-1) now and by another 2^(j-1) below
+            s = [self._next(q, j - 1) for q in squares]
+            j_next = j - 1
+        else:
+            # no time passes at this level; all 2^j generations happen below
+            s = [self._centre(q) for q in squares]
+            j_next = j
+
+        return join(
+            self._next(join(s[0], s[1], s[3], s[4]), j_next),
+            self._next(join(s[1], s[2], s[4], s[5]), j_next),
+            self._next(join(s[3], s[4], s[6], s[7]), j_next),
+            self._next(join(s[4], s[5], s[7], s[8]), j_next),
+        )
+
+    def _base_case(self, m: Node) -> Node:
+        """
+        One generation of the central 2x2 square of a 4x4 node.
+        """
+        cells = [[0] * 4 for _ in range(4)]
+        for r0, c0, q in ((0, 0, m.nw), (0, 2, m.ne), (2, 0, m.sw), (2, 2, m.se)):
+            cells[r0][c0] = q.nw.population
+            cells[r0][c0 + 1] = q.ne.population
+            cells[r0 + 1][c0] = q.sw.population
+            cells[r0 + 1][c0 + 1] = q.se.population
+
+        new = []
+        for r in (1, 2):
+            for c in (1, 2):
+                count = sum(cells[i][k] for i in (r - 1, r, r + 1) for k in (c - 1, c, c + 1)) - cells[r][c]
+                alive = count == 3 or (cells[r][c] == 1 and count == 2)
+                new.append(self._on if alive else self._off)
+        return self._join(*new)
+
+    # ----- Output -----
+
+    def _paint(self, m: Node, r0: int, c0: int, cells: np.ndarray) -> None:
+        """
+        Write the live cells of m, whose top-left is at (r0, c0) in cells'
+        coordinates, into cells, skipping anything outside it.
+        """
+        size = 1 << m.level
+        num_rows, num_cols = cells.shape
+        if m.population == 0 or r0 >= num_rows or c0 >= num_cols or r0 + size <= 0 or c0 + size <= 0:
+            return
+        if m.level == 0:
+            cells[r0, c0] = 1
+            return
+
+        h = size >> 1
+        self._paint(m.nw, r0, c0, cells)
+        self._paint(m.ne, r0, c0 + h, cells)
+        self._paint(m.sw, r0 + h, c0, cells)
+        self._paint(m.se, r0 + h, c0 + h, cells)
+
+
+def game_of_life_at(
+    initial_board: GameBoard,
+    num_gens: int,
+    max_cache: int = DEFAULT_MAX_CACHE
+) -> GameBoard:
+    """
+    The state of a board after num_gens generations, computed with HashLife.
+    Args:
+        initial_board (GameBoard): The starting game board.
+        num_gens (int): The generation to compute.
+        max_cache (int): Maximum number of memoized results.
+    Returns:
+        GameBoard: The window of the plane covered by initial_board.
+    """
+    life = HashLife.from_board(initial_board, max_cache)
+    life.advance(num_gens)
+    return life.to_board(0, 0, len(initial_board), len(initial_board[0]))
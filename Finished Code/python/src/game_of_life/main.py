@@ -1,10 +1,12 @@
 import sys
+from functools import partial
 import pygame
 import numpy
 import imageio
 from custom_io import read_board_from_file
-from functions import play_game_of_life
-from drawing import draw_game_board, draw_game_boards
+from cycles import iterate_game_of_life_cycles
+from drawing import draw_game_board, draw_cells_frame
+from pipeline import run_pipeline
 
 
 def pygame_surface_to_numpy(surface: pygame.Surface) -> numpy.ndarray:
@@ -42,8 +44,8 @@ def main():
 
     pygame.quit()
 
-    if len(sys.argv) != 5:
-        raise ValueError("Usage: python main.py initial_board.csv output_prefix cell_width num_gens")
+    if len(sys.argv) not in (5, 6):
+        raise ValueError("Usage: python main.py initial_board.csv output_prefix cell_width num_gens [bounded|toroidal]")
     
     # sys.argv[0] is "main.py"
 
@@ -51,6 +53,7 @@ def main():
     output_prefix = sys.argv[2] # where do I draw my animation?
     cell_width = int(sys.argv[3]) # what is cell width in pixels?
     num_gens = int(sys.argv[4]) # how many generations to run?
+    edges = sys.argv[5] if len(sys.argv) == 6 else "bounded" # do cells off the board wrap around?
 
     print("Parameters read in successfully!")
     
@@ -60,36 +63,39 @@ def main():
 
     print("Board read successfully.")
 
-    print("Playing Game of Life.")
+    print("Playing Game of Life, drawing the Game boards and encoding the video.")
 
-    boards = play_game_of_life(initial_board, num_gens)
+    def report_cycle(cycle) -> None:
+        print("Board repeats with period", cycle.period, "from generation", cycle.first_seen)
 
-    print("Game of Life simulation is finished!")
-
-    print("Drawing the Game boards to surfaces.")
-
-    surfaces = draw_game_boards(boards, cell_width)
-
-    print("Boards drawn to canvases.")
-
-    # we need a little bit more code to visualize the canvases that we have as an animation
+    generations = iterate_game_of_life_cycles(initial_board, num_gens, edges, on_cycle=report_cycle)
 
     video_path = output_prefix + ".mp4" # gives it the appropriate file extension 
 
     # create a writer object to write to file 
     writer = imageio.get_writer(video_path, fps=10, codec="libx264", quality = 8)
 
-    # range over surface objects and draw each one 
-    for surface in surfaces:
-        # writer needs to convert the surface to a numpy array
-        frame = pygame_surface_to_numpy(surface)
-        writer.append_data(frame)
+    # the last frame is also saved as an image
+    frame = None
+
+    def write_frame(next_frame: numpy.ndarray) -> None:
+        nonlocal frame
+        writer.append_data(next_frame)
+        frame = next_frame
 
-    writer.close()
+    # simulation, rasterizing and encoding run as concurrent stages (see pipeline.py),
+    # so only a few boards and frames are in memory at once
+    try:
+        timings = run_pipeline(generations, partial(draw_cells_frame, cell_width=cell_width), write_frame)
+    finally:
+        writer.close()
+
+    print("Game of Life simulation is finished!")
+    print(timings.report())
 
     print("Success! MP4 video produced.")
 
-    pygame.image.save(surfaces[len(surfaces)-1], "output/test.png")
+    imageio.imwrite("output/test.png", frame)
 
 
 def pygame_surface_to_numpy(surface: pygame.Surface) -> numpy.ndarray:
@@ -0,0 +1,109 @@
+"""
+Headless NumPy rasterizer for boards of integer cell states.
+
+Each cell is drawn as a filled circle of one colour per state, centred in
+its cell_width x cell_width box, on a background colour (state 0). Instead
+of one pygame draw call per cell, a frame is built with a few whole-array
+operations:
+
+  1. a cell_width x cell_width boolean sprite of the circle is computed once
+     per (cell_width, radius) and cached,
+  2. the (rows, cols) state array is broadcast against the sprite into a
+     (rows * cell_width, cols * cell_width) array of palette indices, which
+     is the cell's state inside the circle and 0 outside it, and
+  3. a palette lookup table maps the indices to RGB.
+
+The sprite reproduces pygame.draw.circle's filled-circle algorithm, so frames
+are pixel-for-pixel identical to drawing circles on a pygame.Surface. pygame
+is not needed.
+This file is kept identical in every project that uses it.
+"""
+
+from functools import lru_cache
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def circle_sprite(cell_width: int, radius: int) -> np.ndarray:
+    """
+    The pixels of one cell covered by a filled circle of the given radius,
+    centred at (cell_width // 2, cell_width // 2) as in the drawing modules.
+    Args:
+        cell_width (int): Pixel width of each cell.
+        radius (int): Circle radius in pixels.
+    Returns:
+        np.ndarray: Read-only (cell_width, cell_width) bool array indexed [y, x].
+    """
+    if not isinstance(cell_width, int) or cell_width <= 0:
+        raise ValueError("cell_width must be a positive integer.")
+
+    # drawn on a canvas with room for the whole circle, then cropped to the cell
+    c = max(radius, cell_width)
+    size = 2 * c + cell_width
+    mask = np.zeros((size, size), dtype=bool)
+
+    def hline(x1: int, y: int, x2: int) -> None:
+        if x1 > x2:
+            x1, x2 = x2, x1
+        mask[y, x1:x2 + 1] = True
+
+    # pygame's draw_circle_filled (midpoint circle, one span per row)
+    x0 = y0 = c + cell_width // 2
+    f = 1 - radius
+    ddf_x = 0
+    ddf_y = -2 * radius
+    x = 0
+    y = radius
+    while x < y:
+        if f >= 0:
+            y -= 1
+            ddf_y += 2
+            f += ddf_y
+        x += 1
+        ddf_x += 2
+        f += ddf_x + 1
+        if f >= 0:
+            hline(x0 - x, y0 + y - 1, x0 + x - 1)
+            hline(x0 - x, y0 - y, x0 + x - 1)
+        hline(x0 - y, y0 + x - 1, x0 + y - 1)
+        hline(x0 - y, y0 - x, x0 + y - 1)
+
+    sprite = mask[c:c + cell_width, c:c + cell_width].copy()
+    sprite.flags.writeable = False
+    return sprite
+
+
+def make_palette(colors: dict[int, tuple[int, int, int]]) -> np.ndarray:
+    """
+    Build a palette lookup table from a state -> (r, g, b) mapping.
+    Returns:
+        np.ndarray: (max_state + 1, 3) uint8 array; states missing from colors are black.
+    """
+    palette = np.zeros((max(colors) + 1, 3), dtype=np.uint8)
+    for state, color in colors.items():
+        palette[state] = color
+    return palette
+
+
+def rasterize(cells: np.ndarray, cell_width: int, radius: int, palette: np.ndarray) -> np.ndarray:
+    """
+    Draw a board of integer states as an RGB frame.
+    Args:
+        cells (np.ndarray): (rows, cols) array of states, each a valid palette index.
+        cell_width (int): Pixel width of each cell.
+        radius (int): Circle radius in pixels.
+        palette (np.ndarray): (num_states, 3) uint8 lookup table; entry 0 is the background.
+    Returns:
+        np.ndarray: (rows * cell_width, cols * cell_width, 3) uint8 RGB frame.
+    """
+    cells = np.asarray(cells)
+    if cells.ndim != 2:
+        raise ValueError("cells must be a 2D array.")
+
+    rows, cols = cells.shape
+    sprite = circle_sprite(cell_width, radius)
+    # one-byte indices keep the (height, width) index array small
+    index_type = np.uint8 if len(palette) <= 256 else np.intp
+    # (rows, 1, cols, 1) * (1, cw, 1, cw) -> one cw x cw tile per cell
+    indices = cells.astype(index_type)[:, None, :, None] * sprite.astype(index_type)[None, :, None, :]
+    return np.take(palette, indices.reshape(rows * cell_width, cols * cell_width), axis=0)
@@ -0,0 +1,77 @@
+"""
+Benchmark the gravity validation policies (and the vectorized engine).
+
+Usage:
+    python benchmark.py [num_gens_jupiter] [num_bodies] [num_gens_synthetic]
+
+Example:
+    python benchmark.py 200 1000 1
+
+Runs simulate_gravity on data/jupiterMoons.txt and on a synthetic random
+universe under each validation policy, and prints wall-clock times and the
+speedup relative to "strict".
+"""
+
+import sys
+import time
+import random
+from datatypes import Body, OrderedPair, Universe
+from custom_io import read_universe
+from gravity import simulate_gravity, VALIDATION_MODES
+from vectorized import simulate_gravity_vectorized
+
+
+def main() -> None:
+    num_gens_jupiter = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    num_bodies = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    num_gens_synthetic = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    jupiter = read_universe("data/jupiterMoons.txt")
+    run_benchmark("jupiterMoons", jupiter, num_gens_jupiter, 1.0)
+
+    synthetic = random_universe(num_bodies, 1.0e12, seed=0)
+    run_benchmark(f"synthetic ({num_bodies} bodies)", synthetic, num_gens_synthetic, 1.0)
+
+
+def run_benchmark(label: str, u: Universe, num_gens: int, time_step: float) -> None:
+    """
+    Time one simulation per validation policy plus the vectorized engine.
+    """
+    print(f"--- {label}: {len(u.bodies)} bodies, {num_gens} generations ---")
+
+    timings: dict[str, float] = {}
+    for mode in VALIDATION_MODES:
+        start = time.perf_counter()
+        simulate_gravity(u, num_gens, time_step, validation=mode)
+        timings[mode] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    simulate_gravity_vectorized(u, num_gens, time_step)
+    timings["vectorized"] = time.perf_counter() - start
+
+    baseline = timings["strict"]
+    for name, elapsed in timings.items():
+        print(f"{name:>10}: {elapsed:8.3f} s  ({baseline / elapsed:6.1f}x vs strict)")
+
+
+def random_universe(num_bodies: int, width: float, seed: int | None = None) -> Universe:
+    """
+    Build a universe of num_bodies bodies at random positions with small
+    random velocities and Earth-to-Jupiter-like masses.
+    """
+    rng = random.Random(seed)
+    bodies: list[Body] = []
+    for i in range(num_bodies):
+        position = OrderedPair(rng.uniform(0.0, width), rng.uniform(0.0, width))
+        velocity = OrderedPair(rng.uniform(-1.0e3, 1.0e3), rng.uniform(-1.0e3, 1.0e3))
+        mass = rng.uniform(6.0e24, 2.0e27)
+        bodies.append(Body(
+            f"Body{i}", mass, 1.0e6,
+            position, velocity, OrderedPair(0.0, 0.0),
+            rng.randrange(256), rng.randrange(256), rng.randrange(256),
+        ))
+    return Universe(bodies, width)
+
+
+if __name__ == "__main__":
+    main()
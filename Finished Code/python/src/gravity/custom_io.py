@@ -1,3 +1,4 @@
+import math
 from datatypes import Body, OrderedPair, Universe
 
 
@@ -23,6 +24,8 @@ def parse_ordered_pair(line: str) -> OrderedPair:
         y = float(parts[1].strip())
     except ValueError as e:
         raise ValueError(f"Invalid ordered pair numeric values: {line!r}") from e
+    if not math.isfinite(x) or not math.isfinite(y):
+        raise ValueError(f"Ordered pair must be finite: {line!r}")
     return OrderedPair(x, y)
 
 
@@ -76,6 +79,9 @@ def read_universe(filename: str) -> Universe:
         A Universe populated with bodies and width.
         Also updates Universe.gravitational_constant globally.
 
+    Every value is checked here (including finiteness), so a universe read
+    from file is already valid for simulate_gravity's "boundary" policy.
+
     Raises:
         FileNotFoundError: If the file cannot be opened.
         ValueError: If the file contents are invalid or incomplete.
@@ -95,16 +101,16 @@ def read_universe(filename: str) -> Universe:
         width = float(lines[0])
     except ValueError as e:
         raise ValueError(f"Invalid universe width on line 1: {lines[0]!r}") from e
-    if width <= 0:
-        raise ValueError(f"Universe width must be > 0, got {width}")
+    if not math.isfinite(width) or width <= 0:
+        raise ValueError(f"Universe width must be a finite number > 0, got {width}")
 
     # Line 2: gravitational constant (class attribute)
     try:
         g_const = float(lines[1])
     except ValueError as e:
         raise ValueError(f"Invalid gravitational constant on line 2: {lines[1]!r}") from e
-    if g_const <= 0:
-        raise ValueError(f"Gravitational constant must be > 0, got {g_const}")
+    if not math.isfinite(g_const) or g_const <= 0:
+        raise ValueError(f"Gravitational constant must be a finite number > 0, got {g_const}")
     Universe.gravitational_constant = g_const
 
     bodies: list[Body] = []
@@ -134,16 +140,16 @@ def read_universe(filename: str) -> Universe:
             mass = float(lines[i + 2])
         except ValueError as e:
             raise ValueError(f"Invalid mass for '{name}' at line {i+3}: {lines[i+2]!r}") from e
-        if mass <= 0:
-            raise ValueError(f"Mass for '{name}' must be > 0, got {mass}")
+        if not math.isfinite(mass) or mass <= 0:
+            raise ValueError(f"Mass for '{name}' must be a finite number > 0, got {mass}")
 
         # Radius
         try:
             radius = float(lines[i + 3])
         except ValueError as e:
             raise ValueError(f"Invalid radius for '{name}' at line {i+4}: {lines[i+3]!r}") from e
-        if radius < 0:
-            raise ValueError(f"Radius for '{name}' must be >= 0, got {radius}")
+        if not math.isfinite(radius) or radius < 0:
+            raise ValueError(f"Radius for '{name}' must be a finite number >= 0, got {radius}")
 
         # Position and velocity
         try:
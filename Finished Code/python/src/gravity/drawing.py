@@ -7,9 +7,12 @@ Notes:
 """
 
 import math
+from functools import partial
+from typing import Iterable, Iterator
 import pygame
 import numpy as np  # only needed if you convert Surfaces to NumPy arrays
 from datatypes import Body, OrderedPair, Universe
+from frame_pool import stream_frames
 
 # Trail rendering parameters
 TRAIL_FREQUENCY = 10
@@ -76,7 +79,7 @@ def _validate_trails(trails: dict[int, list[OrderedPair]]) -> None:
 # ------------------------- Public API -------------------------
 
 def animate_system(
-    time_points: list[Universe],
+    time_points: Iterable[Universe],
     canvas_width: int,
     drawing_frequency: int
 ) -> list[pygame.Surface]:
@@ -86,25 +89,95 @@ def animate_system(
     Frames are sampled every `drawing_frequency` simulation steps; trail history
     is updated more frequently using `TRAIL_FREQUENCY` so trails look smooth.
 
+    time_points may be any iterable, including the generator returned by
+    gravity.iterate_gravity; snapshots are consumed one at a time and only
+    the trail positions are retained, so simulation memory stays flat.
+
     Args:
-        time_points: Snapshots of the Universe over time (0..N).
+        time_points: Snapshots of the Universe over time (0..N), one per
+            generation.
         canvas_width: Width/height (px) of the square canvas.
         drawing_frequency: Draw a frame when i % drawing_frequency == 0.
 
     Returns:
         A list of pygame.Surface objects (one per drawn frame).
     """
-    if not isinstance(time_points, list) or not time_points:
-        raise ValueError("time_points must be a non-empty list[Universe]")
-    for u in time_points:
-        _validate_universe_drawable(u)
+    if isinstance(time_points, (str, bytes)) or not isinstance(time_points, Iterable):
+        raise ValueError("time_points must be a non-empty iterable of Universe")
     _validate_canvas_width(canvas_width)
     _validate_drawing_frequency(drawing_frequency)
 
     images: list[pygame.Surface] = []
+    for u, trails in _frames_to_draw(time_points, drawing_frequency):
+        images.append(draw_to_canvas(u, canvas_width, trails))
+
+    return images
+
+
+def animate_system_parallel(
+    time_points: Iterable[Universe],
+    canvas_width: int,
+    drawing_frequency: int,
+    num_procs: int | None = None
+) -> Iterator[np.ndarray]:
+    """
+    Like animate_system, but draws the frames in worker processes (see
+    frame_pool.py) and yields them in order as RGB arrays.
+
+    Trails are still built here, in order; each frame's worker gets a copy
+    of the trails it needs.
+
+    Yields:
+        (canvas_width, canvas_width, 3) uint8 frames, each only valid until
+        the next one is requested (long enough for writer.append_data).
+    """
+    if isinstance(time_points, (str, bytes)) or not isinstance(time_points, Iterable):
+        raise ValueError("time_points must be a non-empty iterable of Universe")
+    _validate_canvas_width(canvas_width)
+    _validate_drawing_frequency(drawing_frequency)
+
+    frames = frames_to_draw(time_points, drawing_frequency)
+    yield from stream_frames(frames, partial(draw_frame, canvas_width=canvas_width), num_procs)
+
+
+def frames_to_draw(
+    time_points: Iterable[Universe],
+    drawing_frequency: int
+) -> Iterator[tuple[Universe, dict[int, list[OrderedPair]]]]:
+    """
+    Lazily pick the snapshots animate_system would draw, each with its own
+    copy of the trails, ready to be drawn with draw_frame on another thread
+    or process (see pipeline.py and frame_pool.py).
+
+    Yields:
+        (universe, trails) pairs, in order.
+    """
+    if isinstance(time_points, (str, bytes)) or not isinstance(time_points, Iterable):
+        raise ValueError("time_points must be a non-empty iterable of Universe")
+    _validate_drawing_frequency(drawing_frequency)
+
+    yield from _frames_to_draw(time_points, drawing_frequency, copy_trails=True)
+
+
+def _frames_to_draw(
+    time_points: Iterable[Universe],
+    drawing_frequency: int,
+    copy_trails: bool = False
+) -> Iterator[tuple[Universe, dict[int, list[OrderedPair]]]]:
+    """
+    Yield (universe, trails) for every snapshot that should be drawn,
+    updating the trails from every snapshot on the way.
+
+    With copy_trails the trails are copied for each frame; otherwise the
+    same dict is yielded every time and keeps changing.
+    """
     trails: dict[int, list[OrderedPair]] = {}
+    num_snapshots = 0
 
     for i, u in enumerate(time_points):
+        _validate_universe_drawable(u)
+        num_snapshots += 1
+
         # Update trails at the configured frequency for smoother paths
         if (i * TRAIL_FREQUENCY) % drawing_frequency == 0:
             for body_index, body in enumerate(u.bodies):
@@ -118,10 +191,21 @@ def animate_system(
 
         # Emit a drawable frame on schedule
         if i % drawing_frequency == 0:
-            surface = draw_to_canvas(u, canvas_width, trails)
-            images.append(surface)
+            if copy_trails:
+                yield u, {body_index: list(trail) for body_index, trail in trails.items()}
+            else:
+                yield u, trails
 
-    return images
+    if num_snapshots == 0:
+        raise ValueError("time_points must be a non-empty iterable of Universe")
+
+
+def draw_frame(frame: tuple[Universe, dict[int, list[OrderedPair]]], canvas_width: int) -> np.ndarray:
+    """
+    Draw one (universe, trails) pair from frames_to_draw as an RGB array.
+    """
+    u, trails = frame
+    return pygame_surface_to_numpy(draw_to_canvas(u, canvas_width, trails))
 
 
 def draw_to_canvas(
@@ -1,7 +1,43 @@
 import math
+from collections import deque
+from typing import Iterable, Iterator
 from datatypes import Universe, Body, OrderedPair
 
 
+# ------------------------- Validation Policy -------------------------
+#
+# "strict":   every public function validates its arguments (the original
+#             behaviour; O(N^2) validations per step on top of the physics).
+# "boundary": simulate_gravity validates its inputs once, then the inner
+#             update/force functions run unchecked.
+# "off":      no validation anywhere in this module.
+
+VALIDATION_MODES = ("strict", "boundary", "off")
+
+_validation_mode = "strict"
+
+
+def set_validation_mode(mode: str) -> None:
+    """
+    Set the module-wide validation policy used by the per-step functions
+    (update_universe, update_velocity, compute_force, ...) when they are
+    called without an explicit validation argument.
+
+    Args:
+        mode: One of "strict", "boundary", or "off".
+    """
+    global _validation_mode
+    _validate_mode(mode)
+    _validation_mode = mode
+
+
+def get_validation_mode() -> str:
+    """
+    Return the current module-wide validation policy.
+    """
+    return _validation_mode
+
+
 # ------------------------- Validation Helpers -------------------------
 
 def _is_finite_number(x: float) -> bool:
@@ -46,37 +82,118 @@ def _validate_gravitational_constant(G: float) -> None:
     if not _is_finite_number(G) or G <= 0:
         raise ValueError("Universe.gravitational_constant must be a positive finite number")
 
+def _validate_mode(mode: str) -> None:
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"validation mode must be one of {VALIDATION_MODES}, got {mode!r}")
+
+def _resolve_mode(validation: str | None) -> str:
+    return _validation_mode if validation is None else validation
+
+def _strict(validation: str | None) -> bool:
+    return _resolve_mode(validation) == "strict"
+
 
 # ------------------------- Simulation API -------------------------
 
-def simulate_gravity(initial_universe: Universe, num_gens: int, time: float) -> list[Universe]:
+def simulate_gravity(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    validation: str = "boundary"
+) -> list[Universe]:
     """
     Simulate an N-body system for a fixed number of generations.
 
+    Every generation is kept in memory; use iterate_gravity to stream
+    snapshots instead.
+
     Args:
         initial_universe: The starting state of the universe.
         num_gens: Number of simulation steps to advance (>= 0).
         time: Time step (Δt) between generations (> 0).
+        validation: "strict" re-validates inside every per-step call,
+            "boundary" validates the inputs once here and then runs the
+            inner loops unchecked, "off" skips validation entirely.
 
     Returns:
         A list of Universe snapshots of length num_gens + 1.
     """
-    _validate_universe(initial_universe)
-    _validate_num_gens(num_gens)
-    _validate_time_step(time)
-    _validate_gravitational_constant(Universe.gravitational_constant)
+    return list(iterate_gravity(initial_universe, num_gens, time, validation=validation))
 
-    time_points = [initial_universe]
 
-    # range from 1 to num_gens, and call update_universe to fill time_points[i]
+def iterate_gravity(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    every: int = 1,
+    validation: str = "boundary"
+) -> Iterator[Universe]:
+    """
+    Lazily simulate an N-body system, yielding snapshots as they are produced.
+
+    Only the current generation is held by the generator, so memory stays flat
+    no matter how large num_gens is; the consumer decides what to keep (see
+    final_universe and keep_last).
+
+    Args:
+        initial_universe: The starting state of the universe.
+        num_gens: Number of simulation steps to advance (>= 0).
+        time: Time step (Δt) between generations (> 0).
+        every: Yield generation i only when i % every == 0 (generation 0,
+            i.e. initial_universe itself, is always yielded).
+        validation: Validation policy, as in simulate_gravity.
+
+    Yields:
+        Universe snapshots for generations 0, every, 2 * every, ... <= num_gens.
+    """
+    _validate_mode(validation)
+    if not isinstance(every, int) or every <= 0:
+        raise ValueError("every must be an integer > 0")
+
+    if validation != "off":
+        _validate_universe(initial_universe)
+        _validate_num_gens(num_gens)
+        _validate_time_step(time)
+        _validate_gravitational_constant(Universe.gravitational_constant)
+
+    # Inner calls only validate under the strict policy
+    inner_mode = "strict" if validation == "strict" else "off"
+
+    current = initial_universe
+    yield current
+
     for i in range(1, num_gens + 1):
-        updated = update_universe(time_points[i - 1], time)
-        time_points.append(updated)
+        current = update_universe(current, time, inner_mode)
+        if i % every == 0:
+            yield current
 
-    return time_points
 
+def final_universe(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    validation: str = "boundary"
+) -> Universe:
+    """
+    Run the simulation and return only the state after num_gens generations.
+    """
+    current = initial_universe
+    for current in iterate_gravity(initial_universe, num_gens, time, validation=validation):
+        pass
+    return current
 
-def update_universe(current_universe: Universe, time: float) -> Universe:
+
+def keep_last(snapshots: Iterable[Universe], window: int) -> list[Universe]:
+    """
+    Consume a stream of snapshots, keeping only the most recent `window`
+    of them (e.g. a trail window), oldest first.
+    """
+    if not isinstance(window, int) or window <= 0:
+        raise ValueError("window must be an integer > 0")
+    return list(deque(snapshots, maxlen=window))
+
+
+def update_universe(current_universe: Universe, time: float, validation: str | None = None) -> Universe:
     """
     Advance the universe by a single time step.
 
@@ -86,76 +203,97 @@ def update_universe(current_universe: Universe, time: float) -> Universe:
     Args:
         current_universe: Universe state at the current time.
         time: Time step (Δt) to advance.
+        validation: Validation policy for this step and every helper it
+            calls (default: the module-wide policy). Passing it here rather
+            than through set_validation_mode is safe with other threads
+            simulating at the same time.
 
     Returns:
         A new Universe instance representing the next state.
     """
-    _validate_universe(current_universe)
-    _validate_time_step(time)
-    _validate_gravitational_constant(Universe.gravitational_constant)
+    if validation is not None:
+        _validate_mode(validation)
+    validation = _resolve_mode(validation)
+
+    if _strict(validation):
+        _validate_universe(current_universe)
+        _validate_time_step(time)
+        _validate_gravitational_constant(Universe.gravitational_constant)
 
-    new_universe = copy_universe(current_universe)
+    new_universe = copy_universe(current_universe, validation)
 
     # Update every body in the cloned universe based on forces from current_universe
     for b in new_universe.bodies:
         old_acc, old_vel = b.acceleration, b.velocity
-        b.acceleration = update_acceleration(current_universe, b)
-        b.velocity = update_velocity(b, old_acc, time)
-        b.position = update_position(b, old_acc, old_vel, time)
+        b.acceleration = update_acceleration(current_universe, b, validation)
+        b.velocity = update_velocity(b, old_acc, time, validation)
+        b.position = update_position(b, old_acc, old_vel, time, validation)
 
     return new_universe
 
 
-def update_velocity(b: Body, old_acceleration: OrderedPair, time: float) -> OrderedPair:
+def update_velocity(b: Body, old_acceleration: OrderedPair, time: float, validation: str | None = None) -> OrderedPair:
     """
     Update velocity using average acceleration over the step.
 
     v_{t+Δt} = v_t + 0.5 * (a_t + a_{t+Δt}) * Δt
     """
-    _validate_body(b)
-    _validate_pair(old_acceleration, "old_acceleration")
-    _validate_time_step(time)
+    if _strict(validation):
+        _validate_body(b)
+        _validate_pair(old_acceleration, "old_acceleration")
+        _validate_time_step(time)
 
     vx = b.velocity.x + 0.5 * (b.acceleration.x + old_acceleration.x) * time
     vy = b.velocity.y + 0.5 * (b.acceleration.y + old_acceleration.y) * time
     return OrderedPair(vx, vy)
 
 
-def update_position(b: Body, old_acc: OrderedPair, old_vel: OrderedPair, time: float) -> OrderedPair:
+def update_position(
+    b: Body,
+    old_acc: OrderedPair,
+    old_vel: OrderedPair,
+    time: float,
+    validation: str | None = None
+) -> OrderedPair:
     """
     Update position using constant-acceleration kinematics.
 
     p_{t+Δt} = p_t + v_t * Δt + 0.5 * a_t * Δt^2
     """
-    _validate_body(b)
-    _validate_pair(old_acc, "old_acc")
-    _validate_pair(old_vel, "old_vel")
-    _validate_time_step(time)
+    if _strict(validation):
+        _validate_body(b)
+        _validate_pair(old_acc, "old_acc")
+        _validate_pair(old_vel, "old_vel")
+        _validate_time_step(time)
 
     px = b.position.x + old_vel.x * time + 0.5 * old_acc.x * time * time
     py = b.position.y + old_vel.y * time + 0.5 * old_acc.y * time * time
     return OrderedPair(px, py)
 
 
-def update_acceleration(current_universe: Universe, b: Body) -> OrderedPair:
+def update_acceleration(current_universe: Universe, b: Body, validation: str | None = None) -> OrderedPair:
     """
     Compute acceleration from the net gravitational force on a body (a = F / m).
     """
-    _validate_universe(current_universe)
-    _validate_body(b)
-    _validate_gravitational_constant(Universe.gravitational_constant)
+    if _strict(validation):
+        _validate_universe(current_universe)
+        _validate_body(b)
+        _validate_gravitational_constant(Universe.gravitational_constant)
 
-    force = compute_net_force(current_universe, b)
+    force = compute_net_force(current_universe, b, validation)
     return OrderedPair(force.x / b.mass, force.y / b.mass)
 
 
-def compute_net_force(current_universe: Universe, b: Body) -> OrderedPair:
+def compute_net_force(current_universe: Universe, b: Body, validation: str | None = None) -> OrderedPair:
     """
     Compute the net gravitational force on a body from all other bodies.
     """
-    _validate_universe(current_universe)
-    _validate_body(b)
-    _validate_gravitational_constant(Universe.gravitational_constant)
+    validation = _resolve_mode(validation)
+    strict = validation == "strict"
+    if strict:
+        _validate_universe(current_universe)
+        _validate_body(b)
+        _validate_gravitational_constant(Universe.gravitational_constant)
 
     net_force = OrderedPair(0.0, 0.0)
     G = Universe.gravitational_constant
@@ -164,23 +302,25 @@ def compute_net_force(current_universe: Universe, b: Body) -> OrderedPair:
         if cur_body is b:
             continue
         # We validate bodies in _validate_universe, but be robust if lists change:
-        _validate_body(cur_body)
-        current_force = compute_force(b, cur_body, G)
+        if strict:
+            _validate_body(cur_body)
+        current_force = compute_force(b, cur_body, G, validation)
         net_force.x += current_force.x
         net_force.y += current_force.y
 
     return net_force
 
 
-def compute_force(b1: Body, b2: Body, G: float) -> OrderedPair:
+def compute_force(b1: Body, b2: Body, G: float, validation: str | None = None) -> OrderedPair:
     """
     Gravitational force exerted on b1 by b2.
 
     Newton's law: F = G * m1 * m2 / r^2, along the line b1→b2.
     """
-    _validate_body(b1, idx_hint="(b1)")
-    _validate_body(b2, idx_hint="(b2)")
-    _validate_gravitational_constant(G)
+    if _strict(validation):
+        _validate_body(b1, idx_hint="(b1)")
+        _validate_body(b2, idx_hint="(b2)")
+        _validate_gravitational_constant(G)
 
     dx = b2.position.x - b1.position.x
     dy = b2.position.y - b1.position.y
@@ -193,20 +333,22 @@ def compute_force(b1: Body, b2: Body, G: float) -> OrderedPair:
     return OrderedPair(F_mag * dx / d, F_mag * dy / d)
 
 
-def copy_universe(current_universe: Universe) -> Universe:
+def copy_universe(current_universe: Universe, validation: str | None = None) -> Universe:
     """
     Deep-copy a Universe (bodies and width). G is a class attribute.
     """
-    _validate_universe(current_universe)
-    new_bodies = [copy_body(b) for b in current_universe.bodies]
+    if _strict(validation):
+        _validate_universe(current_universe)
+    new_bodies = [copy_body(b, validation) for b in current_universe.bodies]
     return Universe(new_bodies, current_universe.width)
 
 
-def copy_body(b: Body) -> Body:
+def copy_body(b: Body, validation: str | None = None) -> Body:
     """
     Deep-copy a Body, including position, velocity, and acceleration.
     """
-    _validate_body(b)
+    if _strict(validation):
+        _validate_body(b)
     return Body(
         b.name, b.mass, b.radius,
         OrderedPair(b.position.x, b.position.y),
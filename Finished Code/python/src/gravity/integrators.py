@@ -0,0 +1,443 @@
+"""
+Pluggable time integrators for the vectorized gravity engine.
+
+Every integrator advances a vectorized.UniverseArrays by one output interval
+Δt and counts how many times it evaluated the (O(N^2)) force kernel, so runs
+can be compared by accuracy per force evaluation:
+
+    "verlet"   - the scheme used by gravity.update_universe (1 eval / step)
+    "leapfrog" - kick-drift-kick leapfrog, symplectic, 2nd order (1 eval / step)
+    "yoshida4" - Yoshida's 4th-order symplectic composition (3 evals / step)
+    "rk45"     - adaptive Dormand–Prince RK4(5) with truncation-error and
+                 energy-error control (about 6 evals per accepted substep,
+                 plus one O(N^2) total-energy pass per attempted substep)
+
+Integrators also count the total-energy passes they make themselves
+(energy_evaluations); each costs about as much as a force evaluation.
+
+simulate_with_integrator runs a universe through any of them and returns an
+IntegrationStats with the force- and energy-evaluation counts and relative
+energy drift.
+"""
+
+import math
+from typing import Iterator
+import numpy as np
+from datatypes import Universe
+from gravity import (
+    _validate_universe,
+    _validate_num_gens,
+    _validate_time_step,
+    _validate_gravitational_constant,
+)
+from vectorized import (
+    UniverseArrays,
+    DEFAULT_BLOCK_SIZE,
+    arrays_to_universe,
+    compute_accelerations,
+    universe_to_arrays,
+)
+
+
+# ------------------------- Energy -------------------------
+
+def total_energy(state: UniverseArrays, G: float, block_size: int = DEFAULT_BLOCK_SIZE) -> float:
+    """
+    Total mechanical energy: kinetic minus pairwise gravitational potential.
+
+    E = sum_i 0.5 * m_i * |v_i|^2 - G * sum_{i<j} m_i * m_j / |p_i - p_j|
+    """
+    masses = state.masses
+    positions = state.positions
+    kinetic = 0.5 * float(np.sum(masses * np.einsum("ij,ij->i", state.velocities, state.velocities)))
+
+    potential = 0.0
+    n = positions.shape[0]
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        delta = positions[np.newaxis, :, :] - positions[start:stop, np.newaxis, :]
+        dist = np.sqrt(np.einsum("ijk,ijk->ij", delta, delta))
+
+        # Only count each pair once (j > i), skipping zero-distance pairs
+        rows = np.arange(start, stop)[:, np.newaxis]
+        cols = np.arange(n)[np.newaxis, :]
+        keep = (cols > rows) & (dist > 0.0)
+        pair_mass = masses[start:stop, np.newaxis] * masses[np.newaxis, :]
+        potential -= float(np.sum(pair_mass[keep] / dist[keep]))
+
+    return kinetic + G * potential
+
+
+# ------------------------- Integrators -------------------------
+
+class Integrator:
+    """
+    Base class for integrators.
+
+    Subclasses implement step(); prepare() is called once before a run.
+
+    Attributes:
+        name: Short name used in INTEGRATORS.
+        block_size: Block size passed to compute_accelerations.
+        force_evaluations: Number of compute_accelerations calls so far.
+        energy_evaluations: Number of total_energy passes the integrator
+            itself made so far (not counting the ones made for IntegrationStats).
+    """
+
+    name = "base"
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self.force_evaluations = 0
+        self.energy_evaluations = 0
+
+    def prepare(self, state: UniverseArrays, G: float) -> None:
+        """
+        Reset counters before a run; may also initialise accelerations.
+        """
+        self.force_evaluations = 0
+        self.energy_evaluations = 0
+
+    def step(self, state: UniverseArrays, time: float, G: float) -> None:
+        """
+        Advance state by exactly `time`, in place.
+        """
+        raise NotImplementedError
+
+    def _accelerations(self, positions: np.ndarray, masses: np.ndarray, G: float) -> np.ndarray:
+        self.force_evaluations += 1
+        return compute_accelerations(positions, masses, G, self.block_size)
+
+    def _total_energy(self, state: UniverseArrays, G: float) -> float:
+        self.energy_evaluations += 1
+        return total_energy(state, G, self.block_size)
+
+
+class VerletIntegrator(Integrator):
+    """
+    The velocity-Verlet style step of gravity.update_universe (and
+    vectorized.update_arrays), kept here as the baseline.
+    """
+
+    name = "verlet"
+
+    def step(self, state: UniverseArrays, time: float, G: float) -> None:
+        new_acc = self._accelerations(state.positions, state.masses, G)
+        state.positions += state.velocities * time + 0.5 * state.accelerations * (time * time)
+        state.velocities += 0.5 * (state.accelerations + new_acc) * time
+        state.accelerations[...] = new_acc
+
+
+class LeapfrogIntegrator(Integrator):
+    """
+    Kick-drift-kick leapfrog:
+
+        v_{1/2} = v_0 + a(p_0) * Δt / 2
+        p_1     = p_0 + v_{1/2} * Δt
+        v_1     = v_{1/2} + a(p_1) * Δt / 2
+
+    a(p_1) is reused as the first kick of the next step.
+    """
+
+    name = "leapfrog"
+
+    def prepare(self, state: UniverseArrays, G: float) -> None:
+        super().prepare(state, G)
+        state.accelerations[...] = self._accelerations(state.positions, state.masses, G)
+
+    def step(self, state: UniverseArrays, time: float, G: float) -> None:
+        state.velocities += 0.5 * time * state.accelerations
+        state.positions += time * state.velocities
+        state.accelerations[...] = self._accelerations(state.positions, state.masses, G)
+        state.velocities += 0.5 * time * state.accelerations
+
+
+# Yoshida (1990) 4th-order coefficients
+_CBRT2 = 2.0 ** (1.0 / 3.0)
+_W1 = 1.0 / (2.0 - _CBRT2)
+_W0 = -_CBRT2 / (2.0 - _CBRT2)
+_YOSHIDA_DRIFT = (_W1 / 2.0, (_W0 + _W1) / 2.0, (_W0 + _W1) / 2.0, _W1 / 2.0)
+_YOSHIDA_KICK = (_W1, _W0, _W1)
+
+
+class Yoshida4Integrator(Integrator):
+    """
+    Yoshida's 4th-order symplectic integrator: four drifts interleaved with
+    three kicks (three force evaluations per step).
+    """
+
+    name = "yoshida4"
+
+    def step(self, state: UniverseArrays, time: float, G: float) -> None:
+        for i, kick in enumerate(_YOSHIDA_KICK):
+            state.positions += _YOSHIDA_DRIFT[i] * time * state.velocities
+            acc = self._accelerations(state.positions, state.masses, G)
+            state.velocities += kick * time * acc
+        state.positions += _YOSHIDA_DRIFT[3] * time * state.velocities
+        # Last evaluated acceleration (before the final drift); only used for output
+        state.accelerations[...] = acc
+
+
+# Dormand–Prince RK4(5) tableau
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_B5 = (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0)
+_DP_B4 = (5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+
+
+class RK45Integrator(Integrator):
+    """
+    Adaptive Dormand–Prince RK4(5).
+
+    Each call to step() covers exactly `time`, split into as many substeps as
+    needed. A substep is rejected (and retried with a smaller size) if either
+    the embedded 4th/5th-order difference exceeds rtol, or the relative change
+    in total energy exceeds energy_tol. The last accepted substep size carries
+    over to the next call.
+
+    Attributes:
+        rtol: Relative tolerance on positions (scaled by universe width) and
+            velocities (scaled by the current maximum speed).
+        energy_tol: Maximum relative energy change allowed per substep.
+        substeps: Accepted substeps so far.
+        rejected_steps: Rejected substeps so far.
+    """
+
+    name = "rk45"
+
+    def __init__(
+        self,
+        rtol: float = 1e-8,
+        energy_tol: float = 1e-9,
+        max_substeps: int = 1_000_000,
+        block_size: int = DEFAULT_BLOCK_SIZE
+    ):
+        super().__init__(block_size)
+        if not rtol > 0 or not energy_tol > 0:
+            raise ValueError("rtol and energy_tol must be > 0")
+        self.rtol = rtol
+        self.energy_tol = energy_tol
+        self.max_substeps = max_substeps
+        self.substeps = 0
+        self.rejected_steps = 0
+        self._h: float | None = None
+        self._k1: np.ndarray | None = None
+        self._energy: float = 0.0
+
+    def prepare(self, state: UniverseArrays, G: float) -> None:
+        super().prepare(state, G)
+        self.substeps = 0
+        self.rejected_steps = 0
+        self._h = None
+        self._k1 = self._accelerations(state.positions, state.masses, G)
+        state.accelerations[...] = self._k1
+        self._energy = self._total_energy(state, G)
+
+    def step(self, state: UniverseArrays, time: float, G: float) -> None:
+        if self._k1 is None:
+            self.prepare(state, G)
+
+        elapsed = 0.0
+        h = time if self._h is None else self._h
+        attempts = 0
+        while time - elapsed > 1e-12 * time:
+            attempts += 1
+            if attempts > self.max_substeps:
+                raise RuntimeError("rk45: exceeded max_substeps; tolerances may be too tight")
+
+            h_try = min(h, time - elapsed)
+            accepted, h = self._attempt(state, h_try, G)
+            if accepted:
+                elapsed += h_try
+        self._h = h
+
+    def _attempt(self, state: UniverseArrays, h: float, G: float) -> tuple[bool, float]:
+        """
+        Try one substep of size h. On success, state is updated in place.
+
+        Returns:
+            (accepted, suggested size for the next substep)
+        """
+        p0, v0, masses = state.positions, state.velocities, state.masses
+
+        # Stage derivatives: dp/dt = v, dv/dt = a(p)
+        kp: list[np.ndarray] = [v0]
+        kv: list[np.ndarray] = [self._k1]
+        for row in _DP_A[1:]:
+            p = p0.copy()
+            v = v0.copy()
+            for coeff, dp, dv in zip(row, kp, kv):
+                if coeff != 0.0:
+                    p += h * coeff * dp
+                    v += h * coeff * dv
+            kp.append(v)
+            kv.append(self._accelerations(p, masses, G))
+
+        # The 7th stage is evaluated at the 5th-order solution (FSAL)
+        p5 = p0 + h * sum(b * k for b, k in zip(_DP_B5, kp) if b != 0.0)
+        v5 = v0 + h * sum(b * k for b, k in zip(_DP_B5, kv) if b != 0.0)
+        err_p = h * sum((b5 - b4) * k for b5, b4, k in zip(_DP_B5, _DP_B4, kp))
+        err_v = h * sum((b5 - b4) * k for b5, b4, k in zip(_DP_B5, _DP_B4, kv))
+
+        speed = max(float(np.max(np.abs(v0))), float(np.max(np.abs(v5))), 1e-300)
+        err = max(
+            float(np.max(np.abs(err_p))) / (self.rtol * state.width),
+            float(np.max(np.abs(err_v))) / (self.rtol * speed),
+        )
+
+        candidate = UniverseArrays(p5, v5, kv[6], masses, state.radii, state.names, state.colors, state.width)
+        new_energy = self._total_energy(candidate, G)
+        energy_err = abs(new_energy - self._energy) / max(abs(self._energy), 1e-300)
+        err = max(err, energy_err / self.energy_tol)
+
+        factor = 5.0 if err == 0.0 else min(5.0, max(0.2, 0.9 * err ** -0.2))
+        if err > 1.0:
+            self.rejected_steps += 1
+            return False, h * factor
+
+        state.positions[...] = p5
+        state.velocities[...] = v5
+        state.accelerations[...] = kv[6]
+        self._k1 = kv[6]
+        self._energy = new_energy
+        self.substeps += 1
+        return True, h * factor
+
+
+INTEGRATORS: dict[str, type[Integrator]] = {
+    cls.name: cls
+    for cls in (VerletIntegrator, LeapfrogIntegrator, Yoshida4Integrator, RK45Integrator)
+}
+
+
+def make_integrator(name: str, **kwargs) -> Integrator:
+    """
+    Build an integrator by name (see INTEGRATORS), forwarding keyword options.
+    """
+    if name not in INTEGRATORS:
+        raise ValueError(f"unknown integrator {name!r}; choose from {sorted(INTEGRATORS)}")
+    return INTEGRATORS[name](**kwargs)
+
+
+# ------------------------- Simulation API -------------------------
+
+class IntegrationStats:
+    """
+    Cost and accuracy summary of one integrator run.
+
+    Attributes:
+        integrator: Integrator name.
+        generations: Output steps taken.
+        force_evaluations: Total compute_accelerations calls.
+        energy_evaluations: Total total_energy passes made by the integrator.
+        initial_energy: Total energy at generation 0.
+        final_energy: Total energy at the last generation.
+        max_relative_energy_drift: Largest |E - E0| / |E0| seen at any
+            yielded generation.
+    """
+
+    def __init__(self, integrator: str):
+        self.integrator = integrator
+        self.generations = 0
+        self.force_evaluations = 0
+        self.energy_evaluations = 0
+        self.initial_energy = 0.0
+        self.final_energy = 0.0
+        self.max_relative_energy_drift = 0.0
+
+    @property
+    def relative_energy_drift(self) -> float:
+        """
+        |E_final - E0| / |E0|.
+        """
+        if self.initial_energy == 0.0:
+            return 0.0 if self.final_energy == 0.0 else math.inf
+        return abs(self.final_energy - self.initial_energy) / abs(self.initial_energy)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.integrator}: {self.generations} generations, "
+            f"{self.force_evaluations} force evaluations, "
+            f"{self.energy_evaluations} energy evaluations, "
+            f"relative energy drift {self.relative_energy_drift:.3e} "
+            f"(max {self.max_relative_energy_drift:.3e})"
+        )
+
+
+def iterate_with_integrator(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    integrator: Integrator,
+    stats: IntegrationStats,
+    every: int = 1
+) -> Iterator[Universe]:
+    """
+    Lazily simulate with the given integrator, yielding generations
+    0, every, 2 * every, ... and filling in `stats` as it goes.
+    """
+    _validate_universe(initial_universe)
+    _validate_num_gens(num_gens)
+    _validate_time_step(time)
+    _validate_gravitational_constant(Universe.gravitational_constant)
+    if not isinstance(every, int) or every <= 0:
+        raise ValueError("every must be an integer > 0")
+
+    G = Universe.gravitational_constant
+    state = universe_to_arrays(initial_universe)
+    integrator.prepare(state, G)
+
+    stats.initial_energy = stats.final_energy = total_energy(state, G, integrator.block_size)
+    stats.force_evaluations = integrator.force_evaluations
+    stats.energy_evaluations = integrator.energy_evaluations
+
+    yield initial_universe
+    for i in range(1, num_gens + 1):
+        integrator.step(state, time, G)
+        stats.generations = i
+        stats.force_evaluations = integrator.force_evaluations
+        stats.energy_evaluations = integrator.energy_evaluations
+
+        if i % every == 0 or i == num_gens:
+            stats.final_energy = total_energy(state, G, integrator.block_size)
+            stats.max_relative_energy_drift = max(
+                stats.max_relative_energy_drift, stats.relative_energy_drift
+            )
+        if i % every == 0:
+            yield arrays_to_universe(state)
+
+
+def simulate_with_integrator(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    integrator: Integrator | str = "yoshida4",
+    every: int = 1
+) -> tuple[list[Universe], IntegrationStats]:
+    """
+    Simulate an N-body system with a chosen integrator.
+
+    Args:
+        initial_universe: The starting state of the universe.
+        num_gens: Number of output steps to advance (>= 0).
+        time: Output time step Δt (> 0); adaptive integrators may substep.
+        integrator: An Integrator instance or a name from INTEGRATORS.
+        every: Keep only every `every`-th generation (generation 0 is kept).
+
+    Returns:
+        (snapshots, stats) where stats reports force evaluations and
+        relative energy drift for the run.
+    """
+    if isinstance(integrator, str):
+        integrator = make_integrator(integrator)
+
+    stats = IntegrationStats(integrator.name)
+    snapshots = list(iterate_with_integrator(initial_universe, num_gens, time, integrator, stats, every))
+    return snapshots, stats
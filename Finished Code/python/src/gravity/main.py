@@ -2,53 +2,63 @@
 CLI entry point for the gravity simulation.
 
 Usage:
-    python main.py <scenario_name> <num_gens> <time_step> <canvas_width> <drawing_frequency>
+    python main.py <scenario_name> <num_gens> <time_step> <canvas_width> <drawing_frequency> [--trajectory]
 
 Example:
     python main.py jupiter_4 2000 0.01 800 5
 
 This will read:   data/jupiter_4.txt
 and write video:  output/jupiter_4.mp4
+
+With --trajectory every generation is also stored in output/jupiter_4.npy and
+output/jupiter_4.json (see trajectory.py), which render.py can redraw later
+without re-simulating.
 """
 
 import sys
 import os
-import time
-import imageio.v2 as imageio
+from functools import partial
 from custom_io import read_universe
-from gravity import simulate_gravity
-from drawing import animate_system, pygame_surface_to_numpy
+from gravity import iterate_gravity
+from drawing import frames_to_draw, draw_frame
+from pipeline import encode_video
+from trajectory import TrajectoryWriter, tee_trajectory
 
 
 def main() -> None:
     """
     Run the full pipeline:
       1) read universe from file
-      2) simulate gravity for N generations
-      3) render selected frames to pygame surfaces
-      4) encode frames to an MP4 video
+      2) simulate gravity for N generations, render selected frames and
+         encode them to an MP4 video, all three as concurrent stages
+         (see pipeline.py)
     """
     print("Let's simulate gravity!")
 
-    # Expect 5 user arguments (plus program name)
-    if len(sys.argv) != 6:
+    args = sys.argv[1:]
+    record = "--trajectory" in args
+    if record:
+        args.remove("--trajectory")
+
+    # Expect 5 user arguments (besides the optional flag)
+    if len(args) != 5:
         raise ValueError(
             "Error: incorrect number of command line arguments.\n\n"
             "Usage:\n"
-            "  python main.py <scenario_name> <num_gens> <time_step> <canvas_width> <drawing_frequency>\n"
+            "  python main.py <scenario_name> <num_gens> <time_step> <canvas_width> <drawing_frequency> [--trajectory]\n"
             "Example:\n"
             "  python main.py jupiter_4 2000 0.01 800 5"
         )
 
-    scenario = sys.argv[1]
+    scenario = args[0]
     input_file = f"data/{scenario}.txt"
     output_stub = f"output/{scenario}"
 
     # Parse CLI arguments
-    num_gens = int(sys.argv[2])
-    time_step = float(sys.argv[3])
-    canvas_width = int(sys.argv[4])
-    drawing_frequency = int(sys.argv[5])
+    num_gens = int(args[1])
+    time_step = float(args[2])
+    canvas_width = int(args[3])
+    drawing_frequency = int(args[4])
 
     if num_gens < 0:
         raise ValueError("Error: num_gens must be >= 0.")
@@ -67,36 +77,40 @@ def main() -> None:
     # Read initial universe (also sets Universe.gravitational_constant via file)
     initial_universe = read_universe(input_file)
 
-    # --- Simulate ---
-    print("Simulating gravity now.")
-    sim_start = time.time()
-    time_points = simulate_gravity(initial_universe, num_gens, time_step)
-    sim_end = time.time()
-    print(f"Simulation complete. Time taken: {sim_end - sim_start:.2f} seconds")
-
-    # --- Draw frames ---
-    print("Rendering frames.")
-    draw_start = time.time()
-    surfaces = animate_system(time_points, canvas_width, drawing_frequency)
-    draw_end = time.time()
-    print(f"Rendered {len(surfaces)} frames in {draw_end - draw_start:.2f} seconds.")
-
-    # --- Encode video ---
-    print("Encoding MP4 video.")
+    # --- Simulate, draw and encode frames ---
+    # Generations are streamed through the drawing and encoding stages as
+    # they are produced, so only the current Universe, the trail points and
+    # a few frames are held in memory.
+    print("Simulating gravity, rendering frames and encoding MP4 video now.")
     video_path = output_stub + ".mp4"
+    time_points = iterate_gravity(initial_universe, num_gens, time_step)
 
-    # Create a writer object to write to file.
-    # Note: libx264 requires ffmpeg available in your environment.
-    writer = imageio.get_writer(video_path, fps=10, codec="libx264", quality=8)
+    # Optionally store every generation on the way to the drawing stage
+    writer = None
+    if record:
+        writer = TrajectoryWriter(output_stub, initial_universe, num_gens + 1, time_step)
+        time_points = tee_trajectory(time_points, writer)
 
+    # Note: libx264 requires ffmpeg available in your environment.
     try:
-        for surface in surfaces:
-            frame = pygame_surface_to_numpy(surface)  # (H, W, 3) uint8
-            writer.append_data(frame)
+        timings = encode_video(
+            frames_to_draw(time_points, drawing_frequency),
+            partial(draw_frame, canvas_width=canvas_width),
+            video_path,
+            fps=10,
+            codec="libx264",
+            quality=8,
+        )
     finally:
-        writer.close()
+        if writer is not None:
+            writer.close()
+    print(f"Simulated {num_gens} generations and rendered "
+          f"{timings.stages['render'].items} frames in {timings.wall:.2f} seconds.")
+    print(timings.report())
 
     print(f"Success! MP4 video produced at: {video_path}")
+    if writer is not None:
+        print(f"Trajectory of {writer.frames_written} frames stored at: {output_stub}.npy")
     print("Animation finished! Exiting normally.")
 
 
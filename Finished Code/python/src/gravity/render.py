@@ -0,0 +1,63 @@
+"""
+Render a stored trajectory (see trajectory.py) to MP4 without re-simulating.
+
+Usage:
+    python render.py <trajectory_stem> <canvas_width> <drawing_frequency> [start_frame stop_frame]
+
+Example:
+    python render.py output/jupiterMoons 800 5 0 1000
+
+Several processes can render disjoint frame ranges of the same trajectory at
+once; each one opens the .npy read-only and memory-maps only what it touches.
+Trails restart at start_frame.
+"""
+
+import sys
+from functools import partial
+from trajectory import open_trajectory
+from drawing import frames_to_draw, draw_frame
+from pipeline import encode_video
+
+
+def main() -> None:
+    if len(sys.argv) not in (4, 6):
+        raise ValueError(
+            "Error: incorrect number of command line arguments.\n\n"
+            "Usage:\n"
+            "  python render.py <trajectory_stem> <canvas_width> <drawing_frequency> [start_frame stop_frame]\n"
+            "Example:\n"
+            "  python render.py output/jupiterMoons 800 5 0 1000"
+        )
+
+    stem = sys.argv[1]
+    canvas_width = int(sys.argv[2])
+    drawing_frequency = int(sys.argv[3])
+
+    trajectory = open_trajectory(stem)
+    start_frame, stop_frame = 0, len(trajectory)
+    if len(sys.argv) == 6:
+        start_frame = int(sys.argv[4])
+        stop_frame = int(sys.argv[5])
+    if not 0 <= start_frame < stop_frame:
+        raise ValueError("Error: need 0 <= start_frame < stop_frame.")
+
+    print(f"Rendering frames {start_frame}..{stop_frame} of {len(trajectory)}.")
+    snapshots = trajectory.universes(start_frame, stop_frame)
+    video_path = f"{stem}_{start_frame}_{stop_frame}.mp4"
+    # reading, drawing and encoding run as concurrent stages (see pipeline.py)
+    timings = encode_video(
+        frames_to_draw(snapshots, drawing_frequency),
+        partial(draw_frame, canvas_width=canvas_width),
+        video_path,
+        fps=10,
+        codec="libx264",
+        quality=8,
+    )
+    print(f"Rendered {timings.stages['render'].items} frames in {timings.wall:.2f} seconds.")
+    print(timings.report())
+
+    print(f"Success! MP4 video produced at: {video_path}")
+
+
+if __name__ == "__main__":
+    main()
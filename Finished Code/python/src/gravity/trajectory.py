@@ -0,0 +1,275 @@
+"""
+Memory-mapped binary trajectory store for gravity runs.
+
+A trajectory is two files sharing a stem:
+    <stem>.npy   float64 array of shape (frames, N, 4) holding
+                 (x, y, vx, vy) for every body in every stored frame.
+    <stem>.json  small header: body names, masses, radii, colours, G,
+                 universe width, time step, and how many frames were written.
+
+The .npy file is preallocated with numpy.lib.format.open_memmap, so frames
+are written straight to disk as the simulation runs, and a finished run can
+be reopened read-only (zero-copy) for rendering or analysis, e.g. by several
+processes each rendering its own frame range.
+"""
+
+import json
+import os
+from typing import Iterable, Iterator
+import numpy as np
+from datatypes import Body, OrderedPair, Universe
+from gravity import _validate_num_gens, _validate_time_step
+from vectorized import universe_to_arrays, update_arrays, DEFAULT_BLOCK_SIZE
+
+# Columns of each (N, 4) frame
+X, Y, VX, VY = 0, 1, 2, 3
+
+HEADER_VERSION = 1
+
+
+# ------------------------- Paths -------------------------
+
+def _data_path(stem: str) -> str:
+    return stem + ".npy"
+
+def _header_path(stem: str) -> str:
+    return stem + ".json"
+
+
+# ------------------------- Writing -------------------------
+
+class TrajectoryWriter:
+    """
+    Preallocates a (num_frames, N, 4) memmap and fills it one frame at a time.
+
+    Attributes:
+        stem: Path without extension; writes <stem>.npy and <stem>.json.
+        data: The writable memmap of shape (num_frames, N, 4).
+        header: The header dictionary saved to <stem>.json.
+        frames_written: Number of frames stored so far.
+    """
+
+    def __init__(self, stem: str, template: Universe, num_frames: int, time_step: float, every: int = 1):
+        """
+        Args:
+            stem: Output path without extension.
+            template: Universe supplying body metadata (names, masses, ...).
+            num_frames: Number of frames to preallocate (> 0).
+            time_step: Simulation Δt, recorded in the header.
+            every: Generations between stored frames, recorded in the header.
+        """
+        if not isinstance(num_frames, int) or num_frames <= 0:
+            raise ValueError("num_frames must be an integer > 0")
+
+        directory = os.path.dirname(stem)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.stem = stem
+        self.data = np.lib.format.open_memmap(
+            _data_path(stem), mode="w+", dtype=np.float64,
+            shape=(num_frames, len(template.bodies), 4),
+        )
+        self.header = {
+            "version": HEADER_VERSION,
+            "names": [b.name for b in template.bodies],
+            "masses": [b.mass for b in template.bodies],
+            "radii": [b.radius for b in template.bodies],
+            "colors": [[b.red, b.green, b.blue] for b in template.bodies],
+            "gravitational_constant": Universe.gravitational_constant,
+            "width": template.width,
+            "time_step": time_step,
+            "every": every,
+            "frames_written": 0,
+        }
+        self.frames_written = 0
+
+    def write_universe(self, u: Universe) -> None:
+        """
+        Store the next frame from a Universe snapshot.
+        """
+        if len(u.bodies) != self.data.shape[1]:
+            raise ValueError(f"universe has {len(u.bodies)} bodies, trajectory expects {self.data.shape[1]}")
+        frame = self._next_frame()
+        for i, b in enumerate(u.bodies):
+            frame[i] = (b.position.x, b.position.y, b.velocity.x, b.velocity.y)
+        self.frames_written += 1
+
+    def write_arrays(self, positions: np.ndarray, velocities: np.ndarray) -> None:
+        """
+        Store the next frame from (N, 2) position and velocity arrays.
+        """
+        frame = self._next_frame()
+        frame[:, X:Y + 1] = positions
+        frame[:, VX:VY + 1] = velocities
+        self.frames_written += 1
+
+    def close(self) -> None:
+        """
+        Flush the memmap and write the header.
+        """
+        self.data.flush()
+        self.header["frames_written"] = self.frames_written
+        with open(_header_path(self.stem), "w", encoding="utf-8") as file:
+            json.dump(self.header, file, indent=2)
+
+    def _next_frame(self) -> np.ndarray:
+        if self.frames_written >= self.data.shape[0]:
+            raise ValueError(f"trajectory is full ({self.data.shape[0]} frames)")
+        return self.data[self.frames_written]
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def record_trajectory(snapshots: Iterable[Universe], stem: str, num_frames: int, time_step: float, every: int = 1) -> int:
+    """
+    Consume a stream of snapshots (e.g. gravity.iterate_gravity) into a
+    trajectory store.
+
+    Returns:
+        The number of frames written.
+    """
+    writer = None
+    try:
+        for u in snapshots:
+            if writer is None:
+                writer = TrajectoryWriter(stem, u, num_frames, time_step, every)
+            writer.write_universe(u)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        raise ValueError("snapshots must contain at least one Universe")
+    return writer.frames_written
+
+
+def tee_trajectory(snapshots: Iterable[Universe], writer: TrajectoryWriter) -> Iterator[Universe]:
+    """
+    Yield the snapshots unchanged, storing each one in writer on the way, so
+    a run can be drawn and recorded in a single pass. The caller closes writer.
+    """
+    for u in snapshots:
+        writer.write_universe(u)
+        yield u
+
+
+def simulate_to_trajectory(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    stem: str,
+    every: int = 1,
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> int:
+    """
+    Run the vectorized engine and write every `every`-th generation
+    (including generation 0) straight from its arrays into a trajectory
+    store, without building any Universe objects along the way.
+
+    Returns:
+        The number of frames written (num_gens // every + 1).
+    """
+    _validate_num_gens(num_gens)
+    _validate_time_step(time)
+    if not isinstance(every, int) or every <= 0:
+        raise ValueError("every must be an integer > 0")
+
+    G = Universe.gravitational_constant
+    state = universe_to_arrays(initial_universe)
+
+    with TrajectoryWriter(stem, initial_universe, num_gens // every + 1, time, every) as writer:
+        writer.write_arrays(state.positions, state.velocities)
+        for i in range(1, num_gens + 1):
+            update_arrays(state, time, G, block_size)
+            if i % every == 0:
+                writer.write_arrays(state.positions, state.velocities)
+        return writer.frames_written
+
+
+# ------------------------- Reading -------------------------
+
+class Trajectory:
+    """
+    A finished trajectory, opened read-only.
+
+    Attributes:
+        data: Read-only memmap of shape (frames, N, 4); only the frames that
+            were actually written are exposed.
+        names, masses, radii, colors: Per-body metadata from the header.
+        gravitational_constant: G used for the run.
+        width: Universe width.
+        time_step: Simulation Δt.
+        every: Generations between stored frames.
+    """
+
+    def __init__(self, stem: str):
+        with open(_header_path(stem), "r", encoding="utf-8") as file:
+            header = json.load(file)
+        if header.get("version") != HEADER_VERSION:
+            raise ValueError(f"unsupported trajectory header version: {header.get('version')!r}")
+
+        data = np.load(_data_path(stem), mmap_mode="r")
+        self.data = data[:header["frames_written"]]
+
+        self.names: list[str] = header["names"]
+        self.masses: list[float] = header["masses"]
+        self.radii: list[float] = header["radii"]
+        self.colors: list[tuple[int, int, int]] = [tuple(c) for c in header["colors"]]
+        self.gravitational_constant: float = header["gravitational_constant"]
+        self.width: float = header["width"]
+        self.time_step: float = header["time_step"]
+        self.every: int = header["every"]
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def positions(self, frame: int) -> np.ndarray:
+        """
+        (N, 2) view of the positions in a frame (no copy).
+        """
+        return self.data[frame, :, X:Y + 1]
+
+    def velocities(self, frame: int) -> np.ndarray:
+        """
+        (N, 2) view of the velocities in a frame (no copy).
+        """
+        return self.data[frame, :, VX:VY + 1]
+
+    def universe_at(self, frame: int) -> Universe:
+        """
+        Rebuild a Universe for one frame (acceleration is not stored and is
+        set to zero).
+        """
+        row = self.data[frame]
+        bodies: list[Body] = []
+        for i, name in enumerate(self.names):
+            red, green, blue = self.colors[i]
+            bodies.append(Body(
+                name, self.masses[i], self.radii[i],
+                OrderedPair(float(row[i, X]), float(row[i, Y])),
+                OrderedPair(float(row[i, VX]), float(row[i, VY])),
+                OrderedPair(0.0, 0.0),
+                red, green, blue,
+            ))
+        return Universe(bodies, self.width)
+
+    def universes(self, start: int = 0, stop: int | None = None) -> Iterator[Universe]:
+        """
+        Lazily yield Universe snapshots for frames [start, stop), suitable for
+        drawing.animate_system.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for frame in range(start, stop):
+            yield self.universe_at(frame)
+
+
+def open_trajectory(stem: str) -> Trajectory:
+    """
+    Open a finished trajectory store read-only.
+    """
+    return Trajectory(stem)
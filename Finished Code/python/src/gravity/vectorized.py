@@ -0,0 +1,268 @@
+"""
+Vectorized structure-of-arrays engine for the gravity simulation.
+
+Instead of walking Universe.bodies as Python objects, every body's position,
+velocity, acceleration, and mass live in contiguous float64 NumPy arrays.
+Pairwise forces are computed in row blocks with broadcasting, so memory stays
+O(block_size * N) while the inner loops run in compiled code.
+
+The update rule is the same velocity-Verlet style step as
+gravity.update_universe; Universe/Body objects are only built at the edges
+(universe_to_arrays on the way in, arrays_to_universe on the way out).
+"""
+
+from typing import Iterator
+import numpy as np
+from datatypes import Body, OrderedPair, Universe
+from gravity import (
+    _validate_mode,
+    _validate_universe,
+    _validate_num_gens,
+    _validate_time_step,
+    _validate_gravitational_constant,
+)
+
+# Number of "target" bodies handled per broadcast block in compute_accelerations.
+DEFAULT_BLOCK_SIZE = 256
+
+
+# ------------------------- Data Type -------------------------
+
+class UniverseArrays:
+    """
+    Structure-of-arrays view of a Universe.
+
+    Attributes:
+        positions: (N, 2) float64 array of body positions.
+        velocities: (N, 2) float64 array of body velocities.
+        accelerations: (N, 2) float64 array of body accelerations.
+        masses: (N,) float64 array of body masses.
+        radii: (N,) float64 array of body radii (only used when converting back).
+        names: Body names, in the same order as the arrays.
+        colors: (red, green, blue) tuples, in the same order as the arrays.
+        width: The width of the simulation space.
+    """
+
+    def __init__(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        accelerations: np.ndarray,
+        masses: np.ndarray,
+        radii: np.ndarray,
+        names: list[str],
+        colors: list[tuple[int, int, int]],
+        width: float
+    ):
+        self.positions = positions
+        self.velocities = velocities
+        self.accelerations = accelerations
+        self.masses = masses
+        self.radii = radii
+        self.names = names
+        self.colors = colors
+        self.width = width
+
+
+# ------------------------- Conversion -------------------------
+
+def universe_to_arrays(u: Universe) -> UniverseArrays:
+    """
+    Pack a Universe into contiguous float64 arrays.
+
+    Args:
+        u: The Universe to convert (it is not modified).
+
+    Returns:
+        A UniverseArrays holding copies of every body's state.
+    """
+    n = len(u.bodies)
+    positions = np.empty((n, 2), dtype=np.float64)
+    velocities = np.empty((n, 2), dtype=np.float64)
+    accelerations = np.empty((n, 2), dtype=np.float64)
+    masses = np.empty(n, dtype=np.float64)
+    radii = np.empty(n, dtype=np.float64)
+
+    for i, b in enumerate(u.bodies):
+        positions[i] = (b.position.x, b.position.y)
+        velocities[i] = (b.velocity.x, b.velocity.y)
+        accelerations[i] = (b.acceleration.x, b.acceleration.y)
+        masses[i] = b.mass
+        radii[i] = b.radius
+
+    names = [b.name for b in u.bodies]
+    colors = [(b.red, b.green, b.blue) for b in u.bodies]
+
+    return UniverseArrays(
+        positions, velocities, accelerations, masses, radii, names, colors, u.width
+    )
+
+
+def arrays_to_universe(state: UniverseArrays) -> Universe:
+    """
+    Build a fresh Universe (with new Body/OrderedPair objects) from array state.
+    """
+    bodies: list[Body] = []
+    for i in range(len(state.names)):
+        red, green, blue = state.colors[i]
+        bodies.append(Body(
+            state.names[i], float(state.masses[i]), float(state.radii[i]),
+            OrderedPair(float(state.positions[i, 0]), float(state.positions[i, 1])),
+            OrderedPair(float(state.velocities[i, 0]), float(state.velocities[i, 1])),
+            OrderedPair(float(state.accelerations[i, 0]), float(state.accelerations[i, 1])),
+            red, green, blue,
+        ))
+    return Universe(bodies, state.width)
+
+
+def copy_arrays(state: UniverseArrays) -> UniverseArrays:
+    """
+    Copy the mutable arrays of a UniverseArrays; metadata lists are shared.
+    """
+    return UniverseArrays(
+        state.positions.copy(),
+        state.velocities.copy(),
+        state.accelerations.copy(),
+        state.masses,
+        state.radii,
+        state.names,
+        state.colors,
+        state.width,
+    )
+
+
+# ------------------------- Kernels -------------------------
+
+def compute_accelerations(
+    positions: np.ndarray,
+    masses: np.ndarray,
+    G: float,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Compute the gravitational acceleration on every body from all others.
+
+    a_i = G * sum_j m_j * (p_j - p_i) / |p_j - p_i|^3
+
+    Pairs at zero distance (including a body with itself) contribute nothing,
+    matching compute_force in gravity.py.
+
+    Args:
+        positions: (N, 2) array of positions.
+        masses: (N,) array of masses.
+        G: Gravitational constant.
+        block_size: Number of target bodies processed per broadcast block.
+        out: Optional (N, 2) array to write the result into.
+
+    Returns:
+        An (N, 2) float64 array of accelerations (out, if it was given).
+    """
+    if not isinstance(block_size, int) or block_size <= 0:
+        raise ValueError("block_size must be an integer > 0")
+
+    n = positions.shape[0]
+    if out is None:
+        out = np.empty((n, 2), dtype=np.float64)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+
+        # (B, N, 2) displacement from each target body to every source body
+        delta = positions[np.newaxis, :, :] - positions[start:stop, np.newaxis, :]
+        dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+
+        # m_j / d^3, with zero-distance pairs masked out
+        weight = np.zeros_like(dist_sq)
+        nonzero = dist_sq > 0.0
+        d = np.sqrt(dist_sq[nonzero])
+        weight[nonzero] = masses[np.nonzero(nonzero)[1]] / (d * d * d)
+
+        np.einsum("ij,ijk->ik", weight, delta, out=out[start:stop])
+
+    out *= G
+    return out
+
+
+def update_arrays(
+    state: UniverseArrays,
+    time: float,
+    G: float,
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> None:
+    """
+    Advance array state by a single time step, in place.
+
+    Mirrors update_universe: the new acceleration is computed from the current
+    positions, then
+
+        p_{t+Δt} = p_t + v_t * Δt + 0.5 * a_t * Δt^2
+        v_{t+Δt} = v_t + 0.5 * (a_t + a_{t+Δt}) * Δt
+    """
+    new_acc = compute_accelerations(state.positions, state.masses, G, block_size)
+
+    state.positions += state.velocities * time + 0.5 * state.accelerations * (time * time)
+    state.velocities += 0.5 * (state.accelerations + new_acc) * time
+    state.accelerations[...] = new_acc
+
+
+# ------------------------- Simulation API -------------------------
+
+def simulate_gravity_vectorized(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    validation: str = "boundary"
+) -> list[Universe]:
+    """
+    Drop-in replacement for gravity.simulate_gravity using the array engine.
+
+    Args:
+        initial_universe: The starting state of the universe.
+        num_gens: Number of simulation steps to advance (>= 0).
+        time: Time step (Δt) between generations (> 0).
+        block_size: Number of target bodies per force block.
+        validation: "strict" or "boundary" validate the inputs once (the
+            array kernels have no per-step checks); "off" skips validation.
+
+    Returns:
+        A list of Universe snapshots of length num_gens + 1; the first entry
+        is initial_universe itself, as in simulate_gravity.
+    """
+    return list(iterate_gravity_vectorized(
+        initial_universe, num_gens, time, block_size=block_size, validation=validation
+    ))
+
+
+def iterate_gravity_vectorized(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    every: int = 1,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    validation: str = "boundary"
+) -> Iterator[Universe]:
+    """
+    Streaming counterpart of gravity.iterate_gravity using the array engine.
+
+    Universe objects are only built for the generations that are yielded
+    (0, every, 2 * every, ...); the steps in between stay in array form.
+    """
+    _validate_mode(validation)
+    if not isinstance(every, int) or every <= 0:
+        raise ValueError("every must be an integer > 0")
+    if validation != "off":
+        _validate_universe(initial_universe)
+        _validate_num_gens(num_gens)
+        _validate_time_step(time)
+        _validate_gravitational_constant(Universe.gravitational_constant)
+
+    G = Universe.gravitational_constant
+    state = universe_to_arrays(initial_universe)
+
+    yield initial_universe
+    for i in range(1, num_gens + 1):
+        update_arrays(state, time, G, block_size)
+        if i % every == 0:
+            yield arrays_to_universe(state)
@@ -0,0 +1,168 @@
+from dataclasses import dataclass
+from typing import Iterator
+import numpy as np
+from datatypes import G, OrderedPair, Star, Universe
+from flat_quadtree import DEFAULT_CHUNK_SIZE, tree_accelerations
+from morton import build_quadtree_morton
+from parallel_forces import ParallelForceEvaluator
+
+
+@dataclass
+class StarArrays:
+    """
+    Structure-of-arrays state of a Barnes–Hut universe.
+
+    positions, velocities and accelerations are (N, 2) float64 arrays;
+    masses and radii are (N,) float64; colors is an (N, 3) int array.
+    """
+    positions: np.ndarray
+    velocities: np.ndarray
+    accelerations: np.ndarray
+    masses: np.ndarray
+    radii: np.ndarray
+    colors: np.ndarray
+    width: float
+
+
+def universe_to_arrays(universe: Universe) -> StarArrays:
+    """
+    Packs the stars of a Universe into contiguous arrays.
+    """
+    stars = universe.stars or []
+    n = len(stars)
+    positions = np.empty((n, 2), dtype=np.float64)
+    velocities = np.empty((n, 2), dtype=np.float64)
+    accelerations = np.zeros((n, 2), dtype=np.float64)
+    for i, s in enumerate(stars):
+        positions[i] = (s.position.x, s.position.y)
+        velocities[i] = (s.velocity.x, s.velocity.y)
+        if s.acceleration is not None:
+            accelerations[i] = (s.acceleration.x, s.acceleration.y)
+
+    return StarArrays(
+        positions=positions,
+        velocities=velocities,
+        accelerations=accelerations,
+        masses=np.array([s.mass for s in stars], dtype=np.float64),
+        radii=np.array([s.radius for s in stars], dtype=np.float64),
+        colors=np.array([(s.red, s.green, s.blue) for s in stars], dtype=np.int64).reshape(n, 3),
+        width=universe.width,
+    )
+
+
+def arrays_to_universe(state: StarArrays) -> Universe:
+    """
+    Builds a fresh Universe with new Star objects from array state.
+    """
+    positions = state.positions.tolist()
+    velocities = state.velocities.tolist()
+    accelerations = state.accelerations.tolist()
+    masses = state.masses.tolist()
+    radii = state.radii.tolist()
+    colors = state.colors.tolist()
+
+    stars = [
+        Star(
+            position=OrderedPair(*positions[i]),
+            velocity=OrderedPair(*velocities[i]),
+            acceleration=OrderedPair(*accelerations[i]),
+            mass=masses[i],
+            radius=radii[i],
+            red=colors[i][0],
+            green=colors[i][1],
+            blue=colors[i][2],
+        )
+        for i in range(len(masses))
+    ]
+    return Universe(width=state.width, stars=stars)
+
+
+def compute_accelerations(
+    state: StarArrays,
+    theta: float,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    evaluator: ParallelForceEvaluator | None = None
+) -> np.ndarray:
+    """
+    Builds this step's quadtree and returns every star's Barnes–Hut
+    acceleration. Massless stars get zero acceleration, as in
+    engine.update_acceleration.
+
+    If an evaluator is given, the force phase runs across its worker
+    processes (with results identical to the serial traversal).
+    """
+    tree = build_quadtree_morton(state.positions, state.masses, state.width)
+    if evaluator is None:
+        acc = tree_accelerations(tree, state.positions, theta, G, chunk_size=chunk_size)
+    else:
+        acc = evaluator.accelerations(tree, state.positions, theta, G)
+    acc[state.masses == 0.0] = 0.0
+    return acc
+
+
+def update_arrays(
+    state: StarArrays,
+    time: float,
+    theta: float,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    evaluator: ParallelForceEvaluator | None = None
+) -> None:
+    """
+    Advances the state by one time step in place, with the same update rule
+    as engine.update_universe: the new acceleration comes from the current
+    positions, then
+
+        p' = p + v * t + 0.5 * a_old * t^2
+        v' = v + 0.5 * (a_old + a_new) * t
+    """
+    new_acc = compute_accelerations(state, theta, chunk_size, evaluator)
+    state.positions += state.velocities * time + 0.5 * state.accelerations * (time * time)
+    state.velocities += 0.5 * (state.accelerations + new_acc) * time
+    state.accelerations[...] = new_acc
+
+
+def iterate_barnes_hut(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    theta: float,
+    every: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    num_procs: int = 1
+) -> Iterator[Universe]:
+    """
+    Lazily runs the array engine, yielding generations 0, every, 2 * every, ...
+    Universe objects are only built for the generations that are yielded.
+
+    With num_procs > 1 the force phase of every step is spread over a pool of
+    that many worker processes.
+    """
+    if every <= 0:
+        raise ValueError("every must be > 0")
+
+    state = universe_to_arrays(initial_universe)
+    yield initial_universe
+
+    evaluator = ParallelForceEvaluator(num_procs, chunk_size=chunk_size) if num_procs > 1 else None
+    try:
+        for i in range(1, num_gens + 1):
+            update_arrays(state, time, theta, chunk_size, evaluator)
+            if i % every == 0:
+                yield arrays_to_universe(state)
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+
+
+def barnes_hut_arrays(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    theta: float,
+    num_procs: int = 1
+) -> list[Universe]:
+    """
+    Array-backed replacement for engine.barnes_hut: returns a list of each
+    step of the universe.
+    """
+    return list(iterate_barnes_hut(initial_universe, num_gens, time, theta, num_procs=num_procs))
@@ -0,0 +1,99 @@
+import sys
+import time
+import multiprocessing
+import numpy as np
+
+from initialization import initialize_galaxy, initialize_universe, push
+from array_engine import universe_to_arrays
+from datatypes import G, OrderedPair
+from flat_quadtree import build_quadtree, tree_accelerations, direct_accelerations
+from morton import build_quadtree_morton
+from parallel_forces import ParallelForceEvaluator
+
+
+def main():
+    # Expect: python benchmark.py num_stars [sample_size | --scaling]
+    if len(sys.argv) not in (2, 3):
+        raise ValueError(
+            "Usage: python benchmark.py <num_stars> [sample_size | --scaling]\n"
+            "Example: python benchmark.py 100000 1000\n"
+            "         python benchmark.py 100000 --scaling"
+        )
+
+    num_stars = int(sys.argv[1])
+    if len(sys.argv) == 3 and sys.argv[2] == "--scaling":
+        scaling_curve(num_stars)
+        return
+    sample_size = int(sys.argv[2]) if len(sys.argv) == 3 else 1000
+
+    state = universe_to_arrays(three_galaxies(num_stars))
+    n = len(state.masses)
+    print(f"{n} stars (including black holes)")
+
+    start = time.time()
+    tree = build_quadtree(state.positions, state.masses, state.width)
+    print(f"Tree build (insertion): {time.time() - start:.2f}s, {tree.num_nodes} nodes")
+
+    start = time.time()
+    tree = build_quadtree_morton(state.positions, state.masses, state.width)
+    print(f"Tree build (Morton bulk): {time.time() - start:.2f}s, {tree.num_nodes} nodes")
+
+    # Error is measured against direct summation on a random sample of stars
+    rng = np.random.default_rng(0)
+    sample = np.sort(rng.choice(n, size=min(sample_size, n), replace=False))
+    exact = direct_accelerations(state.positions, state.masses, G, sample)
+    exact_norm = np.linalg.norm(exact, axis=1)
+
+    for theta in (0.25, 0.5, 0.75, 1.0):
+        start = time.time()
+        acc = tree_accelerations(tree, state.positions, theta, G)
+        elapsed = time.time() - start
+
+        err = np.linalg.norm(acc[sample] - exact, axis=1) / exact_norm
+        print(
+            f"theta={theta:4.2f}: force pass {elapsed:6.2f}s, "
+            f"relative error median {np.median(err):.2e}, "
+            f"99th percentile {np.percentile(err, 99):.2e}"
+        )
+
+
+def scaling_curve(num_stars: int, theta: float = 0.5):
+    """
+    Times one parallel force pass for 1, 2, ..., cpu_count() worker processes
+    and prints the speedup over one process.
+    """
+    state = universe_to_arrays(three_galaxies(num_stars))
+    tree = build_quadtree_morton(state.positions, state.masses, state.width)
+    print(f"{len(state.masses)} stars, theta={theta}")
+
+    baseline = None
+    reference = None
+    for num_procs in range(1, multiprocessing.cpu_count() + 1):
+        with ParallelForceEvaluator(num_procs) as evaluator:
+            start = time.time()
+            acc = evaluator.accelerations(tree, state.positions, theta, G)
+            elapsed = time.time() - start
+
+        if baseline is None:
+            baseline, reference = elapsed, acc
+        identical = np.array_equal(acc, reference)
+        print(
+            f"{num_procs:3d} procs: {elapsed:7.2f}s  speedup {baseline / elapsed:5.2f}x  "
+            f"identical to serial: {identical}"
+        )
+
+
+def three_galaxies(num_stars: int):
+    """The three-galaxy setup from main.py, with num_stars stars in total."""
+    per_galaxy = max(1, num_stars // 3)
+    g0 = initialize_galaxy(per_galaxy, 12e21, 5.0e22 - 30.0e21, 5.0e22 + 30.0e21)
+    push(g0, OrderedPair(0, 0))
+    g1 = initialize_galaxy(per_galaxy, 12e21, 5.0e22 + 30.0e21, 5.0e22 + 30.0e21)
+    push(g1, OrderedPair(0, 0))
+    g2 = initialize_galaxy(per_galaxy, 12e21, 5.0e22, 5.0e22 - 15.0e21)
+    push(g2, OrderedPair(0, 0))
+    return initialize_universe([g0, g1, g2], 1.0e23)
+
+
+if __name__ == "__main__":
+    main()
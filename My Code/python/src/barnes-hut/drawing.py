@@ -1,15 +1,17 @@
 import pygame
+from typing import Iterable
 from datatypes import Universe
 
 
 def animate_system(
-    time_points: list[Universe],
+    time_points: Iterable[Universe],
     canvas_width: int,
     frequency: int,
     scaling_factor: float
 ) -> list[pygame.Surface]:
     """
-    Takes a list of Universe objects and returns a list of Pygame surfaces.
+    Takes Universe objects (a list, or a lazy stream such as
+    trajectory.Trajectory.universes()) and returns a list of Pygame surfaces.
     Every `frequency` steps, it draws the universe on a square canvas.
     """
     images = []
@@ -25,16 +25,8 @@ def update_universe(current_universe: Universe, time: float, theta: float) -> Un
     Update the stars of the universe after one time step
     """
     new_universe = copy_universe(current_universe)
-    
-    root = Node(Quadrant(0.0, 0.0, new_universe.width))
-    quadtree = QuadTree(root)
-    
-    print("Insert")
-    for star in new_universe.stars:
-        if new_universe.in_field(star.position):
-            root.insert(star)
-    
-    print("Update values")
+    quadtree = generate_quadtree(new_universe)
+
     for star in new_universe.stars:
         old_accel = star.acceleration
         old_vel = star.velocity
@@ -45,8 +37,20 @@ def update_universe(current_universe: Universe, time: float, theta: float) -> Un
     return new_universe
 
 def generate_quadtree(universe: Universe) -> QuadTree:
-    # TODO: implement
-    pass
+    """
+    Build a quadtree over the universe containing every star that lies inside it.
+
+    This object-based tree is the readable reference; array_engine.py builds
+    the same tree in flat NumPy arrays for large runs.
+    """
+    root = Node(Quadrant(0.0, 0.0, universe.width))
+    quadtree = QuadTree(root)
+
+    for star in universe.stars:
+        if universe.in_field(star.position):
+            quadtree.insert(star)
+
+    return quadtree
 
 G = 6.67408e-11  # gravitational constant (you can scale this for visualization)
 
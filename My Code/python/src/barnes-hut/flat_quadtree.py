@@ -0,0 +1,387 @@
+from dataclasses import dataclass
+import numpy as np
+
+# Leaves deeper than this stop splitting and hold all of their stars
+# (only happens for (nearly) coincident stars).
+MAX_DEPTH = 48
+
+# Marker for "no child" / "no star"
+EMPTY = -1
+
+# star[i] of a MAX_DEPTH leaf that holds several stars
+BUCKET = -2
+
+# Number of target stars whose traversals are batched together
+DEFAULT_CHUNK_SIZE = 4096
+
+# Largest batch of (star, node) pairs pushed on the traversal stack at once;
+# bigger expansions are split so memory stays bounded even for theta = 0
+MAX_BATCH = 1 << 16
+
+
+@dataclass
+class FlatQuadTree:
+    """
+    A Barnes–Hut quadtree stored in flat, preallocated NumPy arrays.
+
+    Node i covers the square with lower-left corner (x[i], y[i]) and side
+    width[i]. Node 0 is the root. Children are ordered [NW, NE, SW, SE] like
+    datatypes.Node, and every child has a larger index than its parent.
+
+    - children[i] holds four child indices, or EMPTY for a leaf.
+    - star[i] is the index of the star stored in leaf i, EMPTY if none, or
+      BUCKET if the leaf is a MAX_DEPTH leaf holding several stars.
+    - mass[i] and center[i] are the total mass and centre of mass of all
+      stars under node i.
+    - leaf_of_star[j] is the leaf that holds star j, or EMPTY if star j lies
+      outside the universe and was not inserted.
+    - order, if set by the builder, lists the stars in a spatially coherent
+      (Morton) order that the force traversal follows.
+    """
+    children: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    width: np.ndarray
+    depth: np.ndarray
+    star: np.ndarray
+    mass: np.ndarray
+    center: np.ndarray
+    leaf_of_star: np.ndarray
+    num_nodes: int = 0
+    order: np.ndarray | None = None
+
+    def is_leaf(self, node: int) -> bool:
+        """
+        Returns whether or not the given node is a leaf node
+        """
+        return self.children[node, 0] == EMPTY
+
+    def add_node(self, x: float, y: float, width: float, depth: int) -> int:
+        """
+        Appends an empty leaf node, growing the arrays if they are full, and
+        returns its index.
+        """
+        if self.num_nodes == self.children.shape[0]:
+            self._grow()
+        i = self.num_nodes
+        self.children[i] = EMPTY
+        self.x[i] = x
+        self.y[i] = y
+        self.width[i] = width
+        self.depth[i] = depth
+        self.star[i] = EMPTY
+        self.num_nodes += 1
+        return i
+
+    def create_children(self, node: int) -> None:
+        """
+        Creates the four child nodes [NW, NE, SW, SE] of a leaf.
+        """
+        half = self.width[node] / 2
+        west_x = self.x[node]
+        east_x = west_x + half
+        south_y = self.y[node]
+        north_y = south_y + half
+        depth = self.depth[node] + 1
+
+        nw = self.add_node(west_x, north_y, half, depth)
+        ne = self.add_node(east_x, north_y, half, depth)
+        sw = self.add_node(west_x, south_y, half, depth)
+        se = self.add_node(east_x, south_y, half, depth)
+        self.children[node] = (nw, ne, sw, se)
+
+    def reserve(self, extra: int) -> None:
+        """
+        Grows the arrays so that `extra` more nodes fit without reallocating.
+        """
+        while self.num_nodes + extra > self.children.shape[0]:
+            self._grow()
+
+    def trim(self) -> None:
+        """
+        Drops unused preallocated rows so array lengths equal num_nodes.
+        """
+        n = self.num_nodes
+        self.children = self.children[:n]
+        self.x = self.x[:n]
+        self.y = self.y[:n]
+        self.width = self.width[:n]
+        self.depth = self.depth[:n]
+        self.star = self.star[:n]
+        self.mass = self.mass[:n]
+        self.center = self.center[:n]
+
+    def _grow(self) -> None:
+        capacity = 2 * self.children.shape[0]
+        self.children = _resized(self.children, capacity)
+        self.x = _resized(self.x, capacity)
+        self.y = _resized(self.y, capacity)
+        self.width = _resized(self.width, capacity)
+        self.depth = _resized(self.depth, capacity)
+        self.star = _resized(self.star, capacity)
+        self.mass = _resized(self.mass, capacity)
+        self.center = _resized(self.center, capacity)
+
+
+def _resized(a: np.ndarray, capacity: int) -> np.ndarray:
+    out = np.empty((capacity,) + a.shape[1:], dtype=a.dtype)
+    out[:a.shape[0]] = a
+    return out
+
+
+def empty_tree(num_stars: int, width: float, capacity: int | None = None) -> FlatQuadTree:
+    """
+    Preallocates a tree for num_stars stars with just the root node.
+    """
+    if capacity is None:
+        capacity = max(4 * num_stars + 1, 16)
+
+    tree = FlatQuadTree(
+        children=np.empty((capacity, 4), dtype=np.int64),
+        x=np.empty(capacity, dtype=np.float64),
+        y=np.empty(capacity, dtype=np.float64),
+        width=np.empty(capacity, dtype=np.float64),
+        depth=np.empty(capacity, dtype=np.int32),
+        star=np.empty(capacity, dtype=np.int64),
+        mass=np.zeros(capacity, dtype=np.float64),
+        center=np.zeros((capacity, 2), dtype=np.float64),
+        leaf_of_star=np.full(num_stars, EMPTY, dtype=np.int64),
+    )
+    tree.add_node(0.0, 0.0, width, 0)
+    return tree
+
+
+def in_field(positions: np.ndarray, width: float) -> np.ndarray:
+    """
+    Boolean mask of the stars inside [0, width) x [0, width).
+    """
+    px = positions[:, 0]
+    py = positions[:, 1]
+    return (px >= 0.0) & (px < width) & (py >= 0.0) & (py < width)
+
+
+def build_quadtree(positions: np.ndarray, masses: np.ndarray, width: float) -> FlatQuadTree:
+    """
+    Builds a flat quadtree by inserting stars one at a time (iteratively, no
+    recursion), then computes all node masses and centres of mass in a single
+    bottom-up pass.
+
+    Stars outside the universe are left out of the tree, as in the original
+    engine.
+    """
+    n = positions.shape[0]
+    tree = empty_tree(n, width)
+    inside = in_field(positions, width)
+
+    px = positions[:, 0].tolist()
+    py = positions[:, 1].tolist()
+
+    for i in np.nonzero(inside)[0].tolist():
+        node = 0
+        while True:
+            if not tree.is_leaf(node):
+                node = tree.children[node, _quadrant(tree, node, px[i], py[i])]
+                continue
+
+            if tree.star[node] == EMPTY:
+                tree.star[node] = i
+                tree.leaf_of_star[i] = node
+                break
+
+            if tree.depth[node] >= MAX_DEPTH:
+                # Bucket leaf: stop splitting and keep every star here
+                tree.star[node] = BUCKET
+                tree.leaf_of_star[i] = node
+                break
+
+            # Occupied leaf: split it and push the old star down one level
+            old = int(tree.star[node])
+            tree.star[node] = EMPTY
+            tree.create_children(node)
+            child = tree.children[node, _quadrant(tree, node, px[old], py[old])]
+            tree.star[child] = old
+            tree.leaf_of_star[old] = child
+
+    tree.trim()
+    compute_moments(tree, positions, masses)
+    return tree
+
+
+def _quadrant(tree: FlatQuadTree, node: int, px: float, py: float) -> int:
+    """
+    Index into children ([NW, NE, SW, SE]) of the sub-quadrant containing (px, py).
+    """
+    half = tree.width[node] / 2
+    east = px >= tree.x[node] + half
+    north = py >= tree.y[node] + half
+    return (0 if north else 2) + (1 if east else 0)
+
+
+def compute_moments(tree: FlatQuadTree, positions: np.ndarray, masses: np.ndarray) -> None:
+    """
+    Fills tree.mass and tree.center in one bottom-up pass.
+
+    Leaf sums come straight from leaf_of_star; internal nodes are then
+    processed a whole depth level at a time from the deepest level up, so
+    every node's children are final before the node itself is summed.
+    """
+    n = tree.num_nodes
+    placed = tree.leaf_of_star >= 0
+    leaves = tree.leaf_of_star[placed]
+    m = masses[placed]
+
+    mass = np.bincount(leaves, weights=m, minlength=n)
+    moment_x = np.bincount(leaves, weights=m * positions[placed, 0], minlength=n)
+    moment_y = np.bincount(leaves, weights=m * positions[placed, 1], minlength=n)
+
+    internal = np.nonzero(tree.children[:n, 0] != EMPTY)[0]
+    internal_depth = tree.depth[internal]
+    for d in range(int(internal_depth.max(initial=-1)), -1, -1):
+        nodes = internal[internal_depth == d]
+        kids = tree.children[nodes]
+        mass[nodes] = mass[kids].sum(axis=1)
+        moment_x[nodes] = moment_x[kids].sum(axis=1)
+        moment_y[nodes] = moment_y[kids].sum(axis=1)
+
+    tree.mass = mass
+    tree.center = np.zeros((n, 2), dtype=np.float64)
+    nonzero = mass > 0.0
+    tree.center[nonzero, 0] = moment_x[nonzero] / mass[nonzero]
+    tree.center[nonzero, 1] = moment_y[nonzero] / mass[nonzero]
+
+
+def tree_accelerations(
+    tree: FlatQuadTree,
+    positions: np.ndarray,
+    theta: float,
+    G: float,
+    stars: np.ndarray | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> np.ndarray:
+    """
+    Computes Barnes–Hut accelerations for the given stars (default: all).
+
+    The traversal is iterative: a stack holds batches of pending
+    (star, node) interactions. Each popped batch is split into pairs that are
+    accepted (a leaf, or a node with width / distance <= theta, whose mass is
+    applied as a point mass at its centre of mass) and pairs whose node must
+    be opened (their non-empty children are pushed back on the stack). A star
+    never interacts with the leaf that holds it.
+
+    Args:
+        tree: A tree built from the same positions.
+        positions: (N, 2) star positions.
+        theta: Opening parameter; 0 gives direct summation.
+        G: Gravitational constant.
+        stars: Indices of the target stars. By default every star, visited
+            in tree.order when the builder provided one (so each chunk holds
+            neighbouring stars that walk the same parts of the tree) and
+            returned in index order.
+        chunk_size: Number of target stars traversed together.
+
+    Returns:
+        (len(stars), 2) accelerations.
+    """
+    if stars is None:
+        n = positions.shape[0]
+        if tree.order is not None and len(tree.order) == n:
+            acc = np.empty((n, 2), dtype=np.float64)
+            acc[tree.order] = tree_accelerations(tree, positions, theta, G, tree.order, chunk_size)
+            return acc
+        stars = np.arange(n)
+
+    acc = np.zeros((len(stars), 2), dtype=np.float64)
+    if tree.num_nodes == 0 or tree.mass[0] == 0.0:
+        return acc
+
+    for start in range(0, len(stars), chunk_size):
+        chunk = stars[start:start + chunk_size]
+        acc[start:start + len(chunk)] = _chunk_accelerations(tree, positions, theta, G, chunk)
+
+    return acc
+
+
+def _chunk_accelerations(
+    tree: FlatQuadTree,
+    positions: np.ndarray,
+    theta: float,
+    G: float,
+    chunk: np.ndarray
+) -> np.ndarray:
+    k = len(chunk)
+    targets = positions[chunk]
+    own_leaf = tree.leaf_of_star[chunk]
+
+    # Accepted interactions, summed at the end
+    accepted_star: list[np.ndarray] = []
+    accepted_node: list[np.ndarray] = []
+    accepted_fx: list[np.ndarray] = []
+    accepted_fy: list[np.ndarray] = []
+
+    stack = [(np.arange(k), np.zeros(k, dtype=np.int64))]
+    while stack:
+        s, node = stack.pop()
+
+        dx = tree.center[node, 0] - targets[s, 0]
+        dy = tree.center[node, 1] - targets[s, 1]
+        dist = np.sqrt(dx * dx + dy * dy)
+
+        leaf = tree.children[node, 0] == EMPTY
+        opened = ~leaf & (tree.width[node] > theta * dist)
+        accept = ~opened & (dist > 0.0) & ~(leaf & (own_leaf[s] == node))
+
+        if np.any(accept):
+            d = dist[accept]
+            scale = G * tree.mass[node[accept]] / (d * d * d)
+            accepted_star.append(s[accept])
+            accepted_node.append(node[accept])
+            accepted_fx.append(scale * dx[accept])
+            accepted_fy.append(scale * dy[accept])
+
+        if np.any(opened):
+            kids = tree.children[node[opened]].ravel()
+            owners = np.repeat(s[opened], 4)
+            keep = tree.mass[kids] > 0.0
+            owners = owners[keep]
+            kids = kids[keep]
+            for i in range(0, len(kids), MAX_BATCH):
+                stack.append((owners[i:i + MAX_BATCH], kids[i:i + MAX_BATCH]))
+
+    if not accepted_star:
+        return np.zeros((k, 2), dtype=np.float64)
+
+    # Sum each star's terms in increasing node order. A star meets each node
+    # at most once, so this order (and therefore the rounding) depends only on
+    # the star and the tree, not on which other stars share its chunk.
+    nodes = np.concatenate(accepted_node)
+    order = np.argsort(nodes, kind="stable")
+    owners = np.concatenate(accepted_star)[order]
+    ax = np.bincount(owners, weights=np.concatenate(accepted_fx)[order], minlength=k)
+    ay = np.bincount(owners, weights=np.concatenate(accepted_fy)[order], minlength=k)
+    return np.stack((ax, ay), axis=1)
+
+
+def direct_accelerations(
+    positions: np.ndarray,
+    masses: np.ndarray,
+    G: float,
+    stars: np.ndarray | None = None,
+    block_size: int = 1024
+) -> np.ndarray:
+    """
+    Exact O(N^2) accelerations by direct summation for the given target stars
+    (default: all), in row blocks; used to measure the Barnes–Hut error.
+    """
+    if stars is None:
+        stars = np.arange(positions.shape[0])
+    acc = np.empty((len(stars), 2), dtype=np.float64)
+    for start in range(0, len(stars), block_size):
+        targets = positions[stars[start:start + block_size]]
+        delta = positions[np.newaxis, :, :] - targets[:, np.newaxis, :]
+        dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+        weight = np.zeros_like(dist_sq)
+        nonzero = dist_sq > 0.0
+        d = np.sqrt(dist_sq[nonzero])
+        weight[nonzero] = masses[np.nonzero(nonzero)[1]] / (d * d * d)
+        acc[start:start + len(targets)] = np.einsum("ij,ijk->ik", weight, delta)
+    return G * acc
@@ -1,13 +1,14 @@
 import sys
+from functools import partial
 import numpy as np
-import imageio
-import time
 import pygame.surfarray
 
 from initialization import initialize_galaxy, initialize_universe, push
-from engine import barnes_hut
-from drawing import animate_system
-from datatypes import OrderedPair
+from array_engine import iterate_barnes_hut
+from drawing import draw_to_canvas
+from datatypes import OrderedPair, Universe
+from pipeline import encode_video
+from trajectory import barnes_hut_to_trajectory, open_trajectory
 
 
 def surface_to_array(surface: pygame.Surface) -> np.ndarray:
@@ -15,20 +16,33 @@ def surface_to_array(surface: pygame.Surface) -> np.ndarray:
     return np.transpose(pygame.surfarray.array3d(surface), (1, 0, 2))
 
 
+def draw_frame(universe: Universe, canvas_width: int, scaling_factor: float) -> np.ndarray:
+    """Draw one universe as a NumPy array for imageio."""
+    return surface_to_array(draw_to_canvas(universe, canvas_width, scaling_factor))
+
+
 def main():
-    # Expect: python main.py num_stars num_gens time_interval theta canvas_width frequency
-    if len(sys.argv) != 7:
+    # Expect: python main.py num_stars num_gens time_interval theta canvas_width frequency [num_procs] [--trajectory]
+    # With --trajectory every frequency-th step is first stored in
+    # output/galaxy_<num_stars>.npy/.json (see trajectory.py) and the video is
+    # then rendered from that file.
+    args = sys.argv[1:]
+    record = "--trajectory" in args
+    if record:
+        args.remove("--trajectory")
+    if len(args) not in (6, 7):
         raise ValueError(
-            "Usage: python main.py <num_stars> <num_gens> <time_interval> <theta> <canvas_width> <frequency>\n"
-            "Example: python main.py 100 10000 4e16 1.0 1000 100"
+            "Usage: python main.py <num_stars> <num_gens> <time_interval> <theta> <canvas_width> <frequency> [num_procs] [--trajectory]\n"
+            "Example: python main.py 100 10000 4e16 1.0 1000 100 4"
         )
 
-    num_stars = int(sys.argv[1])
-    num_gens = int(sys.argv[2])
-    time_interval = float(sys.argv[3])
-    theta = float(sys.argv[4])
-    canvas_width = int(sys.argv[5])
-    frequency = int(sys.argv[6])
+    num_stars = int(args[0])
+    num_gens = int(args[1])
+    time_interval = float(args[2])
+    theta = float(args[3])
+    canvas_width = int(args[4])
+    frequency = int(args[5])
+    num_procs = int(args[6]) if len(args) == 7 else 1
 
     # Basic type sanity check (optional clarity for beginners)
     if not all(isinstance(v, int) for v in [num_stars, num_gens, canvas_width, frequency]):
@@ -50,20 +64,30 @@ def main():
     initial_universe = initialize_universe(galaxies, width)
 
     print("Start sim")
-    # --- run simulation ---
-    start = time.time()
-    time_points = barnes_hut(initial_universe, num_gens, time_interval, theta)
-    print(f"Simulation complete in {time.time() - start:.2f}s")
-
-    # --- draw and render ---
+    # --- run simulation, draw and render ---
+    # only every frequency-th step is turned into a Universe, and the three
+    # stages run concurrently (see pipeline.py), so only a few universes and
+    # frames are in memory at once
     scaling_factor = 1e11  # could later also be a CLI argument if desired
-    image_list = animate_system(time_points, canvas_width, frequency, scaling_factor)
+    if record:
+        stem = f"output/galaxy_{num_stars}"
+        frames = barnes_hut_to_trajectory(initial_universe, num_gens, time_interval, theta, stem, every=frequency, num_procs=num_procs)
+        print(f"Stored {frames} frames at {stem}.npy")
+        time_points = open_trajectory(stem).universes()
+    else:
+        time_points = iterate_barnes_hut(initial_universe, num_gens, time_interval, theta, every=frequency, num_procs=num_procs)
 
     output_filename = f"galaxy_{num_stars}.mp4"
     fps = 30
-    with imageio.get_writer(output_filename, fps=fps, codec="libx264") as writer:
-        for surface in image_list:
-            writer.append_data(surface_to_array(surface))
+    timings = encode_video(
+        time_points,
+        partial(draw_frame, canvas_width=canvas_width, scaling_factor=scaling_factor),
+        output_filename,
+        fps=fps,
+        codec="libx264",
+    )
+    print(f"Simulation and video complete in {timings.wall:.2f}s")
+    print(timings.report())
     print("Saved video as galaxy.mp4")
 
 
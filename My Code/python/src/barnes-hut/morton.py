@@ -0,0 +1,139 @@
+import numpy as np
+from flat_quadtree import BUCKET, EMPTY, FlatQuadTree, compute_moments, empty_tree, in_field
+
+# Bits of resolution per axis; keys use 2 * MORTON_BITS bits of a uint64
+MORTON_BITS = 31
+
+# Offsets of the [NW, NE, SW, SE] children in units of half the parent width
+_EAST = np.array([0.0, 1.0, 0.0, 1.0])
+_NORTH = np.array([1.0, 1.0, 0.0, 0.0])
+
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """
+    Spreads the low 32 bits of each value so there is a zero bit between
+    every pair of original bits (b31 ... b1 b0 -> 0 b31 ... 0 b1 0 b0).
+    """
+    v = v & np.uint64(0x00000000FFFFFFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+
+def grid_cells(positions: np.ndarray, width: float, bits: int = MORTON_BITS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Integer grid coordinates (column, row) of each position on a
+    2^bits x 2^bits grid over [0, width)^2. Rows count from the top, so row 0
+    is the northernmost; points outside the universe are clamped to the edge.
+    """
+    cells = 1 << bits
+    scaled = np.floor(positions / width * cells)
+    scaled = np.clip(scaled, 0, cells - 1).astype(np.uint64)
+    col = scaled[:, 0]
+    row = np.uint64(cells - 1) - scaled[:, 1]
+    return col, row
+
+
+def morton_keys(positions: np.ndarray, width: float, bits: int = MORTON_BITS) -> np.ndarray:
+    """
+    Z-order (Morton) key of each position.
+
+    Each pair of key bits, from the most significant down, is the quadrant
+    digit 2 * south + east at one level of the quadtree, so sorting by key
+    visits quadrants in the [NW, NE, SW, SE] order used by datatypes.Node.
+    """
+    col, row = grid_cells(positions, width, bits)
+    return _spread_bits(col) | (_spread_bits(row) << np.uint64(1))
+
+
+def morton_order(positions: np.ndarray, width: float) -> np.ndarray:
+    """
+    Star indices sorted along the Z-order curve; consecutive stars in this
+    order are spatially close.
+    """
+    return np.argsort(morton_keys(positions, width), kind="stable")
+
+
+def build_quadtree_morton(positions: np.ndarray, masses: np.ndarray, width: float) -> FlatQuadTree:
+    """
+    Bulk-builds the same quadtree as flat_quadtree.build_quadtree, without
+    inserting stars one at a time.
+
+    All stars are given Morton keys and sorted once. In that order every
+    node's stars form a contiguous range, and a node's four child ranges are
+    found by binary search on the next key digit. The tree is then built top
+    down, one whole level of nodes at a time. The sort order is kept in
+    tree.order so the force traversal can walk stars in the same order.
+
+    Stars outside the universe are left out of the tree, as in the original
+    engine; stars that still share a range after MORTON_BITS levels end up
+    together in one BUCKET leaf.
+    """
+    n = positions.shape[0]
+    keys = morton_keys(positions, width)
+    order = np.argsort(keys, kind="stable")
+
+    inside = in_field(positions, width)
+    sorted_stars = order[inside[order]]
+    sorted_keys = keys[sorted_stars]
+
+    tree = empty_tree(n, width)
+    tree.order = order
+
+    if len(sorted_stars) == 1:
+        tree.star[0] = sorted_stars[0]
+        tree.leaf_of_star[sorted_stars[0]] = 0
+
+    # Nodes still holding two or more stars, with their [lo, hi) ranges
+    active = np.zeros(1 if len(sorted_stars) > 1 else 0, dtype=np.int64)
+    lo = np.zeros(len(active), dtype=np.int64)
+    hi = np.full(len(active), len(sorted_stars), dtype=np.int64)
+
+    level = 0
+    while len(active) > 0:
+        if level == MORTON_BITS:
+            for node, start, stop in zip(active.tolist(), lo.tolist(), hi.tolist()):
+                tree.star[node] = BUCKET
+                tree.leaf_of_star[sorted_stars[start:stop]] = node
+            break
+
+        # Digit for this level sits at `shift`; everything above it is the
+        # node's prefix, shared by its whole range
+        shift = np.uint64(2 * (MORTON_BITS - 1 - level))
+        level_keys = sorted_keys >> shift
+        prefix = level_keys[lo] >> np.uint64(2)
+        targets = (prefix[:, np.newaxis] << np.uint64(2)) | np.arange(4, dtype=np.uint64)
+        starts = np.searchsorted(level_keys, targets.ravel()).reshape(-1, 4)
+        ends = np.concatenate((starts[:, 1:], hi[:, np.newaxis]), axis=1)
+        counts = ends - starts
+
+        # Create all four children [NW, NE, SW, SE] of every active node
+        k = len(active)
+        tree.reserve(4 * k)
+        base = tree.num_nodes
+        kids = base + np.arange(4 * k, dtype=np.int64).reshape(k, 4)
+        half = tree.width[active] / 2
+        new = slice(base, base + 4 * k)
+        tree.children[new] = EMPTY
+        tree.star[new] = EMPTY
+        tree.x[new] = (tree.x[active, np.newaxis] + half[:, np.newaxis] * _EAST).ravel()
+        tree.y[new] = (tree.y[active, np.newaxis] + half[:, np.newaxis] * _NORTH).ravel()
+        tree.width[new] = np.repeat(half, 4)
+        tree.depth[new] = level + 1
+        tree.children[active] = kids
+        tree.num_nodes += 4 * k
+
+        single = counts == 1
+        tree.star[kids[single]] = sorted_stars[starts[single]]
+        tree.leaf_of_star[sorted_stars[starts[single]]] = kids[single]
+
+        multi = counts >= 2
+        active, lo, hi = kids[multi], starts[multi], ends[multi]
+        level += 1
+
+    tree.trim()
+    compute_moments(tree, positions, masses)
+    return tree
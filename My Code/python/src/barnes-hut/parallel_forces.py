@@ -0,0 +1,159 @@
+"""
+Multi-process Barnes–Hut force evaluation.
+
+Each step the quadtree is built once in the parent. Its arrays (plus the star
+positions and an output buffer) are copied into one
+multiprocessing.shared_memory block, so workers attach to them by name
+instead of receiving pickled copies. Stars are sorted along the Morton
+(Z-order) curve and split into contiguous, spatially coherent pieces, which
+keeps each worker's traversals walking the same parts of the tree. Workers
+write their accelerations straight into the shared output buffer.
+
+Because flat_quadtree sums each star's terms in a fixed order that does not
+depend on how stars are chunked, the result is bit-for-bit identical to the
+serial tree_accelerations.
+
+Measure the scaling curve on your machine with:
+    python benchmark.py <num_stars> --scaling
+which prints the force-pass time and speedup for 1, 2, ..., cpu_count()
+worker processes.
+
+No multi-core scaling curve is provided here. The only machine this was
+measured on had a single CPU, where the command prints just the one-process
+row (100002 stars, theta=0.5):
+      1 procs:    8.41s  speedup  1.00x  identical to serial: True
+"""
+
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from flat_quadtree import DEFAULT_CHUNK_SIZE, FlatQuadTree, tree_accelerations
+from morton import morton_order
+
+# Tree fields copied into shared memory
+_TREE_FIELDS = ("children", "x", "y", "width", "depth", "star", "mass", "center", "leaf_of_star")
+
+# Pieces of work per process; more pieces balance load across clustered regions
+DEFAULT_PIECES_PER_PROC = 4
+
+
+class ParallelForceEvaluator:
+    """
+    A reusable pool of worker processes for the Barnes–Hut force phase.
+
+    Use as a context manager (or call close()) so the pool is shut down.
+    """
+
+    def __init__(
+        self,
+        num_procs: int | None = None,
+        pieces_per_proc: int = DEFAULT_PIECES_PER_PROC,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ):
+        if num_procs is None:
+            num_procs = multiprocessing.cpu_count()
+        if num_procs <= 0:
+            raise ValueError("num_procs must be > 0")
+        if pieces_per_proc <= 0:
+            raise ValueError("pieces_per_proc must be > 0")
+
+        self.num_procs = num_procs
+        self.pieces_per_proc = pieces_per_proc
+        self.chunk_size = chunk_size
+        self.pool = None
+        if num_procs > 1:
+            # Start the shared-memory tracker before forking so workers share
+            # it; otherwise each worker's own tracker "cleans up" (unlinks)
+            # the blocks it attached to when the worker exits.
+            resource_tracker.ensure_running()
+            self.pool = multiprocessing.Pool(num_procs)
+
+    def accelerations(self, tree: FlatQuadTree, positions: np.ndarray, theta: float, G: float) -> np.ndarray:
+        """
+        Barnes–Hut accelerations of every star, computed across the pool.
+        """
+        if self.pool is None:
+            return tree_accelerations(tree, positions, theta, G, chunk_size=self.chunk_size)
+
+        n = positions.shape[0]
+        arrays = {name: getattr(tree, name) for name in _TREE_FIELDS}
+        arrays["positions"] = positions
+        arrays["out"] = np.zeros((n, 2), dtype=np.float64)
+
+        shm, layout = _share(arrays)
+        try:
+            order = tree.order if tree.order is not None else morton_order(positions, tree.width[0])
+            pieces = np.array_split(order, self.num_procs * self.pieces_per_proc)
+            tasks = [
+                (shm.name, layout, tree.num_nodes, piece, theta, G, self.chunk_size)
+                for piece in pieces if len(piece) > 0
+            ]
+            self.pool.map(_evaluate_piece, tasks)
+            return _views(shm, layout)["out"].copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker pool.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self) -> "ParallelForceEvaluator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _share(arrays: dict[str, np.ndarray]) -> tuple[shared_memory.SharedMemory, list[tuple]]:
+    """
+    Copies arrays into one new shared memory block.
+
+    Returns:
+        The block and its layout: (name, offset, shape, dtype string) per array.
+    """
+    layout = []
+    offset = 0
+    for name, a in arrays.items():
+        offset = (offset + 7) // 8 * 8  # keep every array 8-byte aligned
+        layout.append((name, offset, a.shape, a.dtype.str))
+        offset += a.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    views = _views(shm, layout)
+    for name, a in arrays.items():
+        views[name][...] = a
+    return shm, layout
+
+
+def _views(shm: shared_memory.SharedMemory, layout: list[tuple]) -> dict[str, np.ndarray]:
+    """
+    NumPy views (no copies) of each array in a shared memory block.
+    """
+    return {
+        name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+        for name, offset, shape, dtype in layout
+    }
+
+
+def _evaluate_piece(task: tuple) -> None:
+    """
+    Worker: attach to the shared tree and write accelerations for one piece
+    of stars into the shared output buffer.
+    """
+    shm_name, layout, num_nodes, piece, theta, G, chunk_size = task
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        views = _views(shm, layout)
+        tree = FlatQuadTree(**{name: views[name] for name in _TREE_FIELDS}, num_nodes=num_nodes)
+        views["out"][piece] = tree_accelerations(
+            tree, views["positions"], theta, G, stars=piece, chunk_size=chunk_size
+        )
+        del views, tree
+    finally:
+        shm.close()
@@ -0,0 +1,238 @@
+"""
+Memory-mapped binary trajectory store for Barnes–Hut runs.
+
+Uses the same on-disk layout as the gravity project's trajectory store:
+    <stem>.npy   float64 array of shape (frames, N, 4) holding
+                 (x, y, vx, vy) for every star in every stored frame.
+    <stem>.json  small header: star names, masses, radii, colours, G,
+                 universe width, time step, theta, and frames written.
+
+Frames are written straight into a preallocated memmap while the simulation
+runs, so a run never has to keep a list[Universe] in memory, and a finished
+run can be reopened read-only and rendered (in pieces, if you like) without
+re-simulating.
+"""
+
+import json
+import os
+from typing import Iterable, Iterator
+import numpy as np
+from datatypes import G, OrderedPair, Star, Universe
+from array_engine import universe_to_arrays, update_arrays
+from parallel_forces import ParallelForceEvaluator
+
+# Columns of each (N, 4) frame
+X, Y, VX, VY = 0, 1, 2, 3
+
+HEADER_VERSION = 1
+
+
+def _data_path(stem: str) -> str:
+    return stem + ".npy"
+
+def _header_path(stem: str) -> str:
+    return stem + ".json"
+
+
+class TrajectoryWriter:
+    """
+    Preallocates a (num_frames, N, 4) memmap and fills it one frame at a time.
+    """
+
+    def __init__(self, stem: str, template: Universe, num_frames: int, time_step: float, theta: float, every: int = 1):
+        if num_frames <= 0:
+            raise ValueError("num_frames must be > 0")
+
+        directory = os.path.dirname(stem)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.stem = stem
+        self.data = np.lib.format.open_memmap(
+            _data_path(stem), mode="w+", dtype=np.float64,
+            shape=(num_frames, len(template.stars), 4),
+        )
+        self.header = {
+            "version": HEADER_VERSION,
+            # Stars are anonymous; name them by index so the header matches gravity's
+            "names": [f"Star{i}" for i in range(len(template.stars))],
+            "masses": [s.mass for s in template.stars],
+            "radii": [s.radius for s in template.stars],
+            "colors": [[s.red, s.green, s.blue] for s in template.stars],
+            "gravitational_constant": G,
+            "width": template.width,
+            "time_step": time_step,
+            "theta": theta,
+            "every": every,
+            "frames_written": 0,
+        }
+        self.frames_written = 0
+
+    def write_universe(self, u: Universe) -> None:
+        """
+        Store the next frame from a Universe snapshot.
+        """
+        if len(u.stars) != self.data.shape[1]:
+            raise ValueError(f"universe has {len(u.stars)} stars, trajectory expects {self.data.shape[1]}")
+        frame = self._next_frame()
+        for i, s in enumerate(u.stars):
+            frame[i] = (s.position.x, s.position.y, s.velocity.x, s.velocity.y)
+        self.frames_written += 1
+
+    def write_arrays(self, positions: np.ndarray, velocities: np.ndarray) -> None:
+        """
+        Store the next frame from (N, 2) position and velocity arrays.
+        """
+        frame = self._next_frame()
+        frame[:, X:Y + 1] = positions
+        frame[:, VX:VY + 1] = velocities
+        self.frames_written += 1
+
+    def close(self) -> None:
+        """
+        Flush the memmap and write the header.
+        """
+        self.data.flush()
+        self.header["frames_written"] = self.frames_written
+        with open(_header_path(self.stem), "w", encoding="utf-8") as file:
+            json.dump(self.header, file, indent=2)
+
+    def _next_frame(self) -> np.ndarray:
+        if self.frames_written >= self.data.shape[0]:
+            raise ValueError(f"trajectory is full ({self.data.shape[0]} frames)")
+        return self.data[self.frames_written]
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def barnes_hut_to_trajectory(
+    initial_universe: Universe,
+    num_gens: int,
+    time: float,
+    theta: float,
+    stem: str,
+    every: int = 1,
+    num_procs: int = 1
+) -> int:
+    """
+    Run the array engine, writing every `every`-th generation (including
+    generation 0) straight from its arrays to a trajectory store, without
+    building any Universe objects along the way.
+
+    With num_procs > 1 the force phase of every step is spread over a pool of
+    that many worker processes, as in array_engine.iterate_barnes_hut.
+
+    Returns:
+        The number of frames written (num_gens // every + 1).
+    """
+    if every <= 0:
+        raise ValueError("every must be > 0")
+
+    state = universe_to_arrays(initial_universe)
+    evaluator = ParallelForceEvaluator(num_procs) if num_procs > 1 else None
+    try:
+        with TrajectoryWriter(stem, initial_universe, num_gens // every + 1, time, theta, every) as writer:
+            writer.write_arrays(state.positions, state.velocities)
+            for i in range(1, num_gens + 1):
+                update_arrays(state, time, theta, evaluator=evaluator)
+                if i % every == 0:
+                    writer.write_arrays(state.positions, state.velocities)
+            return writer.frames_written
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+
+
+def record_trajectory(snapshots: Iterable[Universe], stem: str, num_frames: int, time_step: float, theta: float) -> int:
+    """
+    Consume an existing sequence of universes into a trajectory store.
+
+    Returns:
+        The number of frames written.
+    """
+    writer = None
+    try:
+        for u in snapshots:
+            if writer is None:
+                writer = TrajectoryWriter(stem, u, num_frames, time_step, theta)
+            writer.write_universe(u)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        raise ValueError("snapshots must contain at least one Universe")
+    return writer.frames_written
+
+
+class Trajectory:
+    """
+    A finished trajectory, opened read-only; `data` is a (frames, N, 4) memmap.
+    """
+
+    def __init__(self, stem: str):
+        with open(_header_path(stem), "r", encoding="utf-8") as file:
+            header = json.load(file)
+        if header.get("version") != HEADER_VERSION:
+            raise ValueError(f"unsupported trajectory header version: {header.get('version')!r}")
+
+        data = np.load(_data_path(stem), mmap_mode="r")
+        self.data = data[:header["frames_written"]]
+
+        self.names: list[str] = header["names"]
+        self.masses: list[float] = header["masses"]
+        self.radii: list[float] = header["radii"]
+        self.colors: list[tuple[int, int, int]] = [tuple(c) for c in header["colors"]]
+        self.gravitational_constant: float = header["gravitational_constant"]
+        self.width: float = header["width"]
+        self.time_step: float = header["time_step"]
+        self.every: int = header["every"]
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def positions(self, frame: int) -> np.ndarray:
+        """
+        (N, 2) view of the positions in a frame (no copy).
+        """
+        return self.data[frame, :, X:Y + 1]
+
+    def universe_at(self, frame: int) -> Universe:
+        """
+        Rebuild a Universe for one frame (acceleration is set to zero).
+        """
+        row = self.data[frame]
+        stars: list[Star] = []
+        for i in range(len(self.masses)):
+            red, green, blue = self.colors[i]
+            stars.append(Star(
+                position=OrderedPair(float(row[i, X]), float(row[i, Y])),
+                velocity=OrderedPair(float(row[i, VX]), float(row[i, VY])),
+                acceleration=OrderedPair(0.0, 0.0),
+                mass=self.masses[i],
+                radius=self.radii[i],
+                red=red,
+                green=green,
+                blue=blue,
+            ))
+        return Universe(width=self.width, stars=stars)
+
+    def universes(self, start: int = 0, stop: int | None = None) -> Iterator[Universe]:
+        """
+        Lazily yield Universe snapshots for frames [start, stop), suitable for
+        drawing.animate_system.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for frame in range(start, stop):
+            yield self.universe_at(frame)
+
+
+def open_trajectory(stem: str) -> Trajectory:
+    """
+    Open a finished trajectory store read-only.
+    """
+    return Trajectory(stem)
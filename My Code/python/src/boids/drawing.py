@@ -1,5 +1,6 @@
 import pygame
 import numpy as np
+from typing import Iterable, Iterator
 from datatypes import OrderedPair, Boid, Sky
 import imageio
 
@@ -37,14 +38,24 @@ def animate_system(time_points: list[Sky], canvas_width: int, drawing_frequency:
     """
     images: list[np.ndarray] = []
 
-    for i, sky in enumerate(time_points):
-        if i % drawing_frequency == 0:
-            frame = draw_to_canvas(sky, canvas_width)
-            images.append(frame)
+    for sky in skies_to_draw(time_points, drawing_frequency):
+        frame = draw_to_canvas(sky, canvas_width)
+        images.append(frame)
 
     return images
 
 
+def skies_to_draw(time_points: Iterable[Sky], drawing_frequency: int) -> Iterator[Sky]:
+    """
+    Lazily pick every drawing_frequency-th Sky state, the ones animate_system draws.
+    time_points may be a generator such as functions.iterate_boids, so the skies
+    can be drawn as they are produced (see pipeline.py).
+    """
+    for i, sky in enumerate(time_points):
+        if i % drawing_frequency == 0:
+            yield sky
+
+
 def draw_to_canvas(sky: Sky, canvas_width: int) -> np.ndarray:
     """
     Draw a single frame of the sky (set of boids) onto an offscreen pygame surface
@@ -1,4 +1,5 @@
 from datatypes import OrderedPair, Boid, Sky 
+from typing import Iterator
 import math
 
 #add your additional functions from cogniterra here!
@@ -7,10 +8,16 @@ def simulate_boids(initial_sky: Sky, num_gens: int, time_step: float) -> list[Sk
     """
     Simulates the boids by updating the sky for specified number of generations each specified time step long
     """
-    skies = [update_sky(initial_sky, time_step)]
-    for i in range(1, num_gens):
-        skies.append(update_sky(skies[i-1], time_step))
-    return skies
+    return list(iterate_boids(initial_sky, num_gens, time_step))
+
+def iterate_boids(initial_sky: Sky, num_gens: int, time_step: float) -> Iterator[Sky]:
+    """
+    Lazily yields the same skies as simulate_boids, one generation at a time, so only the current sky is kept
+    """
+    current_sky = initial_sky
+    for _ in range(num_gens):
+        current_sky = update_sky(current_sky, time_step)
+        yield current_sky
 
 def update_sky(current_sky: Sky, time_step: float) -> Sky:
     """
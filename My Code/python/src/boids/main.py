@@ -2,8 +2,10 @@ import imageio.v2 as imageio #hint: this might be helpful for rendering an MP4
 #feel free to import any additional packages!
 
 from datatypes import OrderedPair, Boid, Sky
-from functions import simulate_boids
-from drawing import animate_system, save_video_from_surfaces
+from functions import iterate_boids
+from drawing import skies_to_draw, draw_to_canvas
+from pipeline import encode_video
+from functools import partial
 import sys
 import random
 import math
@@ -39,14 +41,19 @@ def main():
         boids.append(boid)
     initial_sky = Sky(sky_width, boids, max_boid_speed, proximity, separation_factor, alignment_factor, cohesion_factor)
     
-    print("Simulating")
-    skies = simulate_boids(initial_sky, num_gens, time_step)
-    
-    print("Animating")
-    surfaces = animate_system(skies, canvas_width, image_frequency)
-    
-    print("Rendering")
-    save_video_from_surfaces(surfaces, "output/boids3.mp4", fps=10, codec = "libx264", quality = 8)
+    # simulating, animating and rendering run at the same time (see pipeline.py),
+    # so only a few skies and frames are in memory at once
+    print("Simulating, animating and rendering")
+    skies = iterate_boids(initial_sky, num_gens, time_step)
+    timings = encode_video(
+        skies_to_draw(skies, image_frequency),
+        partial(draw_to_canvas, canvas_width=canvas_width),
+        "output/boids3.mp4",
+        fps=10,
+        codec = "libx264",
+        quality = 8,
+    )
+    print(timings.report())
     """
     boids: 200 5000 1.0 2.0 8000 200 1.5 1.0 0.02 1.0 2000 20
     boids2: 200 5000 1.0 2.0 8000 300 3.0 1.0 0.01 1.0 2000 20
@@ -1,6 +1,27 @@
+import numpy as np
+from grid import Grid
+
 # Cell contains two attributes corresponding to
-# the concentration of predator (0-th element) and prey (1-th element) in the cell
+# the concentration of prey (0-th element) and predator (1-th element) in the cell
 Cell = tuple[float, float]
 
 # Board is a two-dimensional slice of Cells
 Board = list[list[Cell]]
+
+
+# Adapters between Board and the array-backed Grid (see grid.py). A Grid
+# holds the whole board as one float64 array with two channels per cell,
+# channel 0 for prey (A) and channel 1 for predators (B).
+
+def board_to_grid(board: Board, halo: int = 0) -> Grid:
+    """
+    Packs a Board into a two-channel float64 Grid.
+    """
+    return Grid.from_lists(board, np.float64, halo=halo)
+
+
+def grid_to_board(grid: Grid) -> Board:
+    """
+    Unpacks the current cells of a Grid into a Board of (A, B) tuples.
+    """
+    return grid.to_lists()
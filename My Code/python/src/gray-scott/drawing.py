@@ -1,5 +1,9 @@
 import pygame 
+import numpy as np
+from functools import partial
+from typing import Iterable, Iterator
 from datatypes import Board
+from frame_pool import render_frames, stream_frames
 
 # draw_boards takes a slice of Board objects as input along with a cell_width and n parameter.
 # It returns a slice of images corresponding to drawing every nth board to a file,
@@ -55,4 +59,54 @@ def draw_board(b: Board, cell_width: int) -> pygame.Surface:
 
     # canvas has an image field that we should return
     return c
- 
+
+
+# draw_cells takes a (rows, cols, 2) array of (prey, predator) concentrations,
+# as produced by the vectorized solver, along with a cell_width parameter.
+# It returns the same image as draw_board on the equivalent Board, but colors
+# every cell at once instead of drawing one rectangle per cell.
+def draw_cells(cells: np.ndarray, cell_width: int) -> pygame.Surface:
+    return pygame.surfarray.make_surface(cell_pixels(cells, cell_width))
+
+
+# cells_to_frame takes the same inputs as draw_cells and returns the image as a
+# (height, width, 3) uint8 RGB array, ready for a video writer, without
+# going through a pygame Surface.
+def cells_to_frame(cells: np.ndarray, cell_width: int) -> np.ndarray:
+    return np.ascontiguousarray(cell_pixels(cells, cell_width).transpose(1, 0, 2))
+
+
+# stream_cells_parallel takes an iterable of (rows, cols, 2) cell arrays, e.g.
+# vectorized.iterate_gray_scott, along with a cell_width parameter.
+# It colors the frames in worker processes (see frame_pool.py) and yields them
+# in order; each frame is only valid until the next one is requested.
+def stream_cells_parallel(frames: Iterable[np.ndarray], cell_width: int, num_procs: int | None = None) -> Iterator[np.ndarray]:
+    yield from stream_frames(frames, partial(cells_to_frame, cell_width=cell_width), num_procs)
+
+
+# draw_boards_parallel takes the same inputs as draw_boards and returns every
+# nth board as a (height, width, 3) uint8 RGB frame, drawn in worker processes.
+def draw_boards_parallel(boards: list[Board], cell_width: int, n: int, num_procs: int | None = None) -> list[np.ndarray]:
+    sampled = (np.array(board, dtype=np.float64) for i, board in enumerate(boards) if i % n == 0)
+    return render_frames(sampled, partial(cells_to_frame, cell_width=cell_width), num_procs)
+
+
+# cell_pixels colors the cells with draw_board's color map and returns a
+# (width, height, 3) uint8 array indexed by (x, y) like pygame.surfarray.
+def cell_pixels(cells: np.ndarray, cell_width: int) -> np.ndarray:
+    prey = cells[:, :, 0]
+    predator = cells[:, :, 1]
+
+    # same red-blue gradient as draw_board, truncating to ints like int()
+    total = prey + predator
+    val = np.divide(predator, total, out=np.zeros_like(total), where=total > 0)
+
+    pixels = np.zeros(cells.shape[:2] + (3,), dtype=np.uint8)
+    pixels[:, :, 0] = np.clip(np.trunc(val * 255), 0, 255)
+    pixels[:, :, 2] = np.clip(np.trunc((1 - val) * 255), 0, 255)
+
+    # draw_board puts row i at x = i * cell_width, which is surfarray's first
+    # axis (for non-square boards the image is rows wide and cols tall)
+    if cell_width > 1:
+        pixels = pixels.repeat(cell_width, axis=0).repeat(cell_width, axis=1)
+    return pixels
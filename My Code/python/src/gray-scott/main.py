@@ -1,22 +1,13 @@
 import os
 import sys
-import pygame
+from functools import partial
 import numpy as np
-import imageio.v2 as imageio  # imageio handles MP4 export
 
 from datatypes import Board
-from functions import simulate_gray_scott, initialize_board, total_concentration
-from drawing import draw_boards
-
-
-def pygame_surface_to_numpy(surface: pygame.Surface) -> np.ndarray:
-    """
-    Convert a Pygame Surface to a NumPy RGB image array.
-
-    Returns:
-        np.ndarray: The frame as (height, width, 3) uint8 RGB.
-    """
-    return pygame.surfarray.array3d(surface).transpose(1, 0, 2)
+from functions import initialize_board, total_concentration
+from drawing import cells_to_frame
+from vectorized import iterate_gray_scott
+from pipeline import encode_video  # imageio MP4 export, run alongside the simulation
 
 
 def main():
@@ -27,8 +18,6 @@ def main():
 
     print("Parameters read in successfully!")
 
-    pygame.init()
-
     # initialize empty board
     initial_board: Board = initialize_board(num_rows, num_cols)
 
@@ -60,10 +49,11 @@ def main():
         [0.05, 0.2, 0.05],
     ])
 
-    print("Starting simulation...")
+    print("Starting simulation and encoding video...")
     
     # tuning code below as an attempt to automate search for patterns but didn't quite work
     # if one color substantially greater than other in final board, adjust kill rate (or feed rate) to compensate and run sim again
+    # (sweep.py now searches a grid of feed/kill rates in parallel instead)
     
     # TUNE = True
     # STEP_SIZE = 0.05
@@ -102,44 +92,41 @@ def main():
     #             to_continue = False
     # else:
     
-    boards = simulate_gray_scott(
-            initial_board,
-            num_gens,
-            feed_rate,
-            kill_rate,
-            prey_diffusion_rate=0.2,
-            predator_diffusion_rate=0.1,
-            kernel=kernel,
-        )
-
-    print("Simulation complete!")
-
-    print("Drawing boards to file")
-
     # for visualization
     n = 100
     cell_width = 1
 
-    surfaces = draw_boards(boards, cell_width, n)
-
     output_dir = "output"
     os.makedirs(output_dir, exist_ok=True)
 
     output_file = os.path.join(output_dir, f"f_{feed_rate}k_{kill_rate}")
-    print("Encoding video with imageio...")
     video_path = f"{output_file}.mp4"
-    writer = imageio.get_writer(video_path, fps=10, codec="libx264", quality=8)
 
-    for surf in surfaces:
-        frame = pygame_surface_to_numpy(surf)
-        writer.append_data(frame)
-
-    writer.close()
+    # every nth board is produced, drawn and encoded by concurrent stages
+    # (see pipeline.py), so only a few boards and frames are held in memory
+    snapshots = iterate_gray_scott(
+        initial_board,
+        num_gens,
+        feed_rate,
+        kill_rate,
+        prey_diffusion_rate=0.2,
+        predator_diffusion_rate=0.1,
+        kernel=kernel,
+        every=n,
+    )
+    timings = encode_video(
+        snapshots,
+        partial(cells_to_frame, cell_width=cell_width),
+        video_path,
+        fps=10,
+        codec="libx264",
+        quality=8,
+    )
 
+    print("Simulation complete!")
+    print(timings.report())
     print(f"Video saved as {video_path}")
 
-    pygame.quit()
-
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""
+Parallel sweep over Gray–Scott feed and kill rates.
+
+Every (feed_rate, kill_rate) pair on a grid is simulated in its own worker
+process with the vectorized solver. Every check_every generations a run
+measures the board with total_concentration and stops early when
+
+    "died":      predators have (almost) vanished,
+    "saturated": predators have taken over the board, or
+    "steady":    neither total has changed noticeably since the last check.
+
+Runs that reach num_gens are "complete". Each finished run appends one row
+to a CSV results file and writes a small PNG of its final board. Rows are
+flushed as they arrive, so an interrupted sweep can be restarted with the
+same results file and only the missing pairs are run.
+
+Usage:
+    python sweep.py feed_min feed_max feed_steps kill_min kill_max kill_steps num_gens [results_file]
+Example:
+    python sweep.py 0.01 0.08 8 0.04 0.10 7 8000 output/sweep.csv
+"""
+
+import csv
+import multiprocessing
+import os
+import sys
+import numpy as np
+import imageio.v2 as imageio
+
+from datatypes import Board
+from functions import initialize_board, total_concentration
+from drawing import cells_to_frame
+from vectorized import GrayScottSolver
+
+RESULT_FIELDS = [
+    "feed_rate", "kill_rate", "status", "generations",
+    "total_prey", "total_predator", "predator_fraction", "thumbnail",
+]
+
+# the kernel and diffusion rates used by main.py
+KERNEL = np.array([
+    [0.05, 0.2, 0.05],
+    [0.2, -1.0, 0.2],
+    [0.05, 0.2, 0.05],
+])
+PREY_DIFFUSION_RATE = 0.2
+PREDATOR_DIFFUSION_RATE = 0.1
+
+# set in each worker by _init_worker so the board is sent once per process
+_initial_cells: np.ndarray | None = None
+_settings: dict = {}
+
+
+def main():
+    if len(sys.argv) not in (8, 9):
+        raise ValueError(
+            "Usage: python sweep.py feed_min feed_max feed_steps kill_min kill_max kill_steps num_gens [results_file]\n"
+            "Example: python sweep.py 0.01 0.08 8 0.04 0.10 7 8000 output/sweep.csv"
+        )
+
+    feed_rates = np.linspace(float(sys.argv[1]), float(sys.argv[2]), int(sys.argv[3]))
+    kill_rates = np.linspace(float(sys.argv[4]), float(sys.argv[5]), int(sys.argv[6]))
+    num_gens = int(sys.argv[7])
+    results_file = sys.argv[8] if len(sys.argv) == 9 else os.path.join("output", "sweep.csv")
+
+    initial_board = seeded_board(100, 100)
+    points = [(float(f), float(k)) for f in feed_rates for k in kill_rates]
+
+    print(f"Sweeping {len(points)} (feed, kill) pairs for up to {num_gens} generations...")
+    for row in sweep_gray_scott(initial_board, points, num_gens, results_file):
+        print(
+            f"f={row['feed_rate']} k={row['kill_rate']}: {row['status']} "
+            f"after {row['generations']} generations"
+        )
+    print(f"Results saved in {results_file}")
+
+
+def seeded_board(num_rows: int, num_cols: int, frac: float = 0.05) -> Board:
+    """
+    The starting board of main.py: prey = 1 everywhere and a central
+    square of predators covering frac of each side.
+    """
+    board = initialize_board(num_rows, num_cols)
+    pred_rows = int(frac * num_rows)
+    pred_cols = int(frac * num_cols)
+    mid_row, mid_col = num_rows // 2, num_cols // 2
+
+    for r in range(num_rows):
+        for c in range(num_cols):
+            predator = 0.0
+            if mid_row - pred_rows // 2 <= r < mid_row + pred_rows // 2 and \
+                    mid_col - pred_cols // 2 <= c < mid_col + pred_cols // 2:
+                predator = 1.0
+            board[r][c] = (1.0, predator)
+    return board
+
+
+def sweep_gray_scott(
+    initial_board: Board,
+    points: list[tuple[float, float]],
+    num_gens: int,
+    results_file: str,
+    num_procs: int | None = None,
+    check_every: int = 100,
+    died_fraction: float = 1e-3,
+    saturated_fraction: float = 0.9,
+    steady_tolerance: float = 1e-6,
+    thumbnail_size: int = 128
+):
+    """
+    Runs every (feed_rate, kill_rate) pair in points that is not already in
+    results_file, spread over num_procs worker processes (default: one per
+    CPU), and appends a row to results_file for each as it finishes.
+    Thumbnails go in a "thumbnails" directory next to results_file.
+
+    Parameters:
+        check_every: generations between early-termination checks
+        died_fraction: stop when total B / (total A + total B) falls below this
+        saturated_fraction: stop when that fraction rises above this
+        steady_tolerance: stop when both totals change by less than this
+            fraction of their size between checks
+        thumbnail_size: largest side of a thumbnail in pixels
+
+    Yields:
+        each new results row, as a dict keyed by RESULT_FIELDS
+    """
+    if not isinstance(num_gens, int) or num_gens < 0:
+        raise ValueError("num_gens must be a non-negative integer")
+    if not isinstance(check_every, int) or check_every <= 0:
+        raise ValueError("check_every must be a positive integer")
+    if num_procs is None:
+        num_procs = multiprocessing.cpu_count()
+    if not isinstance(num_procs, int) or num_procs <= 0:
+        raise ValueError("num_procs must be a positive integer")
+
+    done = completed_points(results_file)
+    todo = [p for p in points if _key(*p) not in done]
+    if not todo:
+        return
+
+    results_dir = os.path.dirname(results_file) or "."
+    thumbnail_dir = os.path.join(results_dir, "thumbnails")
+    os.makedirs(thumbnail_dir, exist_ok=True)
+
+    settings = {
+        "num_gens": num_gens,
+        "check_every": check_every,
+        "died_fraction": died_fraction,
+        "saturated_fraction": saturated_fraction,
+        "steady_tolerance": steady_tolerance,
+        "thumbnail_size": thumbnail_size,
+        "thumbnail_dir": thumbnail_dir,
+    }
+    cells = np.array(initial_board, dtype=np.float64)
+
+    new_file = not os.path.exists(results_file) or os.path.getsize(results_file) == 0
+    with open(results_file, "a", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+            file.flush()
+
+        with multiprocessing.Pool(min(num_procs, len(todo)), _init_worker, (cells, settings)) as pool:
+            for row in pool.imap_unordered(_run_point, todo):
+                writer.writerow(row)
+                # flush every row so an interrupted sweep can be resumed
+                file.flush()
+                yield row
+
+
+def completed_points(results_file: str) -> set[tuple[float, float]]:
+    """
+    The (feed_rate, kill_rate) pairs that already have a row in results_file.
+    """
+    done = set()
+    if not os.path.exists(results_file):
+        return done
+
+    with open(results_file, "r", newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            try:
+                done.add(_key(float(row["feed_rate"]), float(row["kill_rate"])))
+            except (KeyError, TypeError, ValueError):
+                continue  # skip a row cut short by an interruption
+    return done
+
+
+def run_point(
+    cells: np.ndarray,
+    feed_rate: float,
+    kill_rate: float,
+    num_gens: int,
+    check_every: int = 100,
+    died_fraction: float = 1e-3,
+    saturated_fraction: float = 0.9,
+    steady_tolerance: float = 1e-6
+) -> tuple[str, int, np.ndarray]:
+    """
+    Simulates one (feed_rate, kill_rate) pair from a (rows, cols, 2) board,
+    checking for early termination every check_every generations.
+
+    Return:
+        the status, the number of generations run and the final board
+    """
+    solver = GrayScottSolver(
+        cells[:, :, 0], cells[:, :, 1], feed_rate, kill_rate,
+        PREY_DIFFUSION_RATE, PREDATOR_DIFFUSION_RATE, KERNEL
+    )
+
+    previous = None
+    while solver.generation < num_gens:
+        solver.step(min(check_every, num_gens - solver.generation))
+
+        totals = total_concentration(solver.to_array().tolist())
+        fraction = _predator_fraction(totals)
+        if fraction < died_fraction:
+            return "died", solver.generation, solver.to_array()
+        if fraction > saturated_fraction:
+            return "saturated", solver.generation, solver.to_array()
+        if previous is not None and all(
+            abs(now - before) <= steady_tolerance * max(abs(before), 1.0)
+            for now, before in zip(totals, previous)
+        ):
+            return "steady", solver.generation, solver.to_array()
+        previous = totals
+
+    return "complete", solver.generation, solver.to_array()
+
+
+def _init_worker(cells: np.ndarray, settings: dict) -> None:
+    global _initial_cells, _settings
+    _initial_cells = cells
+    _settings = settings
+
+
+def _run_point(point: tuple[float, float]) -> dict:
+    """
+    Worker: runs one pair, saves its thumbnail and returns its results row.
+    """
+    feed_rate, kill_rate = point
+    status, generations, final = run_point(
+        _initial_cells, feed_rate, kill_rate, _settings["num_gens"],
+        _settings["check_every"], _settings["died_fraction"],
+        _settings["saturated_fraction"], _settings["steady_tolerance"]
+    )
+
+    # subsample large boards so the thumbnail stays small
+    step = max(1, -(-max(final.shape[:2]) // _settings["thumbnail_size"]))
+    thumbnail = os.path.join(_settings["thumbnail_dir"], f"f_{feed_rate}k_{kill_rate}.png")
+    imageio.imwrite(thumbnail, cells_to_frame(final[::step, ::step], 1))
+
+    total_prey, total_predator = total_concentration(final.tolist())
+    return {
+        "feed_rate": feed_rate,
+        "kill_rate": kill_rate,
+        "status": status,
+        "generations": generations,
+        "total_prey": total_prey,
+        "total_predator": total_predator,
+        "predator_fraction": _predator_fraction((total_prey, total_predator)),
+        "thumbnail": thumbnail,
+    }
+
+
+def _predator_fraction(totals: tuple[float, float]) -> float:
+    """
+    total B / (total A + total B), the metric of the old TUNE loop in main.py.
+    """
+    total_A, total_B = totals
+    if total_A + total_B == 0:
+        return 0.0
+    return total_B / (total_A + total_B)
+
+
+def _key(feed_rate: float, kill_rate: float) -> tuple[float, float]:
+    # rates read back from the CSV may differ from linspace in the last bits
+    return (round(feed_rate, 12), round(kill_rate, 12))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,7 @@
+import numpy as np
+from grid import Grid
+
+
 class Cell:
     """
     Represents a single site in the spatial Prisoner's Dilemma grid.
@@ -10,4 +14,36 @@ class Cell:
 
 # A GameBoard is simply a 2D grid (list of lists) of Cell objects.
 # Example: game_board[row][col]
-GameBoard = list
\ No newline at end of file
+GameBoard = list
+
+
+# Strategies in the array-backed Grid (see grid.py) are stored as uint8 codes,
+# so a board costs one byte per cell instead of one Cell object per cell.
+COOPERATE = 0
+DEFECT = 1
+STRATEGIES = ("C", "D")  # STRATEGIES[code] is the strategy letter
+
+
+def board_to_grid(board, halo=0):
+    """
+    Pack the strategies of a GameBoard of Cells into a uint8 Grid
+    (COOPERATE = 0, DEFECT = 1). Scores are not copied.
+    """
+    return Grid.from_lists(board, np.uint8, convert=lambda cell: STRATEGIES.index(cell.strategy), halo=halo)
+
+
+def grid_to_board(grid, scores=None):
+    """
+    Unpack a uint8 strategy Grid into a GameBoard of new Cells.
+    scores, if given, is a (rows, cols) array of each cell's score.
+    """
+    strategies = grid.data.tolist()
+    score_rows = scores.tolist() if scores is not None else None
+    board = []
+    for i in range(len(strategies)):
+        row = []
+        for j in range(len(strategies[i])):
+            score = score_rows[i][j] if score_rows is not None else 0.0
+            row.append(Cell(STRATEGIES[strategies[i][j]], score))
+        board.append(row)
+    return board
@@ -3,7 +3,7 @@ import pygame
 import imageio
 
 from custom_io import read_board_from_file
-from functions import evolve
+from vectorized import evolve_vectorized
 from drawing import draw_game_boards, save_video_from_surfaces
 
 USAGE = """Usage:
@@ -70,7 +70,7 @@ def main():
 
     print("Evolving board.")
     # Evolve
-    boards = evolve(board, steps, b)
+    boards = evolve_vectorized(board, steps, b)
 
     print("Rendering frames with pygame.")
     # Render frames with pygame as circles (radius = 0.8 * half cell width)
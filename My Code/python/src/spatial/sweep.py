@@ -0,0 +1,143 @@
+"""
+Batch sweep over the temptation payoff b.
+
+The initial board is read once and sent once to each worker process of a
+pool; every worker then evolves whole runs with the vectorized engine, one
+b value at a time, recording only the fraction of cooperators after each
+step. Each run is written to its own CSV table, b_<b>.csv with b to six
+significant digits, as soon as it finishes:
+
+    step,cooperation_fraction
+    0,0.9
+    1,0.87
+    ...
+
+Usage:
+    python sweep.py <filename> <b_min> <b_max> <b_count> <steps> [output_dir]
+Example:
+    python sweep.py data/rand200-10.txt 1.1 2.0 100 200 output/sweep
+"""
+
+import csv
+import multiprocessing
+import os
+import sys
+import numpy as np
+
+from custom_io import read_board_from_file
+from datatypes import GameBoard, board_to_grid
+from vectorized import SpatialEngine
+
+USAGE = """Usage:
+    python sweep.py <filename> <b_min> <b_max> <b_count> <steps> [output_dir]
+
+Example:
+    python sweep.py data/rand200-10.txt 1.1 2.0 100 200 output/sweep
+"""
+
+# set in each worker by _init_worker so the board is sent once per process
+_initial_strategies: np.ndarray | None = None
+
+
+def main():
+    if len(sys.argv) not in (6, 7):
+        print(USAGE)
+        sys.exit(1)
+
+    try:
+        filename = sys.argv[1]
+        b_values = np.linspace(float(sys.argv[2]), float(sys.argv[3]), int(sys.argv[4])).tolist()
+        steps = int(sys.argv[5])
+        if steps < 0:
+            raise ValueError
+    except ValueError:
+        print("Error: <b_min> and <b_max> must be numbers, <b_count> and <steps> non-negative integers.")
+        print(USAGE)
+        sys.exit(1)
+    output_dir = sys.argv[6] if len(sys.argv) == 7 else os.path.join("output", "sweep")
+
+    print("Reading board from file.")
+    board = read_board_from_file(filename)
+
+    print(f"Evolving board for {len(b_values)} values of b.")
+    os.makedirs(output_dir, exist_ok=True)
+    for b, fractions in sweep_b(board, b_values, steps):
+        path = os.path.join(output_dir, f"b_{b:.6g}.csv")
+        write_cooperation_table(fractions, path)
+        print(f"b={b:.6g}: {fractions[-1]:.3f} cooperating after {steps} steps")
+
+    print(f"Done! Wrote tables to {output_dir}.")
+
+
+def sweep_b(
+    initial_board: GameBoard,
+    b_values: list[float],
+    steps: int,
+    num_procs: int | None = None
+):
+    """
+    Evolve initial_board once for every b in b_values, spread over num_procs
+    worker processes (default: one per CPU).
+
+    Yields:
+        (b, fractions) for each run as it finishes, where fractions[t] is
+        the fraction of cooperators after step t (t = 0 .. steps).
+    """
+    if not isinstance(steps, int) or steps < 0:
+        raise ValueError("steps must be a non-negative integer")
+    if num_procs is None:
+        num_procs = multiprocessing.cpu_count()
+    if not isinstance(num_procs, int) or num_procs <= 0:
+        raise ValueError("num_procs must be a positive integer")
+    if len(b_values) == 0:
+        return
+
+    strategies = board_to_grid(initial_board).data
+    tasks = [(b, steps) for b in b_values]
+    with multiprocessing.Pool(min(num_procs, len(tasks)), _init_worker, (strategies,)) as pool:
+        for result in pool.imap_unordered(_run_b, tasks):
+            yield result
+
+
+def cooperation_over_time(strategies: np.ndarray, b: float, steps: int) -> list[float]:
+    """
+    Evolve a uint8 strategy array for the given number of steps.
+    Returns the fraction of cooperators after each step, starting with step 0.
+    """
+    engine = SpatialEngine(strategies, b)
+    fractions = [engine.cooperation_fraction()]
+    for _ in range(steps):
+        engine.step()
+        fractions.append(engine.cooperation_fraction())
+    return fractions
+
+
+def write_cooperation_table(fractions: list[float], filename: str) -> None:
+    """
+    Write one run's cooperation fractions as a step,cooperation_fraction CSV.
+    """
+    if not isinstance(filename, str) or len(filename) == 0:
+        raise ValueError("filename must be a non-empty string.")
+
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["step", "cooperation_fraction"])
+        for step, fraction in enumerate(fractions):
+            writer.writerow([step, fraction])
+
+
+def _init_worker(strategies: np.ndarray) -> None:
+    global _initial_strategies
+    _initial_strategies = strategies
+
+
+def _run_b(task: tuple[float, int]) -> tuple[float, list[float]]:
+    """
+    Worker: one run of the sweep.
+    """
+    b, steps = task
+    return b, cooperation_over_time(_initial_strategies, b, steps)
+
+
+if __name__ == "__main__":
+    main()
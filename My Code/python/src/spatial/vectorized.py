@@ -0,0 +1,190 @@
+"""
+Vectorized NumPy engine for the spatial Prisoner's Dilemma.
+
+Strategies are held as a uint8 Grid (COOPERATE = 0, DEFECT = 1, see
+datatypes.py) with a one-cell toroidal halo, and scores as a float64 Grid
+with the same halo. Each step:
+
+  1. every cell's score is looked up from its number of cooperating
+     neighbours, counted as a sum of eight shifted slices,
+  2. the best neighbour score of every cell is the maximum of the eight
+     shifted score slices, and whether a defector reaches it is the OR of
+     the eight shifted (score == best) & defector slices, and
+  3. a cell keeps its strategy if its own score is at least the best
+     neighbour score, and otherwise adopts the best neighbour's strategy,
+     preferring 'D' on ties as update_strategies does.
+
+A defector's payoff is b added once per cooperating neighbour, in the same
+order as update_scores, so the scores (and therefore every tie) match
+functions.evolve exactly.
+"""
+
+from typing import Iterator
+import numpy as np
+from datatypes import COOPERATE, DEFECT, GameBoard, board_to_grid, grid_to_board
+from functions import assert_rectangular, copy_board
+from grid import Grid
+
+# (row, col) offsets of the eight Moore neighbours, in neighbor_coords order
+_NEIGHBOR_OFFSETS = [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di != 0 or dj != 0]
+
+
+class SpatialEngine:
+    """
+    Double-buffered spatial Prisoner's Dilemma state.
+
+    Attributes:
+        b: The temptation payoff for defecting against a cooperator.
+        generation: Number of steps taken so far.
+    """
+
+    def __init__(self, strategies: np.ndarray, b: float):
+        if strategies.ndim != 2 or strategies.shape[0] == 0 or strategies.shape[1] == 0:
+            raise ValueError("strategies must be a non-empty 2D array.")
+
+        self.b = b
+        self.generation = 0
+        self.grid = Grid.from_array(strategies != COOPERATE, np.uint8, halo=1)
+        self.scores = Grid(self.grid.num_rows, self.grid.num_cols, np.float64, halo=1)
+
+        # payoff of a cell with k cooperating neighbours, for k = 0 .. 8
+        self._cooperator_payoff = np.arange(9, dtype=np.float64)
+        self._defector_payoff = np.zeros(9)
+        for k in range(1, 9):
+            self._defector_payoff[k] = self._defector_payoff[k - 1] + b
+
+        shape = strategies.shape
+        self._counts = np.zeros(shape, dtype=np.uint8)
+        self._best = np.empty(shape)
+        self._tied = np.empty(shape, dtype=bool)
+        self._defects = np.empty(shape, dtype=bool)
+
+    @classmethod
+    def from_board(cls, board: GameBoard, b: float) -> "SpatialEngine":
+        """
+        Build an engine from a GameBoard of Cells.
+        """
+        return cls(board_to_grid(board).data, b)
+
+    @property
+    def strategies(self) -> np.ndarray:
+        """
+        View (not a copy) of the current strategies, without the halo.
+        """
+        return self.grid.data
+
+    def cooperation_fraction(self) -> float:
+        """
+        Fraction of cells currently cooperating.
+        """
+        return 1.0 - float(self.strategies.mean())
+
+    def step(self, steps: int = 1) -> None:
+        """
+        Advance the board by the given number of synchronous updates.
+        """
+        for _ in range(steps):
+            self._step()
+
+    def _step(self) -> None:
+        self._update_scores()
+        self._update_strategies()
+        self.grid.swap()
+        self.generation += 1
+
+    def _update_scores(self) -> None:
+        """
+        Score of every cell against its eight neighbours, in the scores Grid.
+        """
+        self.grid.fill_halo("wrap")
+        counts = self._counts
+        counts[...] = 0
+        for nbr in self._shifted(self.grid.padded):
+            counts += nbr
+        # counts holds defecting neighbours; the payoff comes from cooperators
+        np.subtract(8, counts, out=counts)
+
+        np.take(self._cooperator_payoff, counts, out=self.scores.data)
+        defectors = self.strategies == DEFECT
+        self.scores.data[defectors] = self._defector_payoff[counts[defectors]]
+
+    def _update_strategies(self) -> None:
+        """
+        Write the next strategies into the strategy Grid's back buffer.
+        """
+        self.scores.fill_halo("wrap")
+        score_nbrs = self._shifted(self.scores.padded)
+        strategy_nbrs = self._shifted(self.grid.padded)
+
+        best = self._best
+        best[...] = -np.inf
+        for nbr in score_nbrs:
+            np.maximum(best, nbr, out=best)
+
+        # does any neighbour with the best score defect?
+        defects, tied = self._defects, self._tied
+        defects[...] = False
+        for score, strategy in zip(score_nbrs, strategy_nbrs):
+            np.equal(score, best, out=tied)
+            tied &= strategy.view(bool)
+            defects |= tied
+
+        new = self.grid.back
+        np.copyto(new, defects)
+        keep = self.scores.data >= best
+        new[keep] = self.strategies[keep]
+
+    def _shifted(self, padded: np.ndarray) -> list[np.ndarray]:
+        """
+        The eight neighbour views of a padded buffer, in neighbor_coords order.
+        """
+        num_rows, num_cols = self._counts.shape
+        return [
+            padded[1 + di:1 + di + num_rows, 1 + dj:1 + dj + num_cols]
+            for di, dj in _NEIGHBOR_OFFSETS
+        ]
+
+
+def iterate_spatial(
+    initial_board: GameBoard,
+    steps: int,
+    b: float,
+    every: int = 1
+) -> Iterator[np.ndarray]:
+    """
+    Lazily evolve a board, yielding the strategies of steps 0, every, 2 * every, ...
+    as uint8 copies (COOPERATE = 0, DEFECT = 1).
+    """
+    if not isinstance(steps, int) or steps < 0:
+        raise ValueError("steps must be a non-negative integer")
+    if not isinstance(every, int) or every <= 0:
+        raise ValueError("every must be a positive integer")
+
+    assert_rectangular(initial_board)
+    engine = SpatialEngine.from_board(initial_board, b)
+    yield engine.strategies.copy()
+
+    for t in range(1, steps + 1):
+        engine.step()
+        if t % every == 0:
+            yield engine.strategies.copy()
+
+
+def evolve_vectorized(
+    initial_board: GameBoard,
+    steps: int,
+    b: float,
+    every: int = 1
+) -> list[GameBoard]:
+    """
+    Drop-in replacement for functions.evolve that keeps only boards
+    0, every, 2 * every, ... (every = 1 returns [B0, B1, ..., B_steps]).
+    As in evolve, scores are 0.0 on every board after the first.
+    """
+    boards = []
+    for i, strategies in enumerate(iterate_spatial(initial_board, steps, b, every)):
+        if i == 0:
+            boards.append(copy_board(initial_board))
+        else:
+            boards.append(grid_to_board(Grid.from_array(strategies)))
+    return boards
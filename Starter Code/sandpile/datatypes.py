@@ -5,6 +5,38 @@ Board : list[list[int]]
     A 2-D grid of integers representing sand heights at each cell. Each inner
     list represents a row of the board, and each integer gives the number of
     grains in that cell.
+Grid (from grid.py)
+    The array-backed form of a Board: one int32 NumPy array of heights,
+    with a back buffer for double-buffered updates. board_to_grid and
+    grid_to_board convert between the two.
 """
 
-Board = list[list[int]]  
\ No newline at end of file
+import numpy as np
+from grid import Grid
+
+Board = list[list[int]]
+
+
+def board_to_grid(b: Board, halo: int = 0) -> Grid:
+    """Pack a Board into an int32 Grid.
+
+    Args:
+        b: Board to pack.
+        halo: Width of the Grid's halo.
+
+    Returns:
+        A Grid holding a copy of the heights.
+    """
+    return Grid.from_lists(b, np.int32, halo=halo)
+
+
+def grid_to_board(grid: Grid) -> Board:
+    """Unpack the current heights of a Grid into a Board.
+
+    Args:
+        grid: Grid to unpack.
+
+    Returns:
+        A new Board.
+    """
+    return grid.to_lists()
@@ -1,9 +1,9 @@
-import os
-from multiprocessing import Process, Queue
+from functools import partial
 import math
 import numpy as np
 import pygame
 from datatypes import Board
+from frame_pool import render_frames, stream_frames
 
 
 def animate_boards(time_points: list[Board], cell_width: int) -> list[np.ndarray]:
@@ -31,72 +31,41 @@ def animate_boards(time_points: list[Board], cell_width: int) -> list[np.ndarray
     return images
 
 
-def process_images_section(timepoints: list[Board], cell_width: int, start_offset: int, out_q: Queue) -> None:
-    """Process a contiguous slice of boards and emit frames into a multiprocessing Queue.
+def animate_boards_parallel(time_points: list[Board], cell_width: int) -> list[np.ndarray]:
+    """Parallelize rendering of boards using multiprocessing and return frames in order.
+
+    Workers draw straight into shared-memory frame slots (see frame_pool.py),
+    so frames are not pickled back through a Queue.
 
     Args:
-        timepoints: The slice of boards to render in this worker.
+        time_points: Sequence of boards to render.
         cell_width: The width/height in pixels of each cell.
-        start_offset: Global index offset used to place frames back in order.
-        out_q: Multiprocessing Queue to which (global_index, frame) tuples are sent.
+
+    Returns:
+        List of frames as uint8 numpy arrays of shape (H, W, 3), ordered by original index.
     """
-    for i, board in enumerate(timepoints):
-        frame = draw_to_image(board, cell_width)  # np.ndarray (H, W, 3), uint8
-        out_q.put((start_offset + i, frame))
+    if len(time_points) == 0:
+        raise ValueError("Error: no Board objects present in input to animate_boards_parallel.")
 
+    return render_frames(time_points, partial(draw_to_image, cell_width=cell_width))
 
-def animate_boards_parallel(time_points: list[Board], cell_width: int) -> list[np.ndarray]:
-    """Parallelize rendering of boards using multiprocessing and return frames in order.
+
+def stream_boards_parallel(time_points: list[Board], cell_width: int, num_procs: int | None = None):
+    """Render boards across processes, yielding frames in order as they finish.
 
     Args:
         time_points: Sequence of boards to render.
         cell_width: The width/height in pixels of each cell.
+        num_procs: Number of worker processes (default: one per CPU).
 
-    Returns:
-        List of frames as uint8 numpy arrays of shape (H, W, 3), ordered by original index.
+    Yields:
+        Frames as uint8 numpy arrays of shape (H, W, 3). Each is only valid
+        until the next one is requested, e.g. long enough for writer.append_data.
     """
     if len(time_points) == 0:
-        raise ValueError("Error: no Board objects present in input to animate_boards_parallel.")
-    
-    num_procs = os.cpu_count()
-    n = len(time_points)
+        raise ValueError("Error: no Board objects present in input to stream_boards_parallel.")
 
-    images_per_proc = n // num_procs
-    ranges = []
-    start = 0
-    
-    for i in range(num_procs):
-        start = i * images_per_proc
-        end = start + images_per_proc
-        if i == num_procs - 1:
-            end = n  # last takes remaining images
-        
-        ranges.append((start, end))
-
-    out_q = Queue()
-    procs: list[Process] = []
-    for start, end in ranges:
-        board_slice = time_points[start:end]
-        if not board_slice: # just in case
-            continue
-        p = Process(
-            target=process_images_section,
-            args=(board_slice, cell_width, start, out_q),
-        )
-        p.start()
-        procs.append(p)       
-
-    # Collect exactly n frames
-    images_np: list[np.ndarray] = [None] * n
-    for _ in range(n):
-        idx, frame = out_q.get()     # frame is already a new array in the parent
-        images_np[idx] = frame       # no .copy() needed unless you want to duplicate it
-
-    # # Ensure all workers finished (technically don't need this because the loop above waits til n frames are collected, so all processes should be finished when we get here)
-    for p in procs:
-        p.join()
-
-    return images_np
+    yield from stream_frames(time_points, partial(draw_to_image, cell_width=cell_width), num_procs)
 
 
 def draw_to_image(b: Board, cell_width: int) -> np.ndarray:
@@ -5,9 +5,10 @@ import time
 import imageio
 import pygame
 
-from serial import create_board, simulate_sandpiles
+from serial import create_board
 from parallel import simulate_sandpiles_parallel
-from drawing import animate_boards, animate_boards_parallel
+from toppling import stabilize_board
+from drawing import draw_to_image
 
 
 def main() -> None:
@@ -16,6 +17,36 @@ def main() -> None:
         try python3 main.py 50 4000 central 10 
         try python3 main.py 300 20000 central 4 # comment serial out
     """
+    if len(sys.argv) != 5:
+        raise ValueError("Usage: python3 main.py <board_width> <num_coins> <random|central> <cell_width>")
+
+    size = int(sys.argv[1])
+    pile = int(sys.argv[2])
+    placement = sys.argv[3]
+    cell_width = int(sys.argv[4])
+    if placement not in ("random", "central"):
+        raise ValueError("Error: placement must be 'random' or 'central'.")
+
+    board = create_board(size, size, pile, center=(placement == "central"), num_piles=100)
+
+    start = time.time()
+    serial_board = stabilize_board(board, mode="multiscale")
+    print(f"Serial (multiscale) toppling took {time.time() - start:.2f}s")
+
+    start = time.time()
+    parallel_board = simulate_sandpiles_parallel(board, every=sys.maxsize)[-1]
+    print(f"Parallel toppling took {time.time() - start:.2f}s")
+
+    if serial_board != parallel_board:
+        raise RuntimeError("Error: serial and parallel boards differ.")
+
+    pygame.init()
+    os.makedirs("output", exist_ok=True)
+    out_path = os.path.join("output", f"sandpile_{size}_{pile}_{placement}.png")
+    imageio.imwrite(out_path, draw_to_image(serial_board, cell_width))
+    pygame.quit()
+
+    print(f"Done! Wrote final board to {out_path}.")
 
 
 if __name__ == "__main__":
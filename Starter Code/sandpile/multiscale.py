@@ -0,0 +1,176 @@
+"""Coarse-grid starting guesses for the sandpile odometer.
+
+The odometer u of a board counts how many times each cell topples on the
+way to the stable board. By the abelian property it does not depend on the
+order of the topples, and the stable board is h0 + lap(u), where lap is the
+discrete Laplacian (the four neighbours minus four times the cell). A pile
+of N grains has an odometer of roughly N / (2 pi) * log(R / r) at distance r
+from the pile, so almost all of the work of toppling it goes into cells that
+topple hundreds of thousands of times.
+
+The same pile on a board with half the rows and columns, holding a quarter
+of the grains, has nearly the same odometer shape at a quarter of the size:
+u(2x) is about 4 * u_coarse(x). The helpers here move between such a pair
+of boards:
+
+  restrict          the coarse board: full weighting of 2 x 2 blocks, with
+                    a quarter of the grains,
+  prolong           4 times the bilinear interpolation of a coarse array
+                    back onto the fine board, in integers,
+  point_correction  the part of the odometer that interpolation gets wrong
+                    next to a tall pile, where u has a log singularity; it
+                    is built from the potential kernel of the square
+                    lattice, so it is exact up to the smooth part of u.
+
+Coarse nodes sit on every other fine cell, aligned with the tallest cell,
+so a centre pile lands exactly on a node. Only nodes on the board are used,
+so the coarse sink is where the fine sink is.
+"""
+
+from functools import lru_cache
+import numpy as np
+
+# Cells with at least this many grains get a point-source correction
+SOURCE_MIN = 256
+
+# Radius, in fine cells, of the window the point-source correction covers
+KERNEL_RADIUS = 128
+
+
+def restrict(heights: np.ndarray) -> tuple[np.ndarray, tuple[int, int]]:
+    """The coarse board: weights (1, 2, 1) x (1, 2, 1) / 16 around every
+    other cell, rounded down, so a pile of N grains on a node becomes N // 4.
+
+    Args:
+        heights: (rows, cols) integer array.
+
+    Returns:
+        The coarse heights and the (row, col) offsets of the first coarse
+        node on the fine board (the parities of the tallest cell).
+    """
+    row, col = np.unravel_index(np.argmax(heights), heights.shape)
+    offsets = (int(row) % 2, int(col) % 2)
+    weighted = np.asarray(heights, dtype=np.int64)
+    for axis, offset in enumerate(offsets):
+        weighted = _restrict_axis(weighted, offset, axis)
+    return weighted // 16, offsets
+
+
+def prolong(coarse: np.ndarray, shape: tuple[int, int], offsets: tuple[int, int]) -> np.ndarray:
+    """4 times the bilinear interpolation of coarse onto a board of the given
+    shape: 4u on a node, 2(u_a + u_b) between two nodes and the sum of the
+    four nodes around a cell centre. Integer input gives exact integers.
+
+    Args:
+        coarse: Array on the coarse nodes, as returned by restrict.
+        shape: Shape of the fine board.
+        offsets: Offsets returned by restrict.
+    """
+    fine = coarse
+    for axis, (n, offset) in enumerate(zip(shape, offsets)):
+        fine = _prolong_axis(fine, n, offset, axis)
+    return fine
+
+
+def point_correction(heights: np.ndarray, offsets: tuple[int, int]) -> np.ndarray:
+    """What to add to prolong(u_coarse) near tall cells.
+
+    A cell holding m grains adds about -m / 4 * a(x) to the odometer, where
+    a is the potential kernel of the square lattice (the response to a
+    single grain). Interpolating that from the coarse board is badly off
+    in the few dozen cells around the pile. This returns, summed over the
+    cells with at least SOURCE_MIN grains, m times the difference between
+    the fine response and the interpolated coarse one, within KERNEL_RADIUS.
+
+    Args:
+        heights: (rows, cols) fine heights.
+        offsets: Offsets returned by restrict(heights).
+
+    Returns:
+        A float (rows, cols) array.
+    """
+    rows, cols = heights.shape
+    w = KERNEL_RADIUS
+    correction = np.zeros((rows + 2 * w, cols + 2 * w))
+    for r, c in zip(*np.nonzero(heights >= SOURCE_MIN)):
+        kernel = _point_kernel((r - offsets[0]) % 2, (c - offsets[1]) % 2)
+        correction[r:r + 2 * w + 1, c:c + 2 * w + 1] += heights[r, c] * kernel
+    return correction[w:w + rows, w:w + cols]
+
+
+def _restrict_axis(a: np.ndarray, offset: int, axis: int) -> np.ndarray:
+    """Weights (1, 2, 1) around positions offset, offset + 2, ... along axis."""
+    a = np.moveaxis(a, axis, 0)
+    m = (a.shape[0] - 1 - offset) // 2 + 1
+    padded = np.zeros((a.shape[0] + 2,) + a.shape[1:], dtype=a.dtype)
+    padded[1:-1] = a
+    out = 2 * padded[offset + 1:offset + 2 * m:2]
+    out += padded[offset:offset + 2 * m - 1:2]
+    out += padded[offset + 2:offset + 2 * m + 1:2]
+    return np.moveaxis(out, 0, axis)
+
+
+def _prolong_axis(a: np.ndarray, n: int, offset: int, axis: int) -> np.ndarray:
+    """2 times the linear interpolation of a (on positions offset, offset + 2,
+    ...) onto n positions along axis; nodes off the board count as 0.
+    """
+    a = np.moveaxis(a, axis, 0)
+    m = a.shape[0]
+    padded = np.zeros((m + 2,) + a.shape[1:], dtype=a.dtype)
+    padded[1:-1] = a
+    out = np.zeros((n,) + a.shape[1:], dtype=a.dtype)
+    out[offset::2] = 2 * a
+    # the j-th position between nodes lies between nodes j - offset and j - offset + 1
+    between = out[1 - offset::2]
+    between[...] = padded[1 - offset:1 - offset + len(between)]
+    between += padded[2 - offset:2 - offset + len(between)]
+    return np.moveaxis(out, 0, axis)
+
+
+@lru_cache(maxsize=None)
+def _potential_kernel(radius: int) -> np.ndarray:
+    """a(m, k) for 0 <= m, k <= radius: the potential kernel of the square
+    lattice, normalised so a(0, 0) = 0, a(1, 0) = 1 and lap(a) = 4 at 0.
+
+    Uses a(m, k) = 1/pi * integral over 0..pi of (1 - t^m cos(k s)) / sinh(g) ds,
+    with cosh(g) = 2 - cos(s) and t = exp(-g), by the midpoint rule.
+    """
+    steps = 20000
+    s = (np.arange(steps) + 0.5) * np.pi / steps
+    cosh = 2 - np.cos(s)
+    sinh = np.sqrt(cosh * cosh - 1)
+    weights = 2 / steps / sinh
+    index = np.arange(radius + 1)
+    powers = (cosh - sinh)[None, :] ** index[:, None]
+    cosines = np.cos(np.outer(index, s))
+    return weights.sum() - (powers * weights) @ cosines.T
+
+
+@lru_cache(maxsize=None)
+def _point_kernel(row_parity: int, col_parity: int) -> np.ndarray:
+    """Correction per grain for a cell at the given parities from the coarse
+    nodes, on a (2 * KERNEL_RADIUS + 1) square window centred on the cell.
+    """
+    w = KERNEL_RADIUS
+    pad = w + 2  # one extra coarse node on each side, cropped below
+    a = _potential_kernel(pad + 1)
+    x = np.arange(-pad, pad + 1)
+
+    # restrict puts the grain on its node, or halves it between two nodes
+    # along each axis where the cell is between nodes
+    rows = x[(x - row_parity) % 2 == 0]
+    cols = x[(x - col_parity) % 2 == 0]
+    row_split = [(0, 1.0)] if row_parity == 0 else [(-1, 0.5), (1, 0.5)]
+    col_split = [(0, 1.0)] if col_parity == 0 else [(-1, 0.5), (1, 0.5)]
+    coarse = np.zeros((rows.size, cols.size))
+    for dr, wr in row_split:
+        for dc, wc in col_split:
+            coarse += wr * wc * a[np.abs(rows - dr)[:, None] // 2, np.abs(cols - dc)[None, :] // 2]
+
+    # the window starts at -pad, which has the parity of pad
+    interpolated = prolong(coarse, (x.size, x.size), ((row_parity + pad) % 2, (col_parity + pad) % 2)) / 4
+    fine = a[np.abs(x)[:, None], np.abs(x)[None, :]]
+    # far from the cell the two differ by 2 / pi * log(2), the change in
+    # a(x) when distances double
+    kernel = (interpolated - fine + 2 / np.pi * np.log(2)) / 4
+    return kernel[2:-2, 2:-2]
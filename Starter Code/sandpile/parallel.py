@@ -1,5 +1,32 @@
-from datatypes import Board
+"""Parallel sandpile simulation.
+
+update_multi_procs and is_converged_multi_procs split one sweep of
+serial.update across processes that send their rows back through a Queue.
+They are the reference for how the board divides into row chunks, but start
+new processes every sweep.
+
+simulate_sandpiles_parallel instead keeps one worker process per row chunk
+for the whole run. The board lives in one multiprocessing.shared_memory
+block holding two padded (rows + 2, cols + 2) int32 buffers. Every sweep
+each worker reads its chunk plus the row above and below it from the
+current buffer, topples every unstable cell floor(h / 4) times, and writes
+its chunk of the next board into the other buffer. The grains flowing
+across a chunk boundary are computed from those halo rows, so the only data
+shared between chunks is read in place. Like bulk mode in toppling.py, a
+worker keeps the bounding box of its unstable cells and only writes the
+rectangle around it that can change; a stable chunk with no grains flowing
+in is skipped. Each worker then records whether its chunk is still
+unstable, all processes meet at a barrier, and the run stops when no chunk
+is unstable. As in toppling.py the stable board is the
+same as serial.simulate_sandpiles'.
+"""
+
 import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+from threading import BrokenBarrierError
+from typing import Iterator
+import numpy as np
+from datatypes import Board, board_to_grid
 from serial import (
     number_of_coins_in,
     number_of_coins_out,
@@ -8,28 +35,348 @@ from serial import (
 )
 from helper_functions import num_rows, num_cols
 
+
 def simulate_sandpiles_parallel(current_board: Board,
-                                num_procs: int | None = None) -> list[Board]:
-    #TODO: implement
-    pass
+                                num_procs: int | None = None,
+                                every: int = 1) -> list[Board]:
+    """Topple the board across worker processes until it is stable.
+
+    Args:
+        current_board: Starting board.
+        num_procs: Number of worker processes (default: one per CPU); never
+            more than the number of rows.
+        every: Keep only the boards after every this many sweeps.
+
+    Returns:
+        The boards after sweeps 0, every, 2 * every, ..., ending with the
+        stable board.
+    """
+    boards = [deep_copy_board(current_board)]
+    frames = iterate_sandpile_parallel(current_board, num_procs, every)
+    for i, heights in enumerate(frames):
+        if i > 0:
+            boards.append(heights.tolist())
+    return boards
+
+
+def iterate_sandpile_parallel(current_board: Board,
+                              num_procs: int | None = None,
+                              every: int = 1) -> Iterator[np.ndarray]:
+    """Lazily topple the board across worker processes, yielding its heights
+    after sweeps 0, every, 2 * every, ... and always the final stable board.
+
+    Args:
+        current_board: Starting board.
+        num_procs: Number of worker processes (default: one per CPU).
+        every: Yield only every this many sweeps.
+
+    Yields:
+        int32 copies of the heights.
+    """
+    if not isinstance(every, int) or every <= 0:
+        raise ValueError("every must be a positive integer.")
+    if num_procs is None:
+        num_procs = multiprocessing.cpu_count()
+    if not isinstance(num_procs, int) or num_procs <= 0:
+        raise ValueError("num_procs must be a positive integer.")
+
+    heights = board_to_grid(current_board).data
+    rows, cols = heights.shape
+    yield heights.copy()
+    if heights.max() < 4:
+        return
+
+    chunks = make_row_chunks(rows, num_procs)
+    shape = (2, rows + 2, cols + 2)
+
+    # Start the shared-memory tracker before forking so workers share it;
+    # otherwise each worker's own tracker unlinks the block when it exits.
+    resource_tracker.ensure_running()
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+    buffers = np.ndarray(shape, dtype=np.int32, buffer=shm.buf)
+    buffers[...] = 0
+    buffers[0, 1:-1, 1:-1] = heights
+
+    # unstable[s % 2, k] is set if chunk k is unstable after sweep s
+    unstable = multiprocessing.Array("b", 2 * len(chunks), lock=False)
+    barrier = multiprocessing.Barrier(len(chunks) + 1)
+    workers = [
+        multiprocessing.Process(
+            target=_run_chunk,
+            args=(shm.name, shape, k, row_start, row_end, unstable, barrier),
+            daemon=True,
+        )
+        for k, (row_start, row_end) in enumerate(chunks)
+    ]
+    try:
+        for w in workers:
+            w.start()
+        sweep = 0
+        converged = False
+        while not converged:
+            # after this barrier sweep `sweep` is complete in buffers[(sweep + 1) % 2];
+            # workers do not overwrite it until the next barrier
+            barrier.wait()
+            sweep += 1
+            converged = not _any_unstable(unstable, sweep, len(chunks))
+            if sweep % every == 0 or converged:
+                yield buffers[sweep % 2, 1:-1, 1:-1].copy()
+        for w in workers:
+            w.join()
+    finally:
+        barrier.abort()
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+            if w.pid is not None:
+                w.join()
+        del buffers
+        shm.close()
+        shm.unlink()
+
+
+def _run_chunk(shm_name: str,
+               shape: tuple[int, int, int],
+               k: int,
+               row_start: int,
+               row_end: int,
+               unstable,
+               barrier) -> None:
+    """Worker: topple rows row_start .. row_end - 1 until the board is stable.
+
+    Each sweep only touches the part of the chunk that can change or still
+    differs between the two buffers (see _sweep_rect); a chunk with no such
+    part is skipped and only meets the others at the barrier.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    buffers = np.ndarray(shape, dtype=np.int32, buffer=shm.buf)
+    num_chunks = len(unstable) // 2
+    chunk = (row_start, row_end, 0, shape[2] - 2)
+    try:
+        box = _unstable_box(buffers[0], *chunk)
+        stale = chunk  # buffers[1] starts out all zero
+        sweep = 0
+        while True:
+            src = buffers[sweep % 2]
+            dst = buffers[(sweep + 1) % 2]
+            rect, changing = _sweep_rect(src, chunk, box, stale)
+            if rect is not None:
+                _topple_rows(src, dst, *rect)
+                box = _unstable_box(dst, *rect)
+            stale = changing
+            sweep += 1
+            unstable[(sweep % 2) * num_chunks + k] = int(box is not None)
+            barrier.wait()
+            if not _any_unstable(unstable, sweep, num_chunks):
+                break
+    except BrokenBarrierError:
+        pass  # the parent stopped early
+    finally:
+        del buffers
+        shm.close()
+
+
+def _sweep_rect(src: np.ndarray,
+                chunk: tuple[int, int, int, int],
+                box: tuple[int, int, int, int] | None,
+                stale: tuple[int, int, int, int] | None):
+    """The part of a chunk one sweep has to write, in board coordinates.
+
+    Cells change only next to the chunk's unstable cells (box grown by one)
+    and in its first and last rows below and above unstable halo cells.
+    Outside those the next board equals src, so dst only needs writing where
+    it still differs from src: stale, the cells the last sweep changed.
+
+    Returns:
+        The (row_start, row_end, col_start, col_end) rectangle to write, or
+        None to skip the chunk, and the rectangle this sweep can change,
+        which is the next sweep's stale.
+    """
+    row_start, row_end, col_start, col_end = chunk
+    changing = _union(
+        _grow(box, chunk),
+        _inflow_box(src, row_start - 1, row_start, chunk),
+        _inflow_box(src, row_end, row_end - 1, chunk),
+    )
+    return _union(changing, stale), changing
+
+
+def _unstable_box(buffer: np.ndarray, row_start: int, row_end: int, col_start: int, col_end: int):
+    """Bounding box of the cells with 4 or more grains in the given rows and
+    columns of a padded buffer (board coordinates), or None if there are none.
+    """
+    unstable = buffer[row_start + 1:row_end + 1, col_start + 1:col_end + 1] >= 4
+    rows = np.flatnonzero(unstable.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(unstable.any(axis=0))
+    return (row_start + int(rows[0]), row_start + int(rows[-1]) + 1,
+            col_start + int(cols[0]), col_start + int(cols[-1]) + 1)
+
+
+def _inflow_box(src: np.ndarray, halo_row: int, row: int, chunk: tuple[int, int, int, int]):
+    """The cells of row that gain grains from unstable cells in the
+    neighbouring chunk's halo_row, or None. Rows off the board are the
+    buffer's halo and hold 0.
+    """
+    cols = np.flatnonzero(src[halo_row + 1, chunk[2] + 1:chunk[3] + 1] >= 4)
+    if cols.size == 0:
+        return None
+    return (row, row + 1, chunk[2] + int(cols[0]), chunk[2] + int(cols[-1]) + 1)
+
+
+def _grow(box, chunk: tuple[int, int, int, int]):
+    """box grown by one cell on each side, clipped to the chunk."""
+    if box is None:
+        return None
+    return (max(box[0] - 1, chunk[0]), min(box[1] + 1, chunk[1]),
+            max(box[2] - 1, chunk[2]), min(box[3] + 1, chunk[3]))
+
+
+def _union(*boxes):
+    """Bounding box of the given boxes, ignoring None; None if all are None."""
+    boxes = [b for b in boxes if b is not None]
+    if not boxes:
+        return None
+    return (min(b[0] for b in boxes), max(b[1] for b in boxes),
+            min(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def _topple_rows(src: np.ndarray,
+                 dst: np.ndarray,
+                 row_start: int,
+                 row_end: int,
+                 col_start: int = 0,
+                 col_end: int | None = None) -> None:
+    """Write rows row_start .. row_end - 1, columns col_start .. col_end - 1
+    (default: all) of the next board into dst.
+
+    src and dst are padded buffers whose halo is always 0, so grains that
+    fall off the board are dropped.
+    """
+    if col_end is None:
+        col_end = src.shape[1] - 2
+    # padded rows row_start .. row_end + 1 are the rows plus their halo rows,
+    # and likewise for the columns
+    q = src[row_start:row_end + 2, col_start:col_end + 2] // 4
+    h = src[row_start + 1:row_end + 1, col_start + 1:col_end + 1]
+    out = dst[row_start + 1:row_end + 1, col_start + 1:col_end + 1]
+    np.multiply(q[1:-1, 1:-1], -4, out=out)
+    out += h
+    out += q[:-2, 1:-1]   # from the row above (the upper chunk's flux)
+    out += q[2:, 1:-1]    # from the row below (the lower chunk's flux)
+    out += q[1:-1, :-2]
+    out += q[1:-1, 2:]
+
+
+def _any_unstable(unstable, sweep: int, num_chunks: int) -> bool:
+    """The reduction over the chunks' flags for the given sweep."""
+    offset = (sweep % 2) * num_chunks
+    return any(unstable[offset:offset + num_chunks])
+
 
 def is_converged_multi_procs(b: Board, num_procs: int) -> bool:
-    #TODO: implement
-    pass
+    """Return True if no cell has 4 or more grains, checking each row chunk
+    in its own process.
+
+    Args:
+        b: Board to check.
+        num_procs: Number of processes.
+
+    Returns:
+        True if the board is stable; otherwise False.
+    """
+    chunks = make_row_chunks(num_rows(b), num_procs)
+    with multiprocessing.Pool(len(chunks)) as pool:
+        # each process reduces its chunk to one bool; these are reduced again here
+        stable = pool.starmap(_chunk_is_stable, [(b[row_start:row_end],) for row_start, row_end in chunks])
+    return all(stable)
+
+
+def _chunk_is_stable(rows: Board) -> bool:
+    for row in rows:
+        if row and max(row) >= 4:
+            return False
+    return True
+
 
 def update_multi_procs(b: Board, num_procs: int) -> Board:
-    #TODO: implement
-    pass
+    """One sweep of serial.update, with each row chunk computed in its own process.
+
+    Args:
+        b: Board to update.
+        num_procs: Number of processes.
+
+    Returns:
+        A new board after one sweep.
+    """
+    rows = num_rows(b)
+    cols = num_cols(b)
+    chunks = make_row_chunks(rows, num_procs)
+
+    result_queue = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=update_subboard_single_proc, args=(b, row_start, row_end, result_queue))
+        for row_start, row_end in chunks
+    ]
+    for p in procs:
+        p.start()
+
+    new_board = make_empty_board(rows, cols)
+    for _ in procs:
+        row_start, new_rows = result_queue.get()
+        for i, row in enumerate(new_rows):
+            new_board[row_start + i] = row
+
+    for p in procs:
+        p.join()
+    return new_board
 
 
 def update_subboard_single_proc(b: Board,
                    row_start: int,
                    row_end: int,
                    result_queue: multiprocessing.Queue) -> None:
-    #TODO: implement
-    pass
+    """Compute rows row_start .. row_end - 1 of serial.update(b).
+
+    Args:
+        b: Board to update.
+        row_start: First row of the chunk.
+        row_end: One past the last row of the chunk.
+        result_queue: Queue to which (row_start, new_rows) is sent.
+    """
+    cols = num_cols(b)
+    new_rows = []
+    for r in range(row_start, row_end):
+        row = []
+        for c in range(cols):
+            row.append(b[r][c] - number_of_coins_out(b, r, c) + number_of_coins_in(b, r, c))
+        new_rows.append(row)
+    result_queue.put((row_start, new_rows))
 
 
 def make_row_chunks(total_rows: int, num_procs: int) -> list[tuple[int, int]]:
-    #TODO: implement
-    pass
\ No newline at end of file
+    """Split rows 0 .. total_rows - 1 into contiguous (row_start, row_end) chunks.
+
+    Args:
+        total_rows: Number of rows to split.
+        num_procs: Number of chunks wanted.
+
+    Returns:
+        min(num_procs, total_rows) chunks whose sizes differ by at most one,
+        the larger ones first.
+    """
+    if total_rows <= 0:
+        raise ValueError("Error: total_rows must be positive.")
+    if num_procs <= 0:
+        raise ValueError("Error: num_procs must be positive.")
+
+    num_chunks = min(num_procs, total_rows)
+    base, extra = divmod(total_rows, num_chunks)
+    chunks = []
+    row_start = 0
+    for k in range(num_chunks):
+        row_end = row_start + base + (1 if k < extra else 0)
+        chunks.append((row_start, row_end))
+        row_start = row_end
+    return chunks
@@ -1,6 +1,6 @@
 import random
 from datatypes import Board
-from helper_functions import contains, deep_copy_board, num_cols, num_rows, make_empty_board
+from helper_functions import assert_rectangular, contains, deep_copy_board, num_cols, num_rows, make_empty_board
 
 def create_board(r: int,
                  c: int,
@@ -46,26 +46,92 @@ def create_board(r: int,
     return b
 
 def simulate_sandpiles(initial_board: Board) -> list[Board]:
-    #TODO: implement
-    pass
+    """Topple the board one synchronous sweep at a time until it is stable.
+
+    This is the reference implementation: every sweep copies the whole
+    board. toppling.stabilize_board reaches the same final board much faster.
+
+    Args:
+        initial_board: Starting board.
+
+    Returns:
+        The boards after 0, 1, 2, ... sweeps, ending with the stable board.
+    """
+    assert_rectangular(initial_board)
+    boards = [deep_copy_board(initial_board)]
+    while not is_converged(boards[-1]):
+        boards.append(update(boards[-1]))
+    return boards
 
 
 def is_converged(b: Board) -> bool:
-    #TODO: implement
-    pass
+    """Return True if no cell of the board has 4 or more grains.
+
+    Args:
+        b: Board to check.
+
+    Returns:
+        True if the board is stable; otherwise False.
+    """
+    # a reduction over the board: only its largest pile matters
+    for row in b:
+        if row and max(row) >= 4:
+            return False
+    return True
 
 
 def update(b: Board) -> Board:
-    #TODO: implement
-    pass
+    """Topple every unstable cell of the board once, all at the same time.
+
+    Each cell with 4 or more grains sends one grain to each of its four
+    neighbours; grains sent off the board are lost.
+
+    Args:
+        b: Board to update.
+
+    Returns:
+        A new board after one sweep.
+    """
+    rows = num_rows(b)
+    cols = num_cols(b)
+    new_board = make_empty_board(rows, cols)
+    for r in range(rows):
+        for c in range(cols):
+            new_board[r][c] = b[r][c] - number_of_coins_out(b, r, c) + number_of_coins_in(b, r, c)
+    return new_board
 
 
 def number_of_coins_out(b: Board, r: int, c: int) -> int:
-    #TODO: implement
-    pass
+    """Return the number of grains cell (r, c) loses in one sweep.
+
+    Args:
+        b: Board to query.
+        r: Row index.
+        c: Column index.
+
+    Returns:
+        4 if the cell topples; otherwise 0.
+    """
+    if b[r][c] >= 4:
+        return 4
+    return 0
 
 
 def number_of_coins_in(b: Board, r: int, c: int) -> int:
-    #TODO: implement
-    pass
+    """Return the number of grains cell (r, c) receives in one sweep.
+
+    Args:
+        b: Board to query.
+        r: Row index.
+        c: Column index.
 
+    Returns:
+        The number of its four neighbours that topple.
+    """
+    count = 0
+    for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        nr, nc = r + dr, c + dc
+        # bounds checked inline: contains() re-checks the whole board's shape
+        if 0 <= nr < len(b) and 0 <= nc < len(b[0]) and b[nr][nc] >= 4:
+            count += 1
+    return count